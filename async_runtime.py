@@ -0,0 +1,393 @@
+import asyncio
+import heapq
+import math
+import threading
+from queue import Empty
+
+from dispatcher import ArrivalStream
+
+
+class AsyncClock:
+    """
+    Clock do runtime assíncrono: em vez de uma thread por componente, cada
+    participante (Dispatcher, IOManager, CPUs, telemetria) é uma corrotina
+    que aguarda, com await wait_until(), um future resolvido no tick pedido.
+
+    A cada tick os participantes cujo tick alvo chegou recebem a vez um de
+    cada vez, em ordem de rank, como no modo barreira do Clock; quem é
+    acordado por wake_at() durante o tick recebe a vez ainda nele se o seu
+    rank for maior que o do participante atual e, caso contrário, no tick
+    seguinte. Assim o resultado é o mesmo do modo barreira e do motor
+    orientado a eventos.
+
+    Com time_unit > 0 cada tick dura time_unit segundos (tempo real); com
+    time_unit = 0 o clock pula direto para o próximo tick em que algum
+    participante tem a vez.
+
+    Expõe a mesma interface síncrona do Clock usada pelo QueueManager
+    (global_time, barrier, get_time, wake_at, registro de participantes);
+    wake_at() pode ser chamado de outras threads (teclado).
+    """
+
+    def __init__(self, time_unit=0.005):
+        self.global_time = 0
+        self.time_unit = time_unit
+        self.running = True
+        # Para o QueueManager o runtime se comporta como o modo barreira: CPUs
+        # ociosas dormem até que notify_ready() as acorde.
+        self.barrier = True
+
+        self.participants = {}
+        self.sleepers = {}
+        self.futures = {}
+        self.polls = {}
+        # Heap de (tick alvo, rank, nome); entradas cujo alvo não é mais o de sleepers são descartadas.
+        self.wakeups = []
+        self.early_wakeups = {}
+        self.current_turn = None
+        self.turn_done = None
+        self.due = []
+        self.deferred = []
+        self.last_rank = -math.inf
+
+        self.loop = None
+        self.thread_id = None
+
+    def register_participant(self, name, rank):
+        self.participants[name] = rank
+
+    def unregister_participant(self, name):
+        """Remove um participante, devolvendo a vez caso a esteja segurando."""
+        self.participants.pop(name, None)
+        self.sleepers.pop(name, None)
+        self.futures.pop(name, None)
+        self.polls.pop(name, None)
+        if self.current_turn == name:
+            self.end_turn()
+
+    def get_time(self):
+        return self.global_time
+
+    def end_turn(self):
+        self.current_turn = None
+        if self.turn_done is not None and not self.turn_done.done():
+            if self.running:
+                self.pass_turn()
+            else:
+                self.turn_done.set_result(None)
+
+    async def wait_until(self, target, name, poll=None):
+        """
+        Devolve a vez e dorme até o tick target (None = até ser acordado por
+        wake_at). Retorna o tempo global; nunca retorna no mesmo tick.
+
+        Com poll, a cada vez do participante o clock chama poll() antes de
+        acordá-lo: se retornar um tick (math.inf = indefinidamente), o
+        participante continua dormindo até ele sem que a corrotina seja
+        retomada; se retornar None, ela é acordada normalmente.
+        """
+        target = math.inf if target is None else target
+        target = min(target, self.early_wakeups.pop(name, math.inf))
+        if not self.running:
+            return self.global_time
+
+        future = asyncio.get_running_loop().create_future()
+        self.futures[name] = future
+        if poll is not None:
+            self.polls[name] = poll
+        self.sleepers[name] = target
+        if target != math.inf:
+            heapq.heappush(self.wakeups, (target, self.participants[name], name))
+        if self.current_turn == name:
+            self.end_turn()
+
+        await future
+        if poll is not None:
+            self.polls.pop(name, None)
+        return self.global_time
+
+    async def wait_tick(self, name):
+        return await self.wait_until(self.global_time + 1, name)
+
+    def wake_at(self, name, tick):
+        """Antecipa para o tick indicado o despertar de um participante em wait_until()."""
+        if self.loop is not None and threading.get_ident() != self.thread_id:
+            self.loop.call_soon_threadsafe(self.wake_at, name, tick)
+            return
+
+        current = self.sleepers.get(name)
+        if current is None:
+            # O participante está com a vez (ou ainda não dormiu): o pedido vale para a próxima espera.
+            self.early_wakeups[name] = min(tick, self.early_wakeups.get(name, math.inf))
+            return
+        if tick >= current:
+            return
+
+        self.sleepers[name] = tick
+        heapq.heappush(self.wakeups, (tick, self.participants[name], name))
+
+    def next_wakeup(self):
+        """Menor tick alvo entre os participantes adormecidos (None se todos esperam indefinidamente)."""
+        while self.wakeups:
+            target, _, name = self.wakeups[0]
+            if self.sleepers.get(name) == target:
+                return target
+            heapq.heappop(self.wakeups)
+        return None
+
+    async def run(self, until=None):
+        """
+        Avança o tempo até stop(), até until() ser verdadeiro ao fim de um
+        tick ou até nenhum participante ter um tick alvo.
+        """
+        self.loop = asyncio.get_running_loop()
+        self.thread_id = threading.get_ident()
+
+        while self.running:
+            if self.time_unit:
+                await asyncio.sleep(self.time_unit)
+                next_time = self.global_time + 1
+            else:
+                next_time = self.next_wakeup()
+                if next_time is None:
+                    break
+                next_time = max(next_time, self.global_time + 1)
+            if not self.running:
+                break
+
+            self.global_time = next_time
+            await self.run_tick()
+            if until is not None and until():
+                break
+            if self.time_unit and self.next_wakeup() is None:
+                # Ninguém vai acordar: nada mais pode acontecer.
+                break
+
+        self.stop()
+
+    async def run_tick(self):
+        """Dá a vez, em ordem de rank, a cada participante cujo tick alvo chegou."""
+        self.due = []
+        self.deferred = []
+        self.last_rank = -math.inf
+        self.turn_done = self.loop.create_future()
+        self.pass_turn()
+        await self.turn_done
+        self.turn_done = None
+
+        for entry in self.deferred:
+            heapq.heappush(self.wakeups, entry)
+
+    def pass_turn(self):
+        """
+        Passa a vez ao próximo participante do tick ou, se não houver mais
+        nenhum, encerra o tick. É chamado por quem devolve a vez, então cada
+        vez custa uma só iteração do event loop.
+        """
+        current_time = self.global_time
+        while True:
+            while self.wakeups and self.wakeups[0][0] <= current_time:
+                target, rank, name = heapq.heappop(self.wakeups)
+                heapq.heappush(self.due, (rank, name, target))
+            if not self.due:
+                break
+
+            rank, name, target = heapq.heappop(self.due)
+            if self.sleepers.get(name) != target:
+                continue
+            if rank <= self.last_rank:
+                # Acordado por um participante de rank maior: recebe a vez no próximo tick.
+                self.deferred.append((target, rank, name))
+                continue
+
+            self.last_rank = rank
+            del self.sleepers[name]
+            self.current_turn = name
+            poll = self.polls.get(name)
+            if poll is not None:
+                target = poll()
+                if target is not None:
+                    # A vez não tinha nada a fazer: volta a dormir sem retomar a corrotina.
+                    target = min(target, self.early_wakeups.pop(name, math.inf))
+                    self.sleepers[name] = target
+                    if target != math.inf:
+                        heapq.heappush(self.wakeups, (target, rank, name))
+                    continue
+
+            self.futures.pop(name).set_result(None)
+            return
+
+        self.current_turn = None
+        self.turn_done.set_result(None)
+
+    def stop(self):
+        """Para o clock e acorda todos os participantes, que percebem running = False e saem."""
+        if self.loop is not None and threading.get_ident() != self.thread_id:
+            self.loop.call_soon_threadsafe(self.stop)
+            return
+
+        self.running = False
+        for future in self.futures.values():
+            if not future.done():
+                future.set_result(None)
+        self.futures.clear()
+        self.sleepers.clear()
+        self.end_turn()
+
+
+class AsyncRuntime:
+    """
+    Runtime em tempo real com um único event loop: o Dispatcher, o
+    IOManager, cada CPU e a telemetria são corrotinas sobre um AsyncClock,
+    em vez de uma thread por componente. Usa o QueueManager para toda a
+    contabilidade (filas, bloqueio, finalização, métricas) e executa cada
+    fatia com QueueManager.run_slice, como main.process_job_cpu, de modo que
+    milhares de CPUs simuladas custam milhares de corrotinas, não de
+    threads disputando o GIL.
+    """
+
+    def __init__(self, process_list, queue_manager, num_cores, io_block_duration=10, telemetry=None):
+        self.arrivals = ArrivalStream(process_list)
+        self.queue_manager = queue_manager
+        self.clock = queue_manager.clock
+        self.logger = queue_manager.logger
+        self.num_cores = num_cores
+        self.io_block_duration = io_block_duration
+        self.telemetry = telemetry
+
+    async def run(self, until=None):
+        """Executa até until() ser verdadeiro ao fim de um tick (ou até clock.stop())."""
+        clock = self.clock
+        clock.register_participant("Dispatcher", 0)
+        clock.register_participant("IOManager", 1)
+        for i in range(self.num_cores):
+            clock.register_participant(f"CPU-{i + 1}", i + 2)
+
+        tasks = [asyncio.create_task(self.dispatcher()), asyncio.create_task(self.io_manager())]
+        tasks += [asyncio.create_task(self.cpu_worker(i)) for i in range(self.num_cores)]
+        if self.telemetry is not None:
+            # Depois de todas as CPUs (CPU-n tem rank n + 1).
+            clock.register_participant("Telemetry", self.num_cores + 2)
+            tasks.append(asyncio.create_task(self.sample_telemetry()))
+
+        # As corrotinas entram na primeira espera antes do tick 1.
+        await asyncio.sleep(0)
+        await clock.run(until)
+        await asyncio.gather(*tasks)
+
+    async def dispatcher(self):
+        """Dorme até a próxima chegada (a partir do tick 1) e libera os jobs que chegaram."""
+        clock = self.clock
+        current_time = 0
+        try:
+            while clock.running and not self.arrivals.exhausted():
+                target = max(self.arrivals.next_arrival_time(), current_time + 1)
+                current_time = await clock.wait_until(target, "Dispatcher")
+                if not clock.running:
+                    break
+
+                self.queue_manager.add_jobs(self.arrivals.pop_until(current_time))
+        finally:
+            clock.unregister_participant("Dispatcher")
+
+    async def io_manager(self):
+        """Dorme até o próximo fim de E/S e desbloqueia os jobs."""
+        clock = self.clock
+        q_manager = self.queue_manager
+        try:
+            while q_manager.running and clock.running:
+                current_time = await clock.wait_until(q_manager.next_unblock_time(), "IOManager")
+                if not q_manager.running or not clock.running:
+                    break
+
+                for job in q_manager.pop_unblocked(current_time):
+                    self.logger.log(f"IOManager: Processo {job.job_id} concluiu E/S.", current_time,
+                                    event="io_done", job=job.job_id)
+                    q_manager.add_job(job)
+        finally:
+            clock.unregister_participant("IOManager")
+
+    async def sample_telemetry(self):
+        clock = self.clock
+        try:
+            while clock.running:
+                current_time = await clock.wait_until(self.telemetry.next_sample_time, "Telemetry")
+                if not clock.running:
+                    break
+                self.telemetry.sample(current_time)
+        finally:
+            clock.unregister_participant("Telemetry")
+
+    def take_job(self, cpu_index):
+        """
+        Uma consulta da CPU à fila de prontos, como em QueueManager.next_job
+        no modo barreira. Retorna o job ou None, deixando a CPU entre as ociosas.
+        """
+        q_manager = self.queue_manager
+        q_manager.remove_idle_cpu(cpu_index)
+        try:
+            job, stolen = q_manager.try_take(cpu_index)
+        except Empty:
+            q_manager.add_idle_cpu(cpu_index)
+            return None
+        q_manager.assign_cpu(job, cpu_index, stolen)
+        return job
+
+    async def next_job(self, cpu_index, cpu_name):
+        """
+        Próximo job para a CPU (None se o clock parou). Enquanto a CPU está
+        ociosa, cada vez dela é só uma consulta à fila feita pelo clock
+        (poll), sem retomar a corrotina.
+        """
+        clock = self.clock
+        taken = []
+
+        def poll():
+            job = self.take_job(cpu_index)
+            if job is not None:
+                taken.append(job)
+                return None
+            # Com filas por CPU pode haver jobs que esta CPU não pode pegar: consulta de novo no próximo tick.
+            return math.inf if self.queue_manager.job_queue.empty() else clock.global_time + 1
+
+        target = poll()
+        if target is not None:
+            await clock.wait_until(target, cpu_name, poll)
+        return taken[0] if taken else None
+
+    async def cpu_worker(self, cpu_index):
+        q_manager = self.queue_manager
+        clock = self.clock
+        cpu_name = f"CPU-{cpu_index + 1}"
+        q_manager.set_cpu_state(cpu_name, 'Idle')
+
+        try:
+            await clock.wait_tick(cpu_name)
+            while True:
+                job = await self.next_job(cpu_index, cpu_name)
+                if job is None:
+                    break
+
+                try:
+                    q_manager.set_cpu_state(cpu_name, job.job_id)
+                    q_manager.running_cpus.add(cpu_name)
+                    await self.process_job(job, cpu_name)
+                except Exception as e:
+                    self.logger.log(f"Erro processando {job.job_id}: {e}", clock.get_time())
+                finally:
+                    q_manager.running_cpus.discard(cpu_name)
+                    q_manager.set_cpu_state(cpu_name, 'Idle')
+                    q_manager.job_queue.task_done()
+        finally:
+            q_manager.set_cpu_state(cpu_name, 'Offline')
+            clock.unregister_participant(cpu_name)
+
+    async def process_job(self, job, cpu_name):
+        """Executa uma fatia do job na CPU cpu_name (QueueManager.run_slice, como main.process_job_cpu)."""
+        slice_steps = self.queue_manager.run_slice(job, cpu_name, self.io_block_duration)
+        try:
+            target = next(slice_steps)
+            while True:
+                target = slice_steps.send(await self.clock.wait_until(target, cpu_name))
+        except StopIteration:
+            pass
@@ -0,0 +1,256 @@
+import argparse
+import csv
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from event_engine import EventSimulator
+from event_trace import TraceWriter
+from gantt import GanttRecorder
+from logger import Logger
+from main import positive_int, run_queue_options
+from policies import POLICIES
+from workload import format_io_bursts, open_workload, scan_workload
+
+
+def generate_workload(num_jobs, arrival_rate=0.5, burst_distribution="exponential", mean_burst=8, pareto_alpha=1.5,
+                      io_fraction=0.0, io_interval=4, mean_io_duration=10, num_priorities=4, seed=0):
+    """
+    Gera, sob demanda e em ordem de chegada, registros
+    (job_id, chegada, execução, prioridade, perfil de E/S).
+
+    - As chegadas seguem um processo de Poisson com taxa arrival_rate
+      (jobs por unidade de tempo).
+    - A duração de cada job segue uma exponencial de média mean_burst
+      ou, com burst_distribution="pareto", uma Pareto de cauda pesada
+      (alfa pareto_alpha) escalada para a mesma média.
+    - Uma fração io_fraction dos jobs é limitada por E/S: a cada
+      io_interval unidades de CPU pede uma E/S de duração exponencial
+      com média mean_io_duration.
+    """
+    if burst_distribution not in ("exponential", "pareto"):
+        raise ValueError(f"Distribuição desconhecida: {burst_distribution}")
+
+    rng = random.Random(seed)
+    pareto_scale = mean_burst * (pareto_alpha - 1) / pareto_alpha if pareto_alpha > 1 else mean_burst
+    arrival = 0.0
+    for index in range(num_jobs):
+        arrival += rng.expovariate(arrival_rate)
+        if burst_distribution == "pareto":
+            execution_time = max(1, round(pareto_scale * rng.paretovariate(pareto_alpha)))
+        else:
+            execution_time = max(1, round(rng.expovariate(1 / mean_burst)))
+
+        io_bursts = ()
+        if io_fraction and rng.random() < io_fraction:
+            io_bursts = tuple((offset, max(1, round(rng.expovariate(1 / mean_io_duration))))
+                              for offset in range(io_interval, execution_time, io_interval))
+
+        yield f"P{index + 1}", int(arrival), execution_time, rng.randrange(num_priorities), io_bursts
+
+
+def write_workload_csv(file_path, records):
+    """Grava os registros de generate_workload no formato de CSV lido por workload.py. Retorna o total."""
+    count = 0
+    with open(file_path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(("job_id", "arrival_time", "execution_time", "priority", "io_bursts"))
+        for job_id, arrival_time, execution_time, priority, io_bursts in records:
+            writer.writerow((job_id, arrival_time, execution_time, priority, format_io_bursts(io_bursts)))
+            count += 1
+    return count
+
+
+class EventCounter:
+    """Sink que apenas conta os eventos estruturados emitidos."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, event, time, cpu, job):
+        self.count += 1
+
+
+def peak_rss_mb():
+    """Pico de memória residente do processo, em MB (None onde o módulo resource não existe)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB; macOS, em bytes.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def current_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_event(jobs, args, logger):
+    simulator = EventSimulator(jobs, args.cores, logger=logger, dynamic_quantum=args.dynamic_quantum,
+                               fixed_quantum=args.quantum, io_block_duration=args.io_duration, policy=args.policy,
+                               keep_finished=not args.discard_finished, run_queue_options=run_queue_options(args))
+    total_time = simulator.run()
+    return simulator.metrics, total_time
+
+
+def configure_main(args):
+    """
+    Aplica os parâmetros do benchmark às constantes de main.py lidas por
+    run_threaded_simulation e run_async_simulation: clock determinístico
+    (sem dormir entre ticks), sem monitor de console, teclado nem telemetria.
+    """
+    import main
+
+    main.NUM_CORES = args.cores
+    main.QUANTUM = args.quantum
+    main.USE_DYNAMIC_QUANTUM = args.dynamic_quantum
+    main.SCHEDULING_POLICY = args.policy
+    main.IO_BLOCK_DURATION = args.io_duration
+    main.RUN_QUEUE_OPTIONS = run_queue_options(args)
+    main.KEEP_FINISHED_JOBS = not args.discard_finished
+    main.DETERMINISTIC_CLOCK = True
+    main.CONSOLE_MONITOR = False
+    main.KEYBOARD_IO = False
+    main.TELEMETRY_INTERVAL = None
+    return main
+
+
+def run_threaded(jobs, total_jobs, args, logger):
+    """Executa main.run_threaded_simulation com o clock em modo barreira."""
+    main = configure_main(args)
+    _, total_time, online_metrics, _ = main.run_threaded_simulation(jobs, total_jobs, logger, poll_interval=0.01)
+    return online_metrics, total_time
+
+
+def run_async(jobs, total_jobs, args, logger):
+    """Executa main.run_async_simulation (async_runtime) sem dormir entre ticks."""
+    main = configure_main(args)
+    _, total_time, online_metrics, _ = main.run_async_simulation(jobs, total_jobs, logger)
+    return online_metrics, total_time
+
+
+def run_benchmark(args):
+    """Gera a carga, executa a simulação e retorna o dicionário de resultados."""
+    phases = {}
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        workload_path = args.workload
+        if workload_path is None:
+            workload_path = os.path.join(temp_dir, "workload.csv")
+            started = time.perf_counter()
+            write_workload_csv(workload_path, generate_workload(
+                args.jobs, arrival_rate=args.arrival_rate, burst_distribution=args.bursts, mean_burst=args.mean_burst,
+                io_fraction=args.io_fraction, mean_io_duration=args.io_duration, seed=args.seed))
+            phases["generate"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        total_jobs, in_order = scan_workload(workload_path)
+        if not in_order:
+            raise ValueError(f"{workload_path}: chegadas fora de ordem; converta com convert_csv_to_binary.")
+        jobs = list(open_workload(workload_path))
+        phases["load"] = time.perf_counter() - started
+
+        logger = Logger(log_file=None, log_to_console=False)
+        counter = EventCounter()
+        logger.add_sink(counter)
+        gantt = None
+        if args.plot:
+            gantt = GanttRecorder(args.cores)
+            logger.add_sink(gantt)
+        trace_writer = None
+        if args.trace is not None:
+            trace_writer = TraceWriter(args.trace)
+            logger.add_sink(trace_writer)
+
+        started = time.perf_counter()
+        if args.engine == "event":
+            online_metrics, total_time = run_event(jobs, args, logger)
+        elif args.engine == "async":
+            online_metrics, total_time = run_async(jobs, total_jobs, args, logger)
+        else:
+            online_metrics, total_time = run_threaded(jobs, total_jobs, args, logger)
+        phases["simulate"] = time.perf_counter() - started
+        if trace_writer is not None:
+            trace_writer.close()
+
+        started = time.perf_counter()
+        metrics = online_metrics.summary(total_time, args.cores)
+        phases["report"] = time.perf_counter() - started
+
+        if gantt is not None:
+            from plotter import plot_gantt_intervals
+
+            started = time.perf_counter()
+            gantt.finalize()
+            plot_gantt_intervals(gantt, os.path.join(temp_dir, "gantt_chart.png"))
+            phases["plot"] = time.perf_counter() - started
+
+    simulate_seconds = phases["simulate"]
+    return {
+        "commit": current_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {key: value for key, value in vars(args).items() if key != "output"},
+        "jobs": total_jobs,
+        "simulated_ticks": total_time,
+        "events": counter.count,
+        "ticks_per_second": total_time / simulate_seconds if simulate_seconds else None,
+        "events_per_second": counter.count / simulate_seconds if simulate_seconds else None,
+        "peak_rss_mb": peak_rss_mb(),
+        "phases": phases,
+        "metrics": metrics,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Mede o desempenho do simulador com cargas sintéticas.")
+    parser.add_argument("--jobs", type=int, default=100_000, help="número de jobs gerados")
+    parser.add_argument("--workload", help="usa um arquivo de carga existente em vez de gerar um")
+    parser.add_argument("--arrival-rate", type=float, default=0.5, help="chegadas por unidade de tempo (Poisson)")
+    parser.add_argument("--bursts", choices=("exponential", "pareto"), default="exponential")
+    parser.add_argument("--mean-burst", type=float, default=8, help="duração média dos jobs")
+    parser.add_argument("--io-fraction", type=float, default=0.0, help="fração de jobs limitados por E/S")
+    parser.add_argument("--io-duration", type=int, default=10, help="duração média (ou fixa, interativa) das E/S")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--engine", choices=("event", "threaded", "async"), default="event")
+    parser.add_argument("--cores", type=positive_int, default=2)
+    parser.add_argument("--quantum", type=positive_int, default=5)
+    parser.add_argument("--dynamic-quantum", action="store_true")
+    parser.add_argument("--policy", choices=tuple(POLICIES), default="rr")
+    parser.add_argument("--per-cpu-queues", action="store_true",
+                        help="uma fila de prontos por CPU em vez da fila única compartilhada")
+    parser.add_argument("--cores-per-node", type=positive_int, help="agrupa as CPUs em nós (com --per-cpu-queues)")
+    parser.add_argument("--migration-penalty", type=int, default=0, help="ticks extras ao migrar entre nós")
+    parser.add_argument("--no-work-stealing", action="store_true", help="CPUs ociosas não roubam jobs de outras")
+    parser.add_argument("--rebalance-interval", type=positive_int, help="redistribui as filas a cada N ticks")
+    parser.add_argument("--discard-finished", action="store_true",
+                        help="não mantém os jobs finalizados em memória (apenas as métricas agregadas)")
+    parser.add_argument("--plot", action="store_true", help="inclui a geração do gráfico de Gantt na medição")
+    parser.add_argument("--trace", help="grava o trace canônico da execução (compare com event_trace.py)")
+    parser.add_argument("--output", default="benchmark.json", help="arquivo JSON de resultados")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    results = run_benchmark(arguments)
+
+    with open(arguments.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    print(f"{results['jobs']} jobs, {results['simulated_ticks']} ticks simulados em "
+          f"{results['phases']['simulate']:.2f}s ({results['ticks_per_second']:.0f} ticks/s, "
+          f"{results['events_per_second']:.0f} eventos/s). Resultados salvos em '{arguments.output}'")
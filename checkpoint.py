@@ -0,0 +1,33 @@
+import gzip
+import os
+import pickle
+
+CHECKPOINT_MAGIC = b"ESCCKPT"
+CHECKPOINT_VERSION = 2
+
+
+def write_checkpoint(file_path, state):
+    """
+    Grava o estado (um dicionário de objetos simples, jobs e arrays) em
+    pickle comprimido com gzip.
+
+    A escrita vai para um arquivo temporário que só substitui o anterior
+    depois de completo, então uma interrupção no meio da gravação nunca
+    deixa um checkpoint corrompido no lugar do último válido.
+    """
+    temp_path = file_path + ".tmp"
+    with gzip.open(temp_path, "wb", compresslevel=6) as f:
+        f.write(CHECKPOINT_MAGIC)
+        pickle.dump((CHECKPOINT_VERSION, state), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, file_path)
+
+
+def read_checkpoint(file_path):
+    """Lê um arquivo gravado por write_checkpoint e retorna o dicionário de estado."""
+    with gzip.open(file_path, "rb") as f:
+        if f.read(len(CHECKPOINT_MAGIC)) != CHECKPOINT_MAGIC:
+            raise ValueError(f"{file_path}: não é um checkpoint do simulador.")
+        version, state = pickle.load(f)
+    if version != CHECKPOINT_VERSION:
+        raise ValueError(f"{file_path}: versão de checkpoint {version} não suportada (esperada {CHECKPOINT_VERSION}).")
+    return state
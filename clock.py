@@ -1,21 +1,45 @@
+import heapq
+import math
 import threading
 import time
 
 
 class Clock(threading.Thread):
-    def __init__(self, time_unit=0.01):
-        super().__init__()
+    def __init__(self, time_unit=0.01, barrier=False):
+        super().__init__(name="Clock")
         self.global_time = 0
         self.time_unit = time_unit
         self.running = True
         self.time_lock = threading.Lock()
         self.tick_condition = threading.Condition(self.time_lock)
 
+        # Modo barreira: o tick só avança depois que todos os participantes
+        # registrados tiveram sua vez no tick atual, em ordem de rank.
+        self.barrier = barrier
+        self.participants = {}
+        self.participant_conditions = {}
+        self.last_turn = {}
+        self.current_turn = None
+        self.turn_condition = threading.Condition(self.time_lock)
+
+        # Esperas direcionadas: cada thread adormecida por wait_until() tem a
+        # sua própria condição e só é acordada no tick pedido (heap de alvos).
+        self.sleepers = {}
+        self.sleeper_conditions = {}
+        self.wakeups = []
+        self.early_wakeups = {}
+
+        # Fábrica das condições criadas depois (instrumentation.py a substitui para medir as esperas).
+        self.condition_factory = threading.Condition
 
         self.pause_event = threading.Event()
         self.pause_event.set()
 
     def run(self):
+        if self.barrier:
+            self.run_barrier()
+            return
+
         while self.running:
             self.pause_event.wait()
 
@@ -29,6 +53,137 @@ class Clock(threading.Thread):
 
                 self.global_time += 1
                 self.tick_condition.notify_all()
+                self.notify_sleepers()
+
+    def notify_sleepers(self):
+        """Acorda as threads cujo tick alvo chegou (chamar com time_lock)."""
+        while self.wakeups and self.wakeups[0][0] <= self.global_time:
+            tick, name = heapq.heappop(self.wakeups)
+            if self.sleepers.get(name) == tick:
+                self.sleeper_conditions[name].notify()
+
+    def run_barrier(self):
+        """Avança o tempo sem dormir, passando a vez a cada participante em ordem."""
+        while self.running:
+            self.pause_event.wait()
+
+            with self.time_lock:
+                if not self.running:
+                    break
+                if not self.pause_event.is_set():
+                    continue
+
+                self.global_time += 1
+                self.tick_condition.notify_all()
+
+                for name in sorted(self.participants, key=self.participants.get):
+                    if name not in self.participants or self.sleepers.get(name, 0) > self.global_time:
+                        continue
+                    self.current_turn = name
+                    self.participant_conditions[name].notify()
+                    while self.running and self.current_turn == name:
+                        self.turn_condition.wait()
+
+                self.current_turn = None
+
+    def register_participant(self, name, rank):
+        """Registra uma thread (pelo nome) que deve confirmar cada tick no modo barreira."""
+        with self.time_lock:
+            self.participants[name] = rank
+            self.participant_conditions[name] = self.condition_factory(self.time_lock)
+            self.last_turn[name] = self.global_time
+
+    def unregister_participant(self, name):
+        """Remove um participante, liberando a vez caso a esteja segurando."""
+        with self.time_lock:
+            self.participants.pop(name, None)
+            self.last_turn.pop(name, None)
+            condition = self.participant_conditions.pop(name, None)
+            if condition is not None:
+                condition.notify_all()
+            if self.current_turn == name:
+                self.current_turn = None
+                self.turn_condition.notify()
+
+    def wait_tick(self, name=None):
+        """
+        Espera o próximo tick e retorna o tempo global.
+
+        No modo barreira, um participante registrado devolve a vez do tick
+        atual (se a estiver segurando) e só retorna quando receber a vez
+        no tick seguinte.
+        """
+        name = name or threading.current_thread().name
+        with self.time_lock:
+            if not self.barrier or name not in self.participants:
+                self.tick_condition.wait()
+                return self.global_time
+
+            self.wait_turn(name)
+            return self.global_time
+
+    def wait_turn(self, name):
+        """Devolve a vez do tick atual, se a tiver, e espera a próxima (chamar com time_lock)."""
+        if self.current_turn == name and self.last_turn[name] == self.global_time:
+            self.current_turn = None
+            self.turn_condition.notify()
+
+        condition = self.participant_conditions[name]
+        while self.running and name in self.participants:
+            if self.current_turn == name and self.last_turn[name] < self.global_time:
+                self.last_turn[name] = self.global_time
+                break
+            condition.wait()
+
+    def wait_until(self, target, name=None):
+        """
+        Dorme até o tick target (None = até ser acordado por wake_at) e
+        retorna o tempo global, sem acordar nos ticks intermediários.
+
+        No modo barreira, o participante simplesmente não recebe a vez
+        até que o tick alvo chegue.
+        """
+        name = name or threading.current_thread().name
+        target = math.inf if target is None else target
+        with self.time_lock:
+            target = min(target, self.early_wakeups.pop(name, math.inf))
+
+            if self.barrier and name in self.participants:
+                self.sleepers[name] = target
+                self.wait_turn(name)
+                self.sleepers.pop(name, None)
+                return self.global_time
+
+            if self.global_time >= target:
+                return self.global_time
+
+            condition = self.sleeper_conditions.get(name)
+            if condition is None:
+                condition = self.sleeper_conditions[name] = self.condition_factory(self.time_lock)
+            self.sleepers[name] = target
+            if target != math.inf:
+                heapq.heappush(self.wakeups, (target, name))
+            while self.running and self.global_time < self.sleepers[name]:
+                condition.wait()
+            del self.sleepers[name]
+            return self.global_time
+
+    def wake_at(self, name, tick):
+        """Antecipa para o tick indicado o despertar de uma thread em wait_until()."""
+        with self.time_lock:
+            current = self.sleepers.get(name)
+            if current is None:
+                # A thread ainda não dormiu: o pedido vale para a próxima espera.
+                self.early_wakeups[name] = min(tick, self.early_wakeups.get(name, math.inf))
+                return
+            if tick >= current:
+                return
+
+            self.sleepers[name] = tick
+            if not self.barrier or name not in self.participants:
+                heapq.heappush(self.wakeups, (tick, name))
+                if tick <= self.global_time:
+                    self.sleeper_conditions[name].notify()
 
     def get_time(self):
         with self.time_lock:
@@ -39,6 +194,11 @@ class Clock(threading.Thread):
         self.resume()
         with self.time_lock:
             self.tick_condition.notify_all()
+            self.turn_condition.notify_all()
+            for condition in self.participant_conditions.values():
+                condition.notify_all()
+            for condition in self.sleeper_conditions.values():
+                condition.notify_all()
 
     def pause(self):
         """Pausa o clock. O evento é limpo (clear), fazendo o wait() bloquear."""
@@ -46,4 +206,4 @@ class Clock(threading.Thread):
 
     def resume(self):
         """Retoma o clock. O evento é definido (set), liberando o wait()."""
-        self.pause_event.set()
\ No newline at end of file
+        self.pause_event.set()
@@ -1,66 +1,122 @@
+import sys
 import threading
 import os
 import time
 
+CLEAR_SCREEN = "\x1b[2J\x1b[H"
+CLEAR_LINE = "\x1b[K"
+CLEAR_BELOW = "\x1b[J"
+
+
+def move_to(line):
+    return f"\x1b[{line};1H"
+
+
+def format_jobs(count, head, tail, describe):
+    """Lista curta de uma fila: os primeiros e os últimos jobs e, entre eles, quantos foram omitidos."""
+    head_ids = {id(job) for job in head}
+    tail = [job for job in tail if id(job) not in head_ids]
+    omitted = count - len(head) - len(tail)
+
+    text = ", ".join(describe(job) for job in head)
+    if omitted > 0:
+        text += f", … (+{omitted}) …"
+    if tail:
+        text += ", " + ", ".join(describe(job) for job in tail)
+    return f"[{text}]"
+
 
 class ConsoleMonitor(threading.Thread):
     """
-    Uma thread que exibe o estado atual do simulador no console
-    a cada tick do clock.
+    Uma thread que exibe o estado atual do simulador no console.
+
+    A tela é redesenhada refresh_rate vezes por segundo, independentemente
+    do clock, e só as linhas que mudaram desde o quadro anterior são
+    reescritas (posicionamento de cursor ANSI). O estado vem de
+    QueueManager.get_status_snapshot(), sem disputar os locks do
+    escalonador; filas grandes aparecem como contagem mais início e fim.
     """
 
-    def __init__(self, clock, queue_manager, num_cores):
-        super().__init__()
+    def __init__(self, clock, queue_manager, num_cores, refresh_rate=10, max_listed=5):
+        super().__init__(name="ConsoleMonitor")
         self.clock = clock
         self.queue_manager = queue_manager
         self.num_cores = num_cores
+        self.refresh_interval = 1 / refresh_rate
+        self.max_listed = max_listed
+        self.previous_lines = []
         self.running = True
         self.daemon = True
 
     def run(self):
-        """Loop principal: espera um tick, limpa a tela e imprime o status."""
-        while self.running:
-            with self.clock.time_lock:
-                self.clock.tick_condition.wait()
-                if not self.running:
-                    break
+        """Loop principal: redesenha a tela a cada intervalo de atualização."""
+        if os.name == 'nt':
+            # Habilita o processamento de sequências ANSI no console do Windows.
+            os.system('')
 
-            time.sleep(0.001)
+        while self.running:
+            time.sleep(self.refresh_interval)
+            if not self.running:
+                break
             self.print_status()
 
-    def print_status(self):
-        """Limpa o console e imprime o estado das CPUs e filas."""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        if self.previous_lines:
+            # Deixa o cursor abaixo do último quadro para a saída seguinte.
+            sys.stdout.write(move_to(len(self.previous_lines) + 1))
+            sys.stdout.flush()
 
-        current_time = self.clock.get_time()
-        print(f"--- Simulador de Escalonamento Round Robin [Tempo Global: {current_time}] ---")
-        print("Pressione [Barra de Espaço] para simular E/S | [Ctrl+C] para sair")
+    def build_lines(self):
+        """Monta as linhas do quadro atual."""
+        status = self.queue_manager.get_status_snapshot(self.max_listed)
+        lines = [
+            f"--- Simulador de Escalonamento Round Robin [Tempo Global: {self.clock.global_time}] ---",
+            "Pressione [Barra de Espaço] para simular E/S | [Ctrl+C] para sair",
+            "",
+            "== Estado das CPUs ==",
+        ]
 
-        print("\n== Estado das CPUs ==")
-        cpu_states = self.queue_manager.get_cpu_states()
+        cpu_states = status["cpu_states"]
         for i in range(1, self.num_cores + 1):
             cpu_name = f"CPU-{i}"
-            state = cpu_states.get(cpu_name, 'Initializing')
-            print(f"  {cpu_name}: {state}")
-
-        print("\n== Filas do Sistema ==")
+            lines.append(f"  {cpu_name}: {cpu_states.get(cpu_name, 'Initializing')}")
 
-        ready_jobs = self.queue_manager.get_ready_queue_snapshot()
-        ready_ids = [job.job_id for job in ready_jobs]
-        print(f"  Prontos     ({len(ready_ids)}): {ready_ids}")
+        ready = format_jobs(status["ready_count"], status["ready_head"], status["ready_tail"],
+                            lambda job: job.job_id)
+        blocked = format_jobs(status["blocked_count"], status["blocked_head"], status["blocked_tail"],
+                              lambda job: f"{job.job_id} (sai em T={job.io_block_end_time})")
+        lines += [
+            "",
+            "== Filas do Sistema ==",
+            f"  Prontos     ({status['ready_count']}): {ready}",
+            f"  Bloqueados  ({status['blocked_count']}): {blocked}",
+            "",
+            f"Finalizados: {status['finished_count']}",
+            "",
+            "=" * 60,
+            "Logs detalhados estão sendo salvos em 'simulation.log'",
+        ]
+        return lines
 
-        with self.queue_manager.blocked_lock:
-            blocked_jobs = self.queue_manager.blocked_queue
-            blocked_ids = [f"{job.job_id} (sai em T={job.io_block_end_time})" for job in blocked_jobs]
-            print(f"  Bloqueados  ({len(blocked_ids)}): {blocked_ids}")
+    def print_status(self):
+        """Redesenha apenas as linhas que mudaram desde o último quadro."""
+        lines = self.build_lines()
 
-        with self.queue_manager.finish_lock:
-            finished_count = len(self.queue_manager.finished_jobs)
-            print(f"\nFinalizados: {finished_count}")
+        if not self.previous_lines:
+            output = [CLEAR_SCREEN, "\n".join(lines)]
+        else:
+            output = []
+            for number, line in enumerate(lines, 1):
+                previous = self.previous_lines[number - 1] if number <= len(self.previous_lines) else None
+                if line != previous:
+                    output.append(move_to(number) + line + CLEAR_LINE)
+            if len(lines) < len(self.previous_lines):
+                output.append(move_to(len(lines) + 1) + CLEAR_BELOW)
 
-        print("\n" + "=" * 60)
-        print("Logs detalhados estão sendo salvos em 'simulation.log'")
+        self.previous_lines = lines
+        if output:
+            sys.stdout.write("".join(output))
+            sys.stdout.flush()
 
     def stop(self):
         """Sinaliza para a thread parar."""
-        self.running = False
\ No newline at end of file
+        self.running = False
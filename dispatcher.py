@@ -1,38 +1,70 @@
 import threading
 
 
+class ArrivalStream:
+    """
+    Chegadas de processos em ordem de arrival_time, consumidas sob demanda.
+
+    Listas e tuplas são ordenadas e percorridas com um cursor; qualquer
+    outro iterável (por exemplo, um gerador lendo o arquivo de carga) é
+    consumido preguiçosamente e deve já estar em ordem de chegada.
+    """
+
+    def __init__(self, processes):
+        if isinstance(processes, (list, tuple)):
+            processes = sorted(processes, key=lambda p: p.arrival_time)
+        self.iterator = iter(processes)
+        self.next_job = next(self.iterator, None)
+        self.consumed = 0
+
+    def next_arrival_time(self):
+        return self.next_job.arrival_time if self.next_job is not None else None
+
+    def exhausted(self):
+        return self.next_job is None
+
+    def pop_until(self, current_time):
+        """Retorna, em ordem, todos os jobs com arrival_time <= current_time."""
+        jobs = []
+        while self.next_job is not None and self.next_job.arrival_time <= current_time:
+            jobs.append(self.next_job)
+            self.next_job = next(self.iterator, None)
+        self.consumed += len(jobs)
+        return jobs
+
+    def skip(self, count):
+        """Descarta os count primeiros jobs, já liberados antes de um checkpoint."""
+        for _ in range(count):
+            if self.next_job is None:
+                raise ValueError("A carga tem menos processos do que os já liberados no checkpoint.")
+            self.next_job = next(self.iterator, None)
+        self.consumed += count
+
+
 class Dispatcher(threading.Thread):
     def __init__(self, process_list, queue_manager, clock, logger):
-        super().__init__()
-        self.process_list = sorted(process_list, key=lambda p: p.arrival_time)
+        super().__init__(name="Dispatcher")
+        self.arrivals = ArrivalStream(process_list)
         self.queue_manager = queue_manager
         self.clock = clock
         self.logger = logger
         self.running = True
+        self.clock.register_participant(self.name, 0)
 
     def run(self):
-        while self.running:
-            current_time = 0
-
-            with self.clock.time_lock:
-                self.clock.tick_condition.wait()
-                if not self.running:
-                    break
-
-                current_time = self.clock.global_time
-
-            jobs_to_add = []
-
-            while self.process_list and self.process_list[0].arrival_time <= current_time:
-                jobs_to_add.append(self.process_list.pop(0))
+        """Dorme até a próxima chegada (a partir do tick 1) e libera os jobs que chegaram."""
+        current_time = 0
+        while self.running and not self.arrivals.exhausted():
+            target = max(self.arrivals.next_arrival_time(), current_time + 1)
+            current_time = self.clock.wait_until(target)
+            if not self.running:
+                break
 
-            for job in jobs_to_add:
-                self.queue_manager.add_job(job)
+            self.queue_manager.add_jobs(self.arrivals.pop_until(current_time))
 
-            if not self.process_list:
-                self.stop()
+        self.stop()
 
     def stop(self):
         self.running = False
-        with self.clock.time_lock:
-            self.clock.tick_condition.notify_all()
\ No newline at end of file
+        self.clock.wake_at(self.name, 0)
+        self.clock.unregister_participant(self.name)
@@ -0,0 +1,385 @@
+import heapq
+import queue
+import threading
+
+from checkpoint import write_checkpoint
+from clock import Clock
+from dispatcher import ArrivalStream
+from logger import Logger
+from queue_manager import QueueManager, BASE_QUANTUM, MIN_QUANTUM
+from run_queues import make_ready_queue
+
+CPU_EVENT = 0
+IO_REQUEST = 1
+POLL = 2
+
+
+class EventSimulator:
+    """
+    Motor de simulação orientado a eventos, em uma única thread.
+
+    Reproduz a semântica do modo com threads (Dispatcher, workers do
+    QueueManager executando process_job_cpu e o gerenciador de E/S), mas
+    em vez de dormir a cada unidade de tempo salta diretamente para o
+    próximo instante em que algo acontece: uma chegada, o fim de uma fatia
+    de tempo, uma interrupção de E/S ou a conclusão de uma E/S.
+
+    As E/S vêm do perfil de cada job (job.io_bursts), que encurta a fatia
+    até a próxima rajada, ou de io_request_times, que reproduz a E/S
+    interativa (barra de espaço) nos instantes dados.
+
+    Com run_queue_options, cada CPU tem a própria fila de prontos (ver
+    run_queues.PerCpuRunQueues); sem ele, todas compartilham uma só.
+
+    Dentro de um mesmo instante a ordem é fixa: chegadas, conclusões de
+    E/S e, em seguida, cada CPU em ordem de índice (encerra a fatia atual
+    ou verifica preempção e, se ficar ociosa, busca o próximo job da fila
+    de prontos).
+
+    Como todo o estado fica nesta thread, a simulação pode ser salva entre
+    dois instantes (save_checkpoint) e retomada depois (from_state) com o
+    mesmo resultado de uma execução sem interrupção.
+
+    Com fast_path, uma execução que não precisa de eventos (round-robin
+    com quantum fixo e fila única, sem E/S, log, telemetria nem checkpoint)
+    é resolvida por rr_solver.solve_round_robin, com o mesmo resultado.
+    """
+
+    def __init__(self, process_list, num_cores, logger=None, dynamic_quantum=False, fixed_quantum=4,
+                 io_block_duration=10, io_request_times=(), policy="rr", base_quantum=BASE_QUANTUM,
+                 min_quantum=MIN_QUANTUM, keep_finished=True, record_writer=None, telemetry_interval=None,
+                 telemetry_capacity=4096, run_queue_options=None, fast_path=True):
+        self.logger = logger if logger is not None else Logger(log_file=None, log_to_console=False)
+        self.config = {
+            "num_cores": num_cores, "dynamic_quantum": dynamic_quantum, "fixed_quantum": fixed_quantum,
+            "io_block_duration": io_block_duration, "policy": policy, "base_quantum": base_quantum,
+            "min_quantum": min_quantum, "keep_finished": keep_finished, "telemetry_interval": telemetry_interval,
+            "telemetry_capacity": telemetry_capacity, "run_queue_options": run_queue_options,
+        }
+        self.clock = Clock(time_unit=0)
+        self.queue_manager = QueueManager(
+            job_queue=make_ready_queue(policy, num_cores, run_queue_options),
+            process_job_func=None,
+            logger=self.logger,
+            clock=self.clock,
+            io_request_flag=threading.Event(),
+            dynamic_quantum=dynamic_quantum,
+            fixed_quantum=fixed_quantum,
+            base_quantum=base_quantum,
+            min_quantum=min_quantum,
+            keep_finished=keep_finished,
+            record_writer=record_writer
+        )
+        self.num_cores = num_cores
+        self.io_block_duration = io_block_duration
+        self.fast_path = fast_path
+        self.solved = False
+
+        self.arrivals = ArrivalStream(process_list)
+
+        self.cpu_names = [f"CPU-{i + 1}" for i in range(num_cores)]
+        self.running_jobs = [None] * num_cores
+        self.slice_start = [0] * num_cores
+        self.cpu_generation = [0] * num_cores
+
+        self.events = []
+        self.event_seq = 0
+        for request_time in sorted(io_request_times):
+            self.push_event(request_time, IO_REQUEST, None)
+
+        self.io_flag_tick = None
+        self.requeued = False
+        self.total_time = 0
+        self.stop_requested = False
+        self.interrupted = False
+
+        self.telemetry = None
+        if telemetry_interval is not None:
+            from telemetry import TelemetrySampler
+
+            self.telemetry = TelemetrySampler(self.queue_manager, telemetry_interval, telemetry_capacity,
+                                              busy_cpus=lambda: self.num_cores - self.running_jobs.count(None))
+
+    @property
+    def finished_jobs(self):
+        return self.queue_manager.finished_jobs
+
+    @property
+    def metrics(self):
+        return self.queue_manager.metrics
+
+    def push_event(self, time, kind, data):
+        self.event_seq += 1
+        heapq.heappush(self.events, (time, kind, self.event_seq, data))
+
+    def next_event_time(self):
+        candidates = []
+        if not self.arrivals.exhausted():
+            # O Dispatcher só observa o relógio a partir do primeiro tick.
+            candidates.append(max(self.arrivals.next_arrival_time(), 1))
+        if self.events:
+            candidates.append(self.events[0][0])
+        if self.queue_manager.blocked_queue:
+            candidates.append(self.queue_manager.blocked_queue[0][0])
+        return min(candidates) if candidates else None
+
+    def get_state(self):
+        """Estado completo da simulação entre dois instantes, serializável com pickle."""
+        record_writer = self.queue_manager.record_writer
+        return {
+            "config": self.config,
+            "global_time": self.clock.global_time,
+            "arrivals_consumed": self.arrivals.consumed,
+            "queue_manager": self.queue_manager.get_state(),
+            "running_jobs": self.running_jobs,
+            "slice_start": self.slice_start,
+            "cpu_generation": self.cpu_generation,
+            "events": self.events,
+            "event_seq": self.event_seq,
+            "io_flag_tick": self.io_flag_tick,
+            "total_time": self.total_time,
+            "telemetry": self.telemetry.get_state() if self.telemetry is not None else None,
+            "record_offset": record_writer.tell() if record_writer is not None else None,
+        }
+
+    def set_state(self, state):
+        self.clock.global_time = state["global_time"]
+        self.arrivals.skip(state["arrivals_consumed"])
+        self.queue_manager.set_state(state["queue_manager"])
+        self.running_jobs = state["running_jobs"]
+        self.slice_start = state["slice_start"]
+        self.cpu_generation = state["cpu_generation"]
+        self.events = state["events"]
+        self.event_seq = state["event_seq"]
+        self.io_flag_tick = state["io_flag_tick"]
+        self.total_time = state["total_time"]
+        if self.telemetry is not None and state["telemetry"] is not None:
+            self.telemetry.set_state(state["telemetry"])
+
+    def save_checkpoint(self, file_path):
+        write_checkpoint(file_path, self.get_state())
+        self.logger.log(f"Checkpoint salvo em '{file_path}'.", self.clock.global_time)
+
+    @classmethod
+    def from_state(cls, state, process_list, logger=None, record_writer=None):
+        """
+        Recria o simulador a partir de um checkpoint (ver checkpoint.read_checkpoint).
+
+        process_list deve ser a mesma carga da execução original: os
+        processos já liberados antes do checkpoint são descartados dela e
+        os demais chegam normalmente. Para continuar um arquivo de
+        JobRecordWriter, abra-o com resume_offset=state["record_offset"].
+        """
+        simulator = cls(process_list, logger=logger, record_writer=record_writer, **state["config"])
+        simulator.set_state(state)
+        return simulator
+
+    def request_stop(self):
+        """Pede que run() pare ao fim do instante atual (por exemplo, de um tratador de sinal)."""
+        self.stop_requested = True
+
+    def run(self, checkpoint_file=None, checkpoint_interval=None):
+        """
+        Executa a simulação até não restarem eventos. Retorna o tempo final.
+
+        Com checkpoint_file, salva o estado a cada checkpoint_interval
+        unidades de tempo simulado (se informado) e ao parar por
+        request_stop(); nesse caso interrupted fica True e o tempo
+        retornado é o do último evento processado.
+        """
+        if checkpoint_file is None and self.can_solve():
+            total_time = self.solve()
+            if total_time is not None:
+                return total_time
+
+        telemetry = self.telemetry
+        next_checkpoint = None
+        if checkpoint_file is not None and checkpoint_interval is not None:
+            next_checkpoint = self.clock.global_time + checkpoint_interval
+
+        while True:
+            if self.stop_requested:
+                self.interrupted = True
+                if checkpoint_file is not None:
+                    self.save_checkpoint(checkpoint_file)
+                break
+
+            current_time = self.next_event_time()
+            if current_time is None:
+                break
+
+            if telemetry is not None:
+                # Entre dois eventos o estado não muda: as amostras desse intervalo repetem o último estado.
+                while telemetry.next_sample_time < current_time:
+                    telemetry.sample(telemetry.next_sample_time)
+
+            self.step(current_time)
+
+            if telemetry is not None and telemetry.next_sample_time == current_time:
+                telemetry.sample(current_time)
+
+            if next_checkpoint is not None and current_time >= next_checkpoint:
+                self.save_checkpoint(checkpoint_file)
+                next_checkpoint = current_time + checkpoint_interval
+
+        return self.total_time
+
+    def can_solve(self):
+        """Indica se a configuração permite resolver a simulação sem eventos (ver solve)."""
+        config = self.config
+        return (self.fast_path and config["policy"] == "rr" and not config["dynamic_quantum"]
+                and config["fixed_quantum"] >= 1 and config["run_queue_options"] is None
+                and self.telemetry is None and not self.logger.enabled and not self.events
+                and self.clock.global_time == 0 and self.arrivals.consumed == 0)
+
+    def solve(self):
+        """
+        Resolve a simulação inteira com rr_solver e retorna o tempo final.
+        Se algum job tiver perfil de E/S, devolve os jobs à fila de chegadas
+        e retorna None: a simulação segue pelos eventos.
+
+        Só dá para saber se a carga tem E/S depois de lê-la inteira, e ela
+        precisa poder voltar à fila de chegadas, então todos os jobs ficam
+        em memória de uma vez (algumas centenas de bytes por job), mesmo com
+        keep_finished=False e uma carga lida sob demanda do disco. Para
+        memória constante em cargas muito grandes, use fast_path=False.
+        """
+        from rr_solver import finished_jobs_in_order, record_metrics, solve_round_robin
+
+        jobs = self.arrivals.pop_until(float("inf"))
+        if any(job.io_bursts or job.execution_time < 1 for job in jobs):
+            self.arrivals = ArrivalStream(jobs)
+            return None
+
+        arrival_times = [job.arrival_time for job in jobs]
+        execution_times = [job.execution_time for job in jobs]
+        solution = solve_round_robin(arrival_times, execution_times, self.num_cores, self.config["fixed_quantum"])
+
+        q_manager = self.queue_manager
+        finished = finished_jobs_in_order(jobs, solution)
+        record_metrics(q_manager.metrics, arrival_times, execution_times, solution)
+        if q_manager.keep_finished:
+            q_manager.finished_jobs.extend(finished)
+        if q_manager.record_writer is not None:
+            for job in finished:
+                q_manager.record_writer.write(job)
+
+        self.solved = True
+        self.total_time = solution.total_time
+        self.clock.global_time = solution.total_time
+        return self.total_time
+
+    def step(self, current_time):
+        """Processa todos os eventos do instante current_time."""
+        self.clock.global_time = current_time
+        q_manager = self.queue_manager
+
+        q_manager.add_jobs(self.arrivals.pop_until(current_time))
+
+        for job in q_manager.pop_unblocked(current_time):
+            self.logger.log(f"IOManager: Processo {job.job_id} concluiu E/S.", current_time,
+                            event="io_done", job=job.job_id)
+            q_manager.add_job(job)
+
+        cpu_events = {}
+        io_requested = False
+        while self.events and self.events[0][0] == current_time:
+            _, kind, _, data = heapq.heappop(self.events)
+            if kind == CPU_EVENT:
+                cpu_index, generation, is_io = data
+                if generation == self.cpu_generation[cpu_index]:
+                    cpu_events[cpu_index] = is_io
+            elif kind == IO_REQUEST:
+                io_requested = True
+
+        preemptive = q_manager.job_queue.preemptive
+        self.requeued = False
+        for cpu_index in range(self.num_cores):
+            if cpu_index in cpu_events:
+                if cpu_events[cpu_index]:
+                    self.interrupt_for_io(cpu_index, current_time)
+                else:
+                    self.end_slice(cpu_index, current_time)
+            elif preemptive and self.running_jobs[cpu_index] is not None:
+                self.check_preemption(cpu_index, current_time)
+            if self.running_jobs[cpu_index] is None:
+                self.dispatch(cpu_index, current_time)
+
+        if io_requested and self.io_flag_tick is None:
+            self.logger.log("--- [EVENTO] Solicitação de E/S recebida ---", current_time)
+            self.io_flag_tick = current_time + 1
+        if self.io_flag_tick is not None:
+            self.deliver_io_request(current_time)
+
+        if not q_manager.job_queue.empty() and None in self.running_jobs:
+            # CPUs ociosas voltam a consultar a fila no próximo tick.
+            self.push_event(current_time + 1, POLL, None)
+        elif self.requeued and preemptive and any(self.running_jobs):
+            # CPUs que já passaram pela verificação neste tick repetem-na no próximo.
+            self.push_event(current_time + 1, POLL, None)
+
+    def dispatch(self, cpu_index, current_time):
+        q_manager = self.queue_manager
+        if q_manager.rebalance_queues():
+            # As CPUs já verificadas neste tick reavaliam a preempção no próximo.
+            self.requeued = True
+        try:
+            job, stolen = q_manager.job_queue.take(cpu_index, False)
+        except queue.Empty:
+            return
+        q_manager.assign_cpu(job, cpu_index, stolen)
+
+        time_slice = q_manager.start_slice(job, self.cpu_names[cpu_index])
+        self.running_jobs[cpu_index] = job
+        self.slice_start[cpu_index] = current_time
+        self.cpu_generation[cpu_index] += 1
+        self.push_event(current_time + time_slice, CPU_EVENT, (cpu_index, self.cpu_generation[cpu_index], False))
+
+    def end_slice(self, cpu_index, current_time):
+        job = self.release_cpu(cpu_index)
+        cpu_name = self.cpu_names[cpu_index]
+        self.queue_manager.account_execution(job, cpu_name, current_time - self.slice_start[cpu_index])
+        if self.queue_manager.end_slice(job, cpu_name):
+            self.requeued = True
+        self.total_time = current_time
+
+    def check_preemption(self, cpu_index, current_time):
+        """Contabiliza a execução até agora e cede a CPU se a política mandar."""
+        job = self.running_jobs[cpu_index]
+        self.queue_manager.account_execution(job, self.cpu_names[cpu_index], current_time - self.slice_start[cpu_index])
+        self.slice_start[cpu_index] = current_time
+
+        if not self.queue_manager.should_preempt(job):
+            return
+
+        # No meio da fatia o job não termina nem chega a uma E/S programada: end_slice só o devolve à fila.
+        self.release_cpu(cpu_index)
+        self.queue_manager.end_slice(job, self.cpu_names[cpu_index], quantum_expired=False)
+        self.requeued = True
+        self.total_time = current_time
+
+    def interrupt_for_io(self, cpu_index, current_time):
+        job = self.release_cpu(cpu_index)
+        cpu_name = self.cpu_names[cpu_index]
+        # O tick em que a E/S é percebida não é contabilizado como execução.
+        self.queue_manager.account_execution(job, cpu_name, current_time - 1 - self.slice_start[cpu_index])
+        self.queue_manager.interrupt_for_io(job, cpu_name, self.io_block_duration)
+        self.total_time = current_time
+
+    def release_cpu(self, cpu_index):
+        job = self.running_jobs[cpu_index]
+        self.running_jobs[cpu_index] = None
+        self.cpu_generation[cpu_index] += 1
+        return job
+
+    def deliver_io_request(self, current_time):
+        """Entrega a solicitação de E/S pendente à primeira CPU ocupada no próximo tick."""
+        if self.io_flag_tick > current_time + 1:
+            return
+
+        for cpu_index in range(self.num_cores):
+            if self.running_jobs[cpu_index] is not None:
+                self.cpu_generation[cpu_index] += 1
+                self.push_event(current_time + 1, CPU_EVENT, (cpu_index, self.cpu_generation[cpu_index], True))
+                self.io_flag_tick = None
+                return
@@ -0,0 +1,311 @@
+import argparse
+import heapq
+import json
+import sys
+import threading
+
+import numpy as np
+
+from logger import EVENT_CODES, EVENT_RECORD, EVENT_TYPES, cpu_number, encode_job_id
+
+# Mesmo layout de EVENT_RECORD, para ler os registros em blocos com NumPy.
+TRACE_DTYPE = np.dtype([("code", "u1"), ("time", "<i8"), ("cpu", "<i2"), ("job", "S16")])
+CHUNK_RECORDS = 1 << 16
+
+START = EVENT_CODES["start"]
+READY = EVENT_CODES["ready"]
+FINISH = EVENT_CODES["finish"]
+
+
+class TraceWriter:
+    """
+    Sink de eventos (ver Logger.add_sink) que grava o trace canônico da
+    simulação: registros binários EVENT_RECORD (evento, tempo, CPU, job)
+    ordenados por (tempo, evento, CPU, job).
+
+    A ordem em que as threads registram eventos de um mesmo tick varia de
+    uma execução para outra; o trace reordena cada tick antes de gravá-lo,
+    então duas execuções com o mesmo comportamento (inclusive em motores
+    diferentes) produzem arquivos idênticos byte a byte. Um tick só é
+    gravado quando chega um evento reorder_window ticks mais novo, o que
+    cobre threads que registram com algum atraso no modo em tempo real.
+    """
+
+    def __init__(self, file_path, reorder_window=1, buffer_size=1 << 16):
+        self.file = open(file_path, "wb")
+        self.reorder_window = reorder_window
+        self.buffer_size = buffer_size
+        self.lock = threading.Lock()
+        self.pending = []
+        self.encoded = []
+        self.latest_time = None
+        self.count = 0
+
+    def __call__(self, event, time, cpu, job):
+        record = (time if time is not None else -1, EVENT_CODES[event], cpu_number(cpu), encode_job_id(job))
+        with self.lock:
+            heapq.heappush(self.pending, record)
+            if self.latest_time is None or record[0] > self.latest_time:
+                self.latest_time = record[0]
+                self.write_until(self.latest_time - self.reorder_window)
+
+    def write_until(self, time_limit):
+        """Grava, em ordem, os eventos pendentes com tempo <= time_limit (chamar com o lock)."""
+        pending = self.pending
+        encoded = self.encoded
+        while pending and pending[0][0] <= time_limit:
+            time, code, cpu, job = heapq.heappop(pending)
+            encoded.append(EVENT_RECORD.pack(code, time, cpu, job))
+        if len(encoded) >= self.buffer_size:
+            self.write_encoded()
+
+    def write_encoded(self):
+        self.file.write(b"".join(self.encoded))
+        self.count += len(self.encoded)
+        self.encoded = []
+
+    def close(self):
+        """Grava os eventos ainda pendentes e fecha o arquivo."""
+        with self.lock:
+            while self.pending:
+                time, code, cpu, job = heapq.heappop(self.pending)
+                self.encoded.append(EVENT_RECORD.pack(code, time, cpu, job))
+            self.write_encoded()
+            self.file.close()
+
+
+def iter_trace_chunks(file_path, chunk_records=CHUNK_RECORDS):
+    """Lê um trace em blocos de até chunk_records registros, como arrays estruturados (TRACE_DTYPE)."""
+    with open(file_path, "rb") as f:
+        while True:
+            data = f.read(EVENT_RECORD.size * chunk_records)
+            if not data:
+                break
+            if len(data) % EVENT_RECORD.size:
+                raise ValueError(f"{file_path}: registro incompleto no fim do arquivo.")
+            yield np.frombuffer(data, dtype=TRACE_DTYPE)
+
+
+def decode_record(record):
+    code, time, cpu, job = record
+    return {"event": EVENT_TYPES[code - 1], "time": int(time), "cpu": int(cpu),
+            "job": job.rstrip(b"\0").decode("utf-8") or None}
+
+
+class JobTracker:
+    """
+    Métricas por job extraídas de um trace: tempo em que ficou pronto
+    pela primeira vez, número de despachos (eventos start) e tempo de
+    término. Cada bloco é resumido com NumPy, então o trabalho em Python é
+    proporcional aos jobs distintos do bloco, não ao número de eventos.
+    """
+
+    def __init__(self):
+        self.jobs = {}
+        self.recently_finished = []
+
+    def entry(self, job):
+        entry = self.jobs.get(job)
+        if entry is None:
+            entry = self.jobs[job] = [None, 0, None]
+        return entry
+
+    def update(self, chunk):
+        codes = chunk["code"]
+
+        ready = chunk[codes == READY]
+        jobs, first = np.unique(ready["job"], return_index=True)
+        for job, time in zip(jobs.tolist(), ready["time"][first].tolist()):
+            entry = self.entry(job)
+            if entry[0] is None:
+                entry[0] = time
+
+        jobs, counts = np.unique(chunk["job"][codes == START], return_counts=True)
+        for job, count in zip(jobs.tolist(), counts.tolist()):
+            self.entry(job)[1] += count
+
+        finished = chunk[codes == FINISH]
+        for job, time in zip(finished["job"].tolist(), finished["time"].tolist()):
+            self.entry(job)[2] = time
+            self.recently_finished.append(job)
+
+    def pop_finished(self, other):
+        """
+        Remove e retorna os pares (job, métricas daqui, métricas de other)
+        dos jobs que terminaram nos dois traces desde a última chamada.
+        """
+        pairs = []
+        for job in self.recently_finished + other.recently_finished:
+            entry = self.jobs.get(job)
+            other_entry = other.jobs.get(job)
+            if entry is not None and other_entry is not None and entry[2] is not None \
+                    and other_entry[2] is not None:
+                pairs.append((job, entry, other_entry))
+                del self.jobs[job]
+                del other.jobs[job]
+        self.recently_finished = []
+        other.recently_finished = []
+        return pairs
+
+
+def diff_traces(path_a, path_b, max_listed=10, chunk_records=CHUNK_RECORDS):
+    """
+    Compara dois traces canônicos lendo-os em paralelo, bloco a bloco,
+    sem carregá-los inteiros. Retorna um dicionário com:
+
+    - identical e o total de eventos de cada lado;
+    - first_divergence: índice e os dois registros no primeiro ponto em
+      que diferem (ou o fim do trace mais curto);
+    - por job finalizado nos dois: quantos diferem em término, turnaround
+      (desde o primeiro ready) ou despachos, a soma e o máximo das
+      diferenças e os max_listed jobs com maior diferença de término;
+    - jobs finalizados em apenas um dos traces.
+
+    Só os jobs ainda em andamento (ou já finalizados em apenas um lado)
+    ficam em memória.
+    """
+    tracker_a, tracker_b = JobTracker(), JobTracker()
+    chunks_a = iter_trace_chunks(path_a, chunk_records)
+    chunks_b = iter_trace_chunks(path_b, chunk_records)
+    buffer_a = buffer_b = np.empty(0, dtype=TRACE_DTYPE)
+    count_a = count_b = 0
+    first_divergence = None
+    compared = 0
+
+    deltas = {"finish_time": [0, 0], "turnaround_time": [0, 0], "dispatches": [0, 0]}
+    jobs_compared = jobs_differing = 0
+    largest = []
+
+    def compare_finished():
+        nonlocal jobs_compared, jobs_differing
+        for job, entry_a, entry_b in tracker_a.pop_finished(tracker_b):
+            jobs_compared += 1
+            ready_a, dispatches_a, finish_a = entry_a
+            ready_b, dispatches_b, finish_b = entry_b
+            job_deltas = {
+                "finish_time": finish_b - finish_a,
+                "turnaround_time": (finish_b - ready_b) - (finish_a - ready_a),
+                "dispatches": dispatches_b - dispatches_a,
+            }
+            if any(job_deltas.values()):
+                jobs_differing += 1
+                for name, delta in job_deltas.items():
+                    deltas[name][0] += delta
+                    deltas[name][1] = max(deltas[name][1], abs(delta))
+                item = (abs(job_deltas["finish_time"]), job.decode("utf-8"), job_deltas)
+                if len(largest) < max_listed:
+                    heapq.heappush(largest, item)
+                elif item > largest[0]:
+                    heapq.heapreplace(largest, item)
+
+    done_a = done_b = False
+    while True:
+        # Lê sempre do lado com menos registros pendentes de comparação.
+        if not done_a and (done_b or len(buffer_a) <= len(buffer_b)):
+            chunk = next(chunks_a, None)
+            if chunk is None:
+                done_a = True
+                continue
+            tracker_a.update(chunk)
+            count_a += len(chunk)
+            buffer_a = np.concatenate((buffer_a, chunk)) if len(buffer_a) else chunk
+        elif not done_b:
+            chunk = next(chunks_b, None)
+            if chunk is None:
+                done_b = True
+                continue
+            tracker_b.update(chunk)
+            count_b += len(chunk)
+            buffer_b = np.concatenate((buffer_b, chunk)) if len(buffer_b) else chunk
+        else:
+            break
+
+        # Compara a parte em que os dois lados já foram lidos.
+        common = min(len(buffer_a), len(buffer_b))
+        if common and first_divergence is None:
+            raw_a = buffer_a[:common].view(np.uint8).reshape(common, TRACE_DTYPE.itemsize)
+            raw_b = buffer_b[:common].view(np.uint8).reshape(common, TRACE_DTYPE.itemsize)
+            differing = np.flatnonzero((raw_a != raw_b).any(axis=1))
+            if len(differing):
+                index = int(differing[0])
+                first_divergence = {"index": compared + index, "a": decode_record(buffer_a[index]),
+                                    "b": decode_record(buffer_b[index])}
+        compared += common
+        buffer_a, buffer_b = buffer_a[common:], buffer_b[common:]
+        compare_finished()
+
+        if first_divergence is None and (done_a and len(buffer_b) or done_b and len(buffer_a)):
+            # Um trace acabou antes do outro: o próximo evento do mais longo é a divergência.
+            first_divergence = {"index": compared, "a": decode_record(buffer_a[0]) if len(buffer_a) else None,
+                                "b": decode_record(buffer_b[0]) if len(buffer_b) else None}
+        if first_divergence is not None:
+            # Depois da divergência só interessam as métricas por job; nada mais é comparado.
+            buffer_a = buffer_b = np.empty(0, dtype=TRACE_DTYPE)
+
+    if first_divergence is None and (len(buffer_a) or len(buffer_b)):
+        first_divergence = {"index": compared, "a": decode_record(buffer_a[0]) if len(buffer_a) else None,
+                            "b": decode_record(buffer_b[0]) if len(buffer_b) else None}
+
+    only_a = sorted(job.decode("utf-8") for job, entry in tracker_a.jobs.items() if entry[2] is not None)
+    only_b = sorted(job.decode("utf-8") for job, entry in tracker_b.jobs.items() if entry[2] is not None)
+    return {
+        "identical": first_divergence is None,
+        "events_a": count_a,
+        "events_b": count_b,
+        "first_divergence": first_divergence,
+        "jobs_compared": jobs_compared,
+        "jobs_differing": jobs_differing,
+        "delta_sum": {name: total for name, (total, _) in deltas.items()},
+        "delta_max_abs": {name: maximum for name, (_, maximum) in deltas.items()},
+        "largest_finish_deltas": [{"job": job, **job_deltas}
+                                  for _, job, job_deltas in sorted(largest, reverse=True)],
+        "finished_only_in_a": only_a[:max_listed],
+        "finished_only_in_b": only_b[:max_listed],
+        "num_finished_only_in_a": len(only_a),
+        "num_finished_only_in_b": len(only_b),
+    }
+
+
+def format_event(record):
+    if record is None:
+        return "(fim do trace)"
+    cpu = f" CPU-{record['cpu']}" if record["cpu"] >= 0 else ""
+    return f"T={record['time']} {record['event']}{cpu} {record['job'] or ''}".rstrip()
+
+
+def print_diff(result):
+    print(f"Eventos: {result['events_a']} x {result['events_b']}")
+    if result["identical"]:
+        print("Traces idênticos.")
+        return
+
+    divergence = result["first_divergence"]
+    print(f"Primeira divergência no evento {divergence['index']}:")
+    print(f"  A: {format_event(divergence['a'])}")
+    print(f"  B: {format_event(divergence['b'])}")
+    print(f"Jobs comparados: {result['jobs_compared']}, com diferença: {result['jobs_differing']}")
+    for name in ("finish_time", "turnaround_time", "dispatches"):
+        print(f"  {name}: soma das diferenças (B - A)={result['delta_sum'][name]}, "
+              f"máxima em módulo={result['delta_max_abs'][name]}")
+    for item in result["largest_finish_deltas"]:
+        print(f"  {item['job']}: término {item['finish_time']:+}, turnaround {item['turnaround_time']:+}, "
+              f"despachos {item['dispatches']:+}")
+    if result["num_finished_only_in_a"] or result["num_finished_only_in_b"]:
+        print(f"Finalizados só em A: {result['num_finished_only_in_a']} {result['finished_only_in_a']}")
+        print(f"Finalizados só em B: {result['num_finished_only_in_b']} {result['finished_only_in_b']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara dois traces canônicos de simulação (TraceWriter).")
+    parser.add_argument("trace_a")
+    parser.add_argument("trace_b")
+    parser.add_argument("--max-listed", type=int, default=10, help="jobs com maior diferença listados")
+    parser.add_argument("--json", action="store_true", help="imprime o resultado em JSON")
+    arguments = parser.parse_args()
+
+    diff = diff_traces(arguments.trace_a, arguments.trace_b, arguments.max_listed)
+    if arguments.json:
+        print(json.dumps(diff, indent=2))
+    else:
+        print_diff(diff)
+    sys.exit(0 if diff["identical"] else 1)
@@ -0,0 +1,114 @@
+import threading
+
+import numpy as np
+
+from logger import cpu_number
+
+CLOSING_EVENTS = ("preempt", "finish", "io_request", "interrupted")
+
+
+class IntervalLane:
+    """Intervalos de execução de uma CPU em arrays NumPy que crescem por duplicação."""
+
+    def __init__(self, initial_capacity=1024):
+        self.starts = np.empty(initial_capacity, dtype=np.int64)
+        self.durations = np.empty(initial_capacity, dtype=np.int64)
+        self.jobs = np.empty(initial_capacity, dtype=np.int32)
+        self.size = 0
+
+    def append(self, start, duration, job_code):
+        if self.size == len(self.starts):
+            capacity = 2 * len(self.starts)
+            self.starts = np.resize(self.starts, capacity)
+            self.durations = np.resize(self.durations, capacity)
+            self.jobs = np.resize(self.jobs, capacity)
+
+        self.starts[self.size] = start
+        self.durations[self.size] = duration
+        self.jobs[self.size] = job_code
+        self.size += 1
+
+    def arrays(self):
+        """Retorna (inícios, durações, códigos de job) apenas com as posições preenchidas."""
+        return self.starts[:self.size], self.durations[:self.size], self.jobs[:self.size]
+
+
+class GanttRecorder:
+    """
+    Sink de eventos (ver Logger.add_sink) que monta o gráfico de Gantt
+    incrementalmente, sem reler nem interpretar o arquivo de log.
+
+    Cada CPU só escreve na sua própria faixa, então os workers não
+    disputam nenhum lock no caminho comum; apenas o cadastro de um job
+    visto pela primeira vez é protegido.
+    """
+
+    def __init__(self, num_cores, initial_capacity=1024):
+        self.num_cores = num_cores
+        self.lanes = [IntervalLane(initial_capacity) for _ in range(num_cores)]
+        self.active = [None] * num_cores
+        self.job_codes = {}
+        self.job_ids = []
+        self.codes_lock = threading.Lock()
+        self.max_time = 0
+
+    def job_code(self, job_id):
+        code = self.job_codes.get(job_id)
+        if code is None:
+            with self.codes_lock:
+                code = self.job_codes.get(job_id)
+                if code is None:
+                    code = len(self.job_ids)
+                    self.job_ids.append(job_id)
+                    self.job_codes[job_id] = code
+        return code
+
+    def __call__(self, event, time, cpu, job):
+        if cpu is None or time is None:
+            return
+        if time > self.max_time:
+            self.max_time = time
+
+        index = cpu_number(cpu) - 1
+        if event == "start":
+            if self.active[index] is not None:
+                self.close_interval(index, time)
+            self.active[index] = (self.job_code(job), time)
+        elif event in CLOSING_EVENTS:
+            active = self.active[index]
+            if active is not None and self.job_ids[active[0]] == job:
+                self.close_interval(index, time)
+
+    def close_interval(self, index, end_time):
+        job_code, start_time = self.active[index]
+        self.active[index] = None
+        if end_time > start_time:
+            self.lanes[index].append(start_time, end_time - start_time, job_code)
+
+    def finalize(self, end_time=None):
+        """Fecha os intervalos ainda abertos (simulação interrompida) no último tempo observado."""
+        end_time = self.max_time if end_time is None else end_time
+        for index in range(self.num_cores):
+            if self.active[index] is not None:
+                self.close_interval(index, end_time)
+
+    def get_state(self):
+        """Intervalos fechados e ids dos jobs, para remontar o gráfico sem simular de novo (result_cache.py)."""
+        return {"lanes": [tuple(array.copy() for array in lane.arrays()) for lane in self.lanes],
+                "job_ids": self.job_ids, "max_time": self.max_time}
+
+    def set_state(self, state):
+        for index, (starts, durations, jobs) in enumerate(state["lanes"]):
+            lane = IntervalLane(max(len(starts), 1))
+            lane.starts[:len(starts)] = starts
+            lane.durations[:len(starts)] = durations
+            lane.jobs[:len(starts)] = jobs
+            lane.size = len(starts)
+            self.lanes[index] = lane
+        self.job_ids = list(state["job_ids"])
+        self.job_codes = {job_id: code for code, job_id in enumerate(self.job_ids)}
+        self.active = [None] * self.num_cores
+        self.max_time = state["max_time"]
+
+    def interval_count(self):
+        return sum(lane.size for lane in self.lanes)
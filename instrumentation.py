@@ -0,0 +1,183 @@
+import bisect
+import json
+import math
+import threading
+import time
+
+from run_queues import PerCpuRunQueues
+
+# Limites superiores (em microssegundos) das faixas do histograma de espera.
+HISTOGRAM_BOUNDS_US = (1, 10, 100, 1_000, 10_000, 100_000, math.inf)
+
+
+class LockStats:
+    """Estatísticas de um lock (ou condição) para uma thread."""
+
+    __slots__ = ('acquisitions', 'total_wait', 'max_wait', 'total_hold', 'histogram')
+
+    def __init__(self):
+        self.acquisitions = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.total_hold = 0.0
+        self.histogram = [0] * len(HISTOGRAM_BOUNDS_US)
+
+    def record_wait(self, seconds):
+        self.acquisitions += 1
+        self.total_wait += seconds
+        if seconds > self.max_wait:
+            self.max_wait = seconds
+        self.histogram[bisect.bisect_left(HISTOGRAM_BOUNDS_US, seconds * 1e6)] += 1
+
+    def to_dict(self):
+        return {
+            "acquisitions": self.acquisitions,
+            "total_wait": self.total_wait,
+            "max_wait": self.max_wait,
+            "total_hold": self.total_hold,
+            "wait_histogram_us": dict(zip(map(str, HISTOGRAM_BOUNDS_US), self.histogram)),
+        }
+
+
+class LockProfiler:
+    """
+    Coleta, por lock e por nome de thread (CPU-n, IOManager, Dispatcher,
+    ConsoleMonitor...), o número de aquisições, o histograma do tempo de
+    espera e o tempo em que o lock ficou retido.
+
+    Cada par (lock, thread) só é atualizado pela própria thread, então o
+    registro não precisa de lock além do usado para criar a entrada.
+    """
+
+    def __init__(self):
+        self.stats = {}
+        self.stats_lock = threading.Lock()
+
+    def stats_for(self, lock_name):
+        key = (lock_name, threading.current_thread().name)
+        stats = self.stats.get(key)
+        if stats is None:
+            with self.stats_lock:
+                stats = self.stats.setdefault(key, LockStats())
+        return stats
+
+    def to_dict(self):
+        return {f"{lock_name} [{thread_name}]": stats.to_dict()
+                for (lock_name, thread_name), stats in sorted(self.stats.items())}
+
+    def export(self, file_path):
+        """Grava to_dict() em JSON."""
+        with open(file_path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def print_report(self):
+        print("\n--- Contenção de Locks (por thread) ---")
+        if not self.stats:
+            print("Nenhuma aquisição registrada.")
+            return
+
+        print(f"{'Lock':<28} {'Thread':<16} {'Aquis.':>9} {'Espera(ms)':>11} {'Máx(ms)':>9} {'Retido(ms)':>11}")
+        for (lock_name, thread_name), stats in sorted(self.stats.items()):
+            print(f"{lock_name:<28} {thread_name:<16} {stats.acquisitions:>9} {stats.total_wait * 1e3:>11.2f} "
+                  f"{stats.max_wait * 1e3:>9.2f} {stats.total_hold * 1e3:>11.2f}")
+
+        labels = ["<=" + (f"{bound}us" if bound != math.inf else "inf") for bound in HISTOGRAM_BOUNDS_US]
+        print("\nHistograma de espera (aquisições por faixa): " + " | ".join(labels))
+        for (lock_name, thread_name), stats in sorted(self.stats.items()):
+            print(f"  {lock_name} [{thread_name}]: {stats.histogram}")
+
+
+class InstrumentedLock:
+    """
+    Substituto de threading.Lock que mede espera e retenção.
+
+    Implementa _is_owned, _release_save e _acquire_restore para poder ser
+    usado como lock de threading.Condition: a retomada do lock ao sair de
+    wait() também é medida.
+    """
+
+    def __init__(self, name, profiler, lock=None):
+        self.name = name
+        self.profiler = profiler
+        self.lock = lock if lock is not None else threading.Lock()
+        self.acquired_at = 0.0
+
+    def acquire(self, blocking=True, timeout=-1):
+        started = time.perf_counter()
+        acquired = self.lock.acquire(blocking, timeout)
+        if acquired:
+            self.acquired_at = time.perf_counter()
+            self.profiler.stats_for(self.name).record_wait(self.acquired_at - started)
+        return acquired
+
+    def release(self):
+        self.profiler.stats_for(self.name).total_hold += time.perf_counter() - self.acquired_at
+        self.lock.release()
+
+    __enter__ = acquire
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+    def locked(self):
+        return self.lock.locked()
+
+    def _is_owned(self):
+        return self.lock.locked()
+
+    def _release_save(self):
+        self.release()
+
+    def _acquire_restore(self, state):
+        self.acquire()
+
+
+class InstrumentedCondition(threading.Condition):
+    """Condição que registra o tempo passado em wait() sob o nome informado."""
+
+    def __init__(self, name, profiler, lock):
+        super().__init__(lock)
+        self.name = name
+        self.profiler = profiler
+
+    def wait(self, timeout=None):
+        started = time.perf_counter()
+        try:
+            return super().wait(timeout)
+        finally:
+            self.profiler.stats_for(self.name).record_wait(time.perf_counter() - started)
+
+
+def instrument_queue(job_queue, name, profiler):
+    """Troca o mutex de uma queue.Queue (e as condições que o usam) por versões instrumentadas."""
+    job_queue.mutex = InstrumentedLock(name, profiler)
+    job_queue.not_empty = InstrumentedCondition(f"{name}.not_empty", profiler, job_queue.mutex)
+    job_queue.not_full = InstrumentedCondition(f"{name}.not_full", profiler, job_queue.mutex)
+    job_queue.all_tasks_done = InstrumentedCondition(f"{name}.all_tasks_done", profiler, job_queue.mutex)
+
+
+def instrument_runtime(profiler, clock, queue_manager, logger):
+    """
+    Instrumenta os locks do modo com threads: time_lock e as condições do
+    clock, fila de prontos (ou cada fila local de PerCpuRunQueues),
+    blocked_lock, finish_lock, io_flag_lock e o lock do Logger.
+
+    Deve ser chamada antes de iniciar qualquer thread e de registrar os
+    participantes do clock. Sem esta chamada nada é substituído e não há
+    custo algum.
+    """
+    clock.time_lock = InstrumentedLock("clock.time_lock", profiler)
+    clock.tick_condition = InstrumentedCondition("clock.tick_condition", profiler, clock.time_lock)
+    clock.turn_condition = InstrumentedCondition("clock.turn_condition", profiler, clock.time_lock)
+    clock.condition_factory = lambda lock: InstrumentedCondition("clock.wait_turn/wait_until", profiler, lock)
+
+    job_queue = queue_manager.job_queue
+    if isinstance(job_queue, PerCpuRunQueues):
+        for cpu_index, local in enumerate(job_queue.queues):
+            instrument_queue(local, f"run_queue[CPU-{cpu_index + 1}].mutex", profiler)
+    else:
+        instrument_queue(job_queue, "ready_queue.mutex", profiler)
+    queue_manager.blocked_lock = InstrumentedLock("blocked_lock", profiler)
+    queue_manager.finish_lock = InstrumentedLock("finish_lock", profiler)
+    queue_manager.io_flag_lock = InstrumentedLock("io_flag_lock", profiler)
+    logger.lock = InstrumentedLock("logger.lock", profiler)
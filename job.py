@@ -10,15 +10,34 @@ class JobStatus(Enum):
 
 
 class Job:
-    def __init__(self, job_id, arrival_time, execution_time):
+    __slots__ = ('job_id', 'arrival_time', 'execution_time', 'remaining_time', 'priority', 'status', 'queue_level',
+                 'wait_time', 'turnaround_time', 'context_switches', 'io_block_end_time', 'io_bursts', 'io_index',
+                 'last_cpu')
+
+    def __init__(self, job_id, arrival_time, execution_time, priority=0, io_bursts=()):
         self.job_id = job_id
         self.arrival_time = arrival_time
         self.execution_time = execution_time
         self.remaining_time = execution_time
+        self.priority = priority
         self.status = JobStatus.NEW
+        self.queue_level = 0
 
         self.wait_time = 0
         self.turnaround_time = 0
         self.context_switches = 0
 
-        self.io_block_end_time = 0
\ No newline at end of file
+        self.io_block_end_time = 0
+
+        # Perfil de E/S: pares (tempo de CPU já executado, duração da E/S), em ordem.
+        self.io_bursts = io_bursts
+        self.io_index = 0
+
+        # Índice da última CPU em que o job rodou (-1 se ainda não rodou).
+        self.last_cpu = -1
+
+    def next_io_burst(self):
+        """Próxima rajada de E/S programada como (tempo de CPU executado, duração), ou None."""
+        if self.io_index < len(self.io_bursts):
+            return self.io_bursts[self.io_index]
+        return None
\ No newline at end of file
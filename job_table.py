@@ -0,0 +1,112 @@
+from array import array
+
+from job import JobStatus
+
+NUMERIC_COLUMNS = ('arrival_time', 'execution_time', 'remaining_time', 'priority', 'queue_level', 'wait_time',
+                   'turnaround_time', 'context_switches', 'io_block_end_time', 'io_index', 'last_cpu')
+STATUSES = list(JobStatus)
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+
+
+class JobTable:
+    """
+    Armazena os jobs em colunas (array.array), uma linha por job.
+
+    Ocupa uma fração da memória de objetos Job e permite agregações
+    vetorizadas: column() expõe cada coluna como um array NumPy sem cópia.
+    O escalonador opera sobre as linhas por meio de JobView.
+    """
+
+    def __init__(self):
+        self.job_ids = []
+        for name in NUMERIC_COLUMNS:
+            setattr(self, name, array('q'))
+        self.status = array('b')
+        # Perfis de E/S são raros e de tamanho variável: ficam fora das colunas, por índice de linha.
+        self.io_bursts = {}
+
+    @classmethod
+    def from_jobs(cls, jobs):
+        """Monta a tabela a partir de um iterável de Job (por exemplo, open_workload)."""
+        table = cls()
+        for job in jobs:
+            table.append(job.job_id, job.arrival_time, job.execution_time, job.priority, job.io_bursts)
+        return table
+
+    def append(self, job_id, arrival_time, execution_time, priority=0, io_bursts=()):
+        """Adiciona um job novo e retorna o índice da sua linha."""
+        if io_bursts:
+            self.io_bursts[len(self.job_ids)] = io_bursts
+        self.job_ids.append(job_id)
+        self.arrival_time.append(arrival_time)
+        self.execution_time.append(execution_time)
+        self.remaining_time.append(execution_time)
+        self.priority.append(priority)
+        for name in ('queue_level', 'wait_time', 'turnaround_time', 'context_switches', 'io_block_end_time',
+                     'io_index'):
+            getattr(self, name).append(0)
+        self.last_cpu.append(-1)
+        self.status.append(STATUS_CODES[JobStatus.NEW])
+        return len(self.job_ids) - 1
+
+    def __len__(self):
+        return len(self.job_ids)
+
+    def view(self, index):
+        return JobView(self, index)
+
+    def views(self):
+        """Gera um JobView por linha, na ordem da tabela."""
+        return (JobView(self, index) for index in range(len(self.job_ids)))
+
+    def column(self, name):
+        """Coluna como array NumPy que compartilha a memória da tabela (não redimensionar enquanto em uso)."""
+        import numpy as np
+
+        data = getattr(self, name)
+        return np.frombuffer(data, dtype=np.int8 if name == 'status' else np.int64)
+
+
+def _column_property(name):
+    def getter(self):
+        return getattr(self.table, name)[self.index]
+
+    def setter(self, value):
+        getattr(self.table, name)[self.index] = value
+
+    return property(getter, setter)
+
+
+class JobView:
+    """Linha de uma JobTable com a mesma interface de Job."""
+
+    __slots__ = ('table', 'index')
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    @property
+    def job_id(self):
+        return self.table.job_ids[self.index]
+
+    @property
+    def io_bursts(self):
+        return self.table.io_bursts.get(self.index, ())
+
+    def next_io_burst(self):
+        io_bursts = self.io_bursts
+        io_index = self.io_index
+        return io_bursts[io_index] if io_index < len(io_bursts) else None
+
+    @property
+    def status(self):
+        return STATUSES[self.table.status[self.index]]
+
+    @status.setter
+    def status(self, value):
+        self.table.status[self.index] = STATUS_CODES[value]
+
+
+for _name in NUMERIC_COLUMNS:
+    setattr(JobView, _name, _column_property(_name))
@@ -1,17 +1,70 @@
 import datetime
+import json
+import queue
+import struct
 import threading
+import time as wall_clock
+
+EVENT_TYPES = ("ready", "start", "slice", "preempt", "finish", "io_request", "blocked", "io_done", "interrupted")
+EVENT_CODES = {event: code for code, event in enumerate(EVENT_TYPES, 1)}
+
+# Registro binário de tamanho fixo: código do evento, tempo global, número da CPU (-1 se não houver) e id do job.
+EVENT_RECORD = struct.Struct("<Bqh16s")
+JOB_ID_BYTES = 16
+
+_STOP = object()
 
 
 class Logger:
-    def __init__(self, log_file="simulation.log", log_to_console=True):
+    """
+    Log de texto da simulação (arquivo e/ou console) e distribuição dos
+    eventos estruturados aos sinks.
+
+    Com segment_dir, o log também é gravado em segmentos comprimidos com
+    índice por tempo global e job (ver segmented_log.py), que permitem ler
+    um trecho de uma execução longa sem percorrer o log inteiro.
+    """
+
+    def __init__(self, log_file="simulation.log", log_to_console=True, segment_dir=None):
         self.log_file = log_file
         self.lock = threading.Lock()
         self.log_to_console = log_to_console
-        with open(self.log_file, "w") as f:
-            f.write("Log da Simulação do Escalonador Round Robin\n")
-            f.write("=" * 40 + "\n")
+        self.segments = None
+        if segment_dir is not None:
+            from segmented_log import SegmentedLogWriter
+
+            self.segments = SegmentedLogWriter(segment_dir)
+        self.text_enabled = log_file is not None or log_to_console or self.segments is not None
+        self.enabled = self.text_enabled
+        self.sinks = []
+        if self.log_file is not None:
+            with open(self.log_file, "w") as f:
+                f.write("Log da Simulação do Escalonador Round Robin\n")
+                f.write("=" * 40 + "\n")
+
+    def add_sink(self, sink):
+        """Registra um consumidor chamado como sink(event, time, cpu, job) a cada evento estruturado."""
+        self.sinks.append(sink)
+        self.enabled = True
+
+    def emit(self, event, time, cpu=None, job=None):
+        """Registra apenas o evento estruturado, sem linha de texto."""
+        for sink in self.sinks:
+            sink(event, time, cpu, job)
+
+        if self.segments is not None:
+            timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            with self.lock:
+                self.segments.write(timestamp, time, None, event, cpu, job)
+
+    def log(self, message, time=None, event=None, cpu=None, job=None):
+        if event is not None:
+            for sink in self.sinks:
+                sink(event, time, cpu, job)
+
+        if not self.text_enabled:
+            return
 
-    def log(self, message, time=None):
         timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         time_prefix = f"[Global Time: {time}]" if time is not None else ""
         log_message = f"[{timestamp}]{time_prefix} {message}\n"
@@ -19,6 +72,209 @@ class Logger:
         if self.log_to_console:
             print(log_message.strip())
 
+        if self.segments is not None:
+            with self.lock:
+                self.segments.write(timestamp, time, message, event, cpu, job)
+
+        if self.log_file is None:
+            return
+
         with self.lock:
             with open(self.log_file, "a") as f:
-                f.write(log_message)
\ No newline at end of file
+                f.write(log_message)
+
+    def flush(self):
+        """Grava o bloco pendente dos segmentos; no arquivo de texto, cada mensagem já é gravada imediatamente."""
+        if self.segments is not None:
+            with self.lock:
+                self.segments.write_block()
+
+    def close(self):
+        """Fecha os segmentos, se houver (o arquivo de texto é aberto e fechado a cada mensagem)."""
+        if self.segments is not None:
+            with self.lock:
+                self.segments.close()
+
+
+class BufferedLogger(Logger):
+    """
+    Logger assíncrono: as chamadas a log() apenas enfileiram o registro e
+    uma thread de escrita grava os lotes por um único handle de arquivo.
+
+    Além do texto legível, registros com o campo event podem ser gravados
+    em structured_file como JSONL ("jsonl") ou em registros binários de
+    tamanho fixo ("binary", ver EVENT_RECORD). Os segmentos (segment_dir)
+    também são gravados pela thread de escrita.
+    """
+
+    def __init__(self, log_file="simulation.log", log_to_console=False, flush_interval=0.5, flush_size=1000,
+                 structured_file=None, structured_format="jsonl", segment_dir=None):
+        if structured_format not in ("jsonl", "binary"):
+            raise ValueError(f"Formato estruturado desconhecido: {structured_format}")
+
+        super().__init__(log_file, log_to_console, segment_dir)
+        self.queue_records = self.text_enabled or structured_file is not None
+        self.enabled = self.enabled or self.queue_records
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self.structured_format = structured_format
+        self.binary_events = structured_file is not None and structured_format == "binary"
+
+        self.text_handle = open(log_file, "a") if log_file is not None else None
+        self.structured_handle = None
+        if structured_file is not None:
+            mode = "wb" if structured_format == "binary" else "w"
+            self.structured_handle = open(structured_file, mode)
+
+        self.records = queue.SimpleQueue()
+        self.cached_second = None
+        self.cached_timestamp = ""
+
+        self.writer = threading.Thread(target=self.run_writer, name="LogWriter", daemon=True)
+        self.writer.start()
+
+    def log(self, message, time=None, event=None, cpu=None, job=None):
+        if event is not None:
+            for sink in self.sinks:
+                sink(event, time, cpu, job)
+
+        if self.queue_records:
+            if self.binary_events and event is not None:
+                # Validado aqui, e não na thread de escrita, para que o erro chegue a quem registrou o evento.
+                encode_job_id(job)
+            self.records.put((wall_clock.time(), message, time, event, cpu, job))
+
+    def emit(self, event, time, cpu=None, job=None):
+        for sink in self.sinks:
+            sink(event, time, cpu, job)
+
+        if self.structured_handle is not None or self.segments is not None:
+            if self.binary_events:
+                encode_job_id(job)
+            self.records.put((wall_clock.time(), None, time, event, cpu, job))
+
+    def run_writer(self):
+        """Loop da thread de escrita: agrupa registros e grava por tamanho ou intervalo."""
+        batch = []
+        last_flush = wall_clock.monotonic()
+
+        while True:
+            try:
+                record = self.records.get(timeout=self.flush_interval)
+            except queue.Empty:
+                record = None
+
+            if record is _STOP:
+                self.write_batch(batch)
+                return
+
+            if isinstance(record, threading.Event):
+                self.write_batch(batch)
+                if self.segments is not None:
+                    self.segments.write_block()
+                batch = []
+                last_flush = wall_clock.monotonic()
+                record.set()
+                continue
+
+            if record is not None:
+                batch.append(record)
+
+            if len(batch) >= self.flush_size or wall_clock.monotonic() - last_flush >= self.flush_interval:
+                self.write_batch(batch)
+                batch = []
+                last_flush = wall_clock.monotonic()
+
+    def write_batch(self, batch):
+        if not batch:
+            return
+
+        if self.text_handle is not None or self.log_to_console:
+            lines = [self.format_text(record) for record in batch if record[1] is not None]
+            if self.log_to_console:
+                print("".join(lines), end="")
+            if self.text_handle is not None:
+                self.text_handle.write("".join(lines))
+                self.text_handle.flush()
+
+        if self.structured_handle is not None:
+            structured = [record for record in batch if record[3] is not None]
+            if self.structured_format == "binary":
+                self.structured_handle.write(b"".join(encode_binary_event(*record[2:]) for record in structured))
+            else:
+                self.structured_handle.write("".join(encode_json_event(*record[2:]) for record in structured))
+            self.structured_handle.flush()
+
+        if self.segments is not None:
+            for wall_time, message, time, event, cpu, job in batch:
+                self.segments.write(self.format_timestamp(wall_time), time, message, event, cpu, job)
+
+    def format_timestamp(self, wall_time):
+        second = int(wall_time)
+        if second != self.cached_second:
+            self.cached_second = second
+            self.cached_timestamp = datetime.datetime.fromtimestamp(second).strftime("%Y-%m-%d %H:%M:%S")
+        return self.cached_timestamp
+
+    def format_text(self, record):
+        wall_time, message, time, _, _, _ = record
+        time_prefix = f"[Global Time: {time}]" if time is not None else ""
+        return f"[{self.format_timestamp(wall_time)}]{time_prefix} {message}\n"
+
+    def flush(self):
+        """Bloqueia até que todos os registros enfileirados tenham sido gravados."""
+        if not self.writer.is_alive():
+            return
+        done = threading.Event()
+        self.records.put(done)
+        done.wait()
+
+    def close(self):
+        """Grava o que estiver pendente, encerra a thread de escrita e fecha os arquivos."""
+        if self.writer.is_alive():
+            self.records.put(_STOP)
+            self.writer.join()
+        if self.segments is not None:
+            self.segments.close()
+        if self.text_handle is not None:
+            self.text_handle.close()
+        if self.structured_handle is not None:
+            self.structured_handle.close()
+
+
+def cpu_number(cpu):
+    """Converte um nome como 'CPU-3' no número 3 (-1 quando não há CPU)."""
+    if cpu is None:
+        return -1
+    return int(cpu.rsplit("-", 1)[1])
+
+
+def encode_json_event(time, event, cpu, job):
+    return json.dumps({"event": event, "time": time, "cpu": cpu_number(cpu), "job": job},
+                      separators=(",", ":")) + "\n"
+
+
+def encode_job_id(job):
+    """Id do job para EVENT_RECORD; struct truncaria em silêncio um id com mais de JOB_ID_BYTES bytes."""
+    if job is None:
+        return b""
+    raw_id = job.encode("utf-8")
+    if len(raw_id) > JOB_ID_BYTES:
+        raise ValueError(f"Id de job longo demais para o log binário (máx. {JOB_ID_BYTES} bytes): {job}")
+    return raw_id
+
+
+def encode_binary_event(time, event, cpu, job):
+    return EVENT_RECORD.pack(EVENT_CODES[event], time if time is not None else -1, cpu_number(cpu),
+                             encode_job_id(job))
+
+
+def iter_binary_events(path):
+    """Lê um arquivo de eventos binários, retornando (evento, tempo, cpu, job) para cada registro."""
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(EVENT_RECORD.size * 4096)
+            if not chunk:
+                break
+            for code, time, cpu, job in EVENT_RECORD.iter_unpack(chunk):
+                yield EVENT_TYPES[code - 1], time, cpu, job.rstrip(b"\0").decode("utf-8") or None
@@ -1,63 +1,109 @@
-import csv
+import argparse
+import os
+import signal
 import time
 import threading
-import queue
 from queue_manager import QueueManager
-from job import Job, JobStatus
-from logger import Logger
-from plotter import plot_gantt_chart
+from job import Job
+from logger import Logger, BufferedLogger
 from clock import Clock
 from dispatcher import Dispatcher
-from pynput import keyboard
 from console_monitor import ConsoleMonitor
+from event_engine import EventSimulator
+from run_queues import make_ready_queue
+from policies import POLICIES
+from workload import load_jobs_from_csv, open_workload, scan_workload
+from job_table import JobTable
+from metrics import summarize, finished_job_list, job_id_sort_key, JobRecordWriter
+from instrumentation import LockProfiler, instrument_runtime
+from checkpoint import read_checkpoint
 
 NUM_CORES = 2
 QUANTUM = 5
-INPUT_CSV = "processes.csv"
+INPUT_CSV = "processes.csv"  # CSV ou arquivo binário gerado por "python workload.py entrada.csv saida.bin"
 USE_DYNAMIC_QUANTUM = True
+SCHEDULING_POLICY = "rr"  # "rr", "sjf", "srtf", "priority" ou "mlfq"
 IO_BLOCK_DURATION = 10
+ENGINE = "threaded"  # "threaded" (tempo real, com threads), "async" (tempo real, corrotinas) ou "event" (sem espera)
+# No motor de eventos, execuções de "rr" com quantum fixo, sem E/S, log, Gantt, trace nem telemetria são
+# resolvidas direto, sem simular evento a evento, com o mesmo resultado (ver rr_solver.py)
+FAST_PATH = True
+DETERMINISTIC_CLOCK = False  # Com threads ou async, avança o clock assim que todos confirmam o tick, sem dormir
+BUFFERED_LOG = False  # Grava o log em uma thread separada, em lotes
+STRUCTURED_LOG_FILE = None  # Ex.: "simulation.jsonl" ou "simulation.bin" (requer BUFFERED_LOG)
+STRUCTURED_LOG_FORMAT = "jsonl"  # "jsonl" ou "binary"
+COLUMNAR_JOBS = False  # Guarda os jobs em uma JobTable (colunas) em vez de um objeto Job por processo
+MONITOR_REFRESH_RATE = 10  # Quadros por segundo do monitor de console
+PROFILE_LOCKS = False  # Mede espera e retenção dos locks no modo com threads (relatório ao final)
+LOCK_PROFILE_FILE = "lock_profile.json"  # Exportação das estatísticas de locks (com PROFILE_LOCKS)
+KEEP_FINISHED_JOBS = True  # False: guarda só as métricas agregadas, com memória constante
+JOB_RECORDS_FILE = None  # Ex.: "finished_jobs.csv": grava cada job finalizado em disco
+TELEMETRY_INTERVAL = None  # Ex.: 10: amostra filas, CPUs ocupadas e quantum a cada 10 ticks
+TELEMETRY_CAPACITY = 4096  # Amostras retidas; além disso, as mais antigas são descartadas
+TELEMETRY_FILE = "telemetry.csv"  # Exportação da telemetria (.csv ou .jsonl)
+TRACE_FILE = None  # Ex.: "simulation.trace": trace canônico para comparar execuções (python event_trace.py a b)
+CHECKPOINT_FILE = None  # Ex.: "simulation.ckpt": no motor orientado a eventos, Ctrl+C salva o estado antes de sair
+CHECKPOINT_INTERVAL = None  # Ex.: 100000: também salva o checkpoint a cada N unidades de tempo simulado
+RESUME_FROM_CHECKPOINT = False  # Continua a partir de CHECKPOINT_FILE (se existir) em vez de começar do zero
+# Uma fila de prontos por CPU em vez da fila única. Ex.: {"cores_per_node": 4, "migration_penalty": 2,
+# "work_stealing": True, "rebalance_interval": 50} (ver run_queues.PerCpuRunQueues)
+RUN_QUEUE_OPTIONS = None
+# Ex.: ".sim_cache": execuções determinísticas já feitas (mesma carga, parâmetros e código) vêm do cache,
+# sem simular (ver result_cache.py). Vale para o motor de eventos e para --deterministic sem teclado.
+RESULT_CACHE_DIR = None
+RESULT_CACHE_MAX_MB = 256  # Tamanho máximo do cache; as entradas usadas há mais tempo são removidas
+KEYBOARD_IO = True  # Barra de espaço gera E/S interativa (as E/S programadas vêm da coluna io_bursts do CSV)
+CONSOLE_MONITOR = True  # No modo com threads, redesenha o estado do simulador no console
+LOG_FILE = "simulation.log"  # None: não grava o log de texto
+# Ex.: "simulation_log": também grava o log em segmentos comprimidos, com índice por tempo global e job, para
+# ler só um trecho depois (python segmented_log.py simulation_log --from 3000 --to 3600)
+LOG_SEGMENTS_DIR = None
+LOG_TO_CONSOLE = True  # Desligado automaticamente enquanto o monitor de console (CONSOLE_MONITOR) estiver ativo
+GANTT_FILE = "gantt_chart.png"  # None: não monta nem salva o gráfico de Gantt (e não importa o matplotlib)
+
+# pynput, matplotlib e NumPy (Gantt, telemetria, trace) só são importados quando o recurso
+# correspondente está ativo, para que execuções sem interface (--headless) iniciem rápido.
 
 io_request_flag = threading.Event()
 
 
-def load_jobs_from_csv(file_path):
-    jobs = []
-    with open(file_path, 'r') as f:
-        reader = csv.reader(f)
-        next(reader)
-        for row in reader:
-            job_id, arrival_time, execution_time = row
-            jobs.append(Job(job_id, int(arrival_time), int(execution_time)))
-    return jobs
-
-
-def print_report(finished_jobs, total_time, num_cores):
+def print_report(finished_jobs, total_time, num_cores, online_metrics=None):
+    """
+    Imprime o relatório final. finished_jobs pode ser a lista de jobs
+    finalizados ou uma JobTable. Com online_metrics (OnlineMetrics do
+    QueueManager), as métricas vêm dos agregados acumulados durante a
+    execução, e a lista de jobs é impressa apenas se eles foram mantidos.
+    """
     print("\n\n" + "=" * 60)
     print("--- Relatório Final da Simulação ---")
-    if not finished_jobs:
+    if online_metrics is not None:
+        metrics = online_metrics.summary(total_time, num_cores)
+    else:
+        metrics = summarize(finished_jobs, total_time, num_cores)
+    if not metrics['num_jobs']:
         print("Nenhum processo foi finalizado.")
         return
 
-    total_wait_time = sum(j.wait_time for j in finished_jobs)
-    total_turnaround_time = sum(j.turnaround_time for j in finished_jobs)
-    total_context_switches = sum(j.context_switches for j in finished_jobs)
-
-    num_jobs = len(finished_jobs)
-    avg_wait_time = total_wait_time / num_jobs
-    avg_turnaround_time = total_turnaround_time / num_jobs
-
-    total_cpu_time_available = total_time * num_cores
-    total_cpu_time_used = sum(j.execution_time for j in finished_jobs)
-    cpu_utilization = (total_cpu_time_used / total_cpu_time_available) * 100 if total_cpu_time_available > 0 else 0
-
     print(f"Tempo total da simulação: {total_time} unidades")
-    print(f"Utilização total da CPU: {cpu_utilization:.2f}%")
-    print(f"Tempo médio de espera: {avg_wait_time:.2f}")
-    print(f"Tempo médio de turnaround: {avg_turnaround_time:.2f}")
-    print(f"Total de trocas de contexto: {total_context_switches}")
+    print(f"Utilização total da CPU: {metrics['cpu_utilization']:.2f}%")
+    print(f"Tempo médio de espera: {metrics['avg_wait_time']:.2f}")
+    print(f"Tempo médio de turnaround: {metrics['avg_turnaround_time']:.2f}")
+    print(f"Total de trocas de contexto: {metrics['total_context_switches']}")
+
+    if online_metrics is not None:
+        for name, label in (('wait_time', 'Espera'), ('turnaround_time', 'Turnaround')):
+            print(f"{label}: mín={metrics[f'min_{name}']}, máx={metrics[f'max_{name}']}, "
+                  f"desvio={metrics[f'stddev_{name}']:.2f}, p50≈{metrics[f'p50_{name}']:.1f}, "
+                  f"p90≈{metrics[f'p90_{name}']:.1f}, p99≈{metrics[f'p99_{name}']:.1f}")
+        print(f"Migrações entre CPUs: {metrics['total_migrations']}, jobs roubados: {metrics['total_steals']}")
+        print(f"\n{'CPU':<8} {'Ocupação':>9} {'Despachos':>10} {'Roubos':>8} {'Migrações':>10}")
+        for cpu, ticks in metrics['cpu_busy_time'].items():
+            busy = ticks / total_time * 100 if total_time else 0
+            print(f"{cpu:<8} {busy:>8.1f}% {metrics['cpu_dispatches'][cpu]:>10} {metrics['cpu_steals'][cpu]:>8} "
+                  f"{metrics['cpu_migrations'][cpu]:>10}")
     print("-" * 35)
 
-    for job in sorted(finished_jobs, key=lambda x: int(x.job_id.replace('P', ''))):
+    for job in sorted(finished_job_list(finished_jobs), key=lambda x: job_id_sort_key(x.job_id)):
         print(
             f"Processo {job.job_id}: Turnaround={job.turnaround_time}, Espera={job.wait_time}, Trocas={job.context_switches}")
 
@@ -65,73 +111,34 @@ def print_report(finished_jobs, total_time, num_cores):
 def process_job_cpu(job: Job, q_manager: QueueManager):
     """
     Esta função é a lógica de execução da CPU.
-    Ela é chamada por um worker do QueueManager.
+    Ela é chamada por um worker do QueueManager e executa uma fatia do job
+    (QueueManager.run_slice), dormindo no clock entre os ticks pedidos.
     """
-
-    logger = q_manager.logger
     clock = q_manager.clock
-    cpu_name = threading.current_thread().name
-
-    job.status = JobStatus.RUNNING
-    job.context_switches += 1
-    logger.log(f"{cpu_name}: Processo {job.job_id} iniciou execução.", clock.get_time())
-
-    quantum = q_manager.calculate_quantum()
-    time_slice = min(quantum, job.remaining_time)
-
-    start_time = clock.get_time()
-    logger.log(
-        f"{cpu_name}: Executando {job.job_id} (faltam {job.remaining_time}). Quantum={quantum}.",
-        start_time)
-
-    for _ in range(time_slice):
-        if job.remaining_time > 0:
-            with clock.time_lock:
-                clock.tick_condition.wait()
-
-            if not clock.running:
-                logger.log(f"{cpu_name}: Clock parou. Interrompendo {job.job_id}.", clock.get_time())
-                q_manager.add_job(job)
-                return
-
-            is_io_request = False
-            with q_manager.io_flag_lock:
-                if q_manager.io_request_flag.is_set():
-                    q_manager.io_request_flag.clear()
-                    is_io_request = True
-
-            if is_io_request:
-                logger.log(f"{cpu_name}: Processo {job.job_id} solicitou E/S.", clock.get_time())
-                q_manager.block_job(job, IO_BLOCK_DURATION)
-                return
-
-            job.remaining_time -= 1
-        else:
-            break
-
-    end_time = clock.get_time()
-
-    if job.remaining_time <= 0:
-        q_manager.finish_job(job)
-        logger.log(f"{cpu_name}: Processo {job.job_id} finalizado.", end_time)
-    else:
-        q_manager.add_job(job)
-        logger.log(f"{cpu_name}: Processo {job.job_id} sofreu preempção.", end_time)
-
+    slice_steps = q_manager.run_slice(job, threading.current_thread().name, IO_BLOCK_DURATION)
+    try:
+        target = next(slice_steps)
+        while True:
+            target = slice_steps.send(clock.wait_until(target))
+    except StopIteration:
+        pass
 
 
-def on_press(key, logger, clock):
+def on_press(key, logger, q_manager):
     """Callback quando uma tecla é pressionada."""
-    global io_request_flag
+    from pynput import keyboard
+
     if key == keyboard.Key.space:
-        if not io_request_flag.is_set():
-            logger.log("--- [EVENTO] Solicitação de E/S recebida (Barra de Espaço) ---", clock.get_time())
-            io_request_flag.set()
+        if not q_manager.io_request_flag.is_set():
+            logger.log("--- [EVENTO] Solicitação de E/S recebida (Barra de Espaço) ---", q_manager.clock.get_time())
+            q_manager.request_io_interrupt()
 
 
-def start_keyboard_listener(logger, clock):
+def start_keyboard_listener(logger, q_manager):
     """Inicia o listener de teclado em uma thread separada."""
-    listener = keyboard.Listener(on_press=lambda key: on_press(key, logger, clock))
+    from pynput import keyboard
+
+    listener = keyboard.Listener(on_press=lambda key: on_press(key, logger, q_manager))
     listener.daemon = True
     listener.start()
     logger.log("Listener de teclado iniciado. Pressione [Barra de Espaço] para simular E/S.")
@@ -140,14 +147,67 @@ def start_keyboard_listener(logger, clock):
 
 
 
-if __name__ == "__main__":
-    logger = Logger(log_to_console=True)
-    clock = Clock(time_unit=0.005)
+def run_event_simulation(all_processes, logger, record_writer=None, checkpoint_state=None):
+    """
+    Executa a simulação no motor orientado a eventos, sem threads nem espera real.
+    Com checkpoint_state (lido de CHECKPOINT_FILE), continua de onde o
+    checkpoint parou; a configuração salva nele prevalece sobre as
+    constantes deste módulo. Com CHECKPOINT_FILE, SIGINT/SIGTERM salvam o
+    estado e encerram a simulação ao fim do instante atual.
+    Retorna (jobs finalizados, tempo total, métricas acumuladas, telemetria ou None).
+    """
+    if checkpoint_state is not None:
+        simulator = EventSimulator.from_state(checkpoint_state, all_processes, logger=logger,
+                                              record_writer=record_writer)
+        logger.log(f"Retomando simulação do checkpoint '{CHECKPOINT_FILE}' (motor orientado a eventos)...",
+                   checkpoint_state["global_time"])
+    else:
+        simulator = EventSimulator(
+            all_processes,
+            NUM_CORES,
+            logger=logger,
+            dynamic_quantum=USE_DYNAMIC_QUANTUM,
+            fixed_quantum=QUANTUM,
+            io_block_duration=IO_BLOCK_DURATION,
+            policy=SCHEDULING_POLICY,
+            keep_finished=KEEP_FINISHED_JOBS,
+            record_writer=record_writer,
+            telemetry_interval=TELEMETRY_INTERVAL,
+            telemetry_capacity=TELEMETRY_CAPACITY,
+            run_queue_options=RUN_QUEUE_OPTIONS,
+            fast_path=FAST_PATH
+        )
+        logger.log("Iniciando simulação (motor orientado a eventos)...")
+
+    previous_handlers = {}
+    if CHECKPOINT_FILE is not None:
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            previous_handlers[signum] = signal.signal(signum, lambda *_: simulator.request_stop())
+    try:
+        total_time = simulator.run(CHECKPOINT_FILE, CHECKPOINT_INTERVAL)
+    finally:
+        for signum, handler in previous_handlers.items():
+            signal.signal(signum, handler)
+
+    if simulator.interrupted:
+        logger.log("Simulação interrompida. Para continuar, use RESUME_FROM_CHECKPOINT = True.", total_time)
+    else:
+        logger.log("Todos os processos foram concluídos.")
+
+    return simulator.finished_jobs, total_time, simulator.metrics, simulator.telemetry
 
-    all_processes = load_jobs_from_csv(INPUT_CSV)
-    total_jobs = len(all_processes)
 
-    ready_queue = queue.Queue()
+def run_threaded_simulation(all_processes, total_jobs, logger, profiler=None, record_writer=None, poll_interval=0.5):
+    """
+    Executa a simulação em tempo real, com uma thread por componente.
+    Com um LockProfiler, os locks do runtime são instrumentados antes de
+    qualquer thread iniciar. poll_interval é o intervalo, em segundos, entre
+    as verificações de término. Retorna (jobs finalizados, tempo total,
+    métricas acumuladas, telemetria ou None).
+    """
+    clock = Clock(time_unit=0.005, barrier=DETERMINISTIC_CLOCK)
+
+    ready_queue = make_ready_queue(SCHEDULING_POLICY, NUM_CORES, RUN_QUEUE_OPTIONS)
 
     queue_manager = QueueManager(
         job_queue=ready_queue,
@@ -156,34 +216,49 @@ if __name__ == "__main__":
         clock=clock,
         io_request_flag=io_request_flag,
         dynamic_quantum=USE_DYNAMIC_QUANTUM,
-        fixed_quantum=QUANTUM
+        fixed_quantum=QUANTUM,
+        keep_finished=KEEP_FINISHED_JOBS,
+        record_writer=record_writer
     )
 
+    if profiler is not None:
+        instrument_runtime(profiler, clock, queue_manager, logger)
+
     dispatcher = Dispatcher(all_processes, queue_manager, clock, logger)
 
-    monitor = ConsoleMonitor(clock, queue_manager, NUM_CORES)
+    telemetry = None
+    if TELEMETRY_INTERVAL is not None:
+        from telemetry import TelemetrySampler
+
+        telemetry = TelemetrySampler(queue_manager, TELEMETRY_INTERVAL, TELEMETRY_CAPACITY)
+
+    monitor = ConsoleMonitor(clock, queue_manager, NUM_CORES, refresh_rate=MONITOR_REFRESH_RATE) \
+        if CONSOLE_MONITOR else None
 
     logger.log("Iniciando simulação...")
 
-    clock.start()
     dispatcher.start()
     io_manager_thread = queue_manager.start_io_manager()
     queue_manager.start_workers(NUM_CORES)
-    listener = start_keyboard_listener(logger, clock)
-    monitor.start()
+    if KEYBOARD_IO:
+        start_keyboard_listener(logger, queue_manager)
+    if monitor is not None:
+        monitor.start()
+    telemetry_thread = telemetry.start_thread(clock, NUM_CORES + 2) if telemetry is not None else None
+    clock.start()
 
     try:
-        while len(queue_manager.finished_jobs) < total_jobs:
-            time.sleep(0.5)
+        while queue_manager.finished_count < total_jobs:
+            time.sleep(poll_interval)
             if not dispatcher.is_alive() and queue_manager.is_idle():
-                if len(queue_manager.finished_jobs) < total_jobs:
-                    time.sleep(0.5)
+                if queue_manager.finished_count < total_jobs:
+                    time.sleep(poll_interval)
 
-                if len(queue_manager.finished_jobs) == total_jobs:
+                if queue_manager.finished_count == total_jobs:
                     break
                 else:
                     logger.log(
-                        f"Dispatcher terminou, mas {total_jobs - len(queue_manager.finished_jobs)} jobs ainda não concluídos. Verificando...")
+                        f"Dispatcher terminou, mas {total_jobs - queue_manager.finished_count} jobs ainda não concluídos. Verificando...")
                     if not queue_manager.is_idle():
                         continue
                     else:
@@ -195,7 +270,8 @@ if __name__ == "__main__":
 
     logger.log("Todos os processos foram concluídos ou a simulação foi interrompida.")
 
-    monitor.stop()
+    if monitor is not None:
+        monitor.stop()
     queue_manager.stop()
     dispatcher.stop()
 
@@ -207,13 +283,356 @@ if __name__ == "__main__":
     dispatcher.join()
     io_manager_thread.join()
     clock.join()
-    monitor.join()
+    if monitor is not None:
+        monitor.join()
+    if telemetry_thread is not None:
+        telemetry_thread.join()
 
     ready_queue.join()
 
-    print_report(queue_manager.finished_jobs, clock.get_time(), NUM_CORES)
+    if clock.barrier:
+        # Sem espera real, o clock continua avançando até o encerramento ser
+        # percebido; o tempo total reprodutível é o da última conclusão.
+        return queue_manager.finished_jobs, queue_manager.metrics.last_finish_time, queue_manager.metrics, telemetry
+
+    return queue_manager.finished_jobs, clock.get_time(), queue_manager.metrics, telemetry
+
+
+def run_async_simulation(all_processes, total_jobs, logger, record_writer=None):
+    """
+    Executa a simulação em tempo real em um único event loop (async_runtime),
+    com o Dispatcher, o IOManager e cada CPU como corrotinas em vez de
+    threads. O monitor de console e o teclado continuam em threads próprias.
+    Retorna (jobs finalizados, tempo total, métricas acumuladas, telemetria ou None).
+    """
+    import asyncio
+    from async_runtime import AsyncClock, AsyncRuntime
+
+    clock = AsyncClock(time_unit=0 if DETERMINISTIC_CLOCK else 0.005)
+
+    queue_manager = QueueManager(
+        job_queue=make_ready_queue(SCHEDULING_POLICY, NUM_CORES, RUN_QUEUE_OPTIONS),
+        process_job_func=None,
+        logger=logger,
+        clock=clock,
+        io_request_flag=io_request_flag,
+        dynamic_quantum=USE_DYNAMIC_QUANTUM,
+        fixed_quantum=QUANTUM,
+        keep_finished=KEEP_FINISHED_JOBS,
+        record_writer=record_writer
+    )
+
+    telemetry = None
+    if TELEMETRY_INTERVAL is not None:
+        from telemetry import TelemetrySampler
+
+        telemetry = TelemetrySampler(queue_manager, TELEMETRY_INTERVAL, TELEMETRY_CAPACITY)
+
+    runtime = AsyncRuntime(all_processes, queue_manager, NUM_CORES, io_block_duration=IO_BLOCK_DURATION,
+                           telemetry=telemetry)
+    monitor = ConsoleMonitor(clock, queue_manager, NUM_CORES, refresh_rate=MONITOR_REFRESH_RATE) \
+        if CONSOLE_MONITOR else None
+
+    logger.log("Iniciando simulação (runtime assíncrono)...")
+
+    if KEYBOARD_IO:
+        start_keyboard_listener(logger, queue_manager)
+    if monitor is not None:
+        monitor.start()
 
     try:
-        plot_gantt_chart("simulation.log", NUM_CORES)
-    except Exception as e:
-        print(f"\nNão foi possível gerar o gráfico: {e}")
\ No newline at end of file
+        asyncio.run(runtime.run(until=lambda: queue_manager.finished_count >= total_jobs))
+    except KeyboardInterrupt:
+        print("\nInterrupção manual detectada. Encerrando simulação...")
+        logger.log("--- Interrupção manual ---")
+
+    logger.log("Todos os processos foram concluídos ou a simulação foi interrompida.")
+
+    if monitor is not None:
+        monitor.stop()
+        monitor.join()
+
+    if DETERMINISTIC_CLOCK:
+        return queue_manager.finished_jobs, queue_manager.metrics.last_finish_time, queue_manager.metrics, telemetry
+
+    return queue_manager.finished_jobs, clock.get_time(), queue_manager.metrics, telemetry
+
+
+def result_cacheable():
+    """
+    Só execuções determinísticas e sem saídas laterais (trace, registros,
+    checkpoint) podem vir do cache: o resultado tem que ser o mesmo a cada vez.
+    """
+    deterministic = ENGINE == "event" or (DETERMINISTIC_CLOCK and not KEYBOARD_IO)
+    return deterministic and TRACE_FILE is None and JOB_RECORDS_FILE is None and CHECKPOINT_FILE is None
+
+
+def result_cache_params():
+    from result_cache import simulation_params
+
+    return simulation_params(engine=ENGINE, num_cores=NUM_CORES, quantum=QUANTUM,
+                             dynamic_quantum=USE_DYNAMIC_QUANTUM, io_block_duration=IO_BLOCK_DURATION,
+                             policy=SCHEDULING_POLICY, run_queue_options=RUN_QUEUE_OPTIONS,
+                             keep_finished=KEEP_FINISHED_JOBS, telemetry_interval=TELEMETRY_INTERVAL,
+                             telemetry_capacity=TELEMETRY_CAPACITY, gantt=GANTT_FILE is not None)
+
+
+def positive_int(text):
+    """Tipo de argparse para contagens e durações que precisam ser de pelo menos 1."""
+    try:
+        value = int(text)
+    except ValueError:
+        value = 0
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"precisa ser um inteiro positivo: {text}")
+    return value
+
+
+def run_queue_options(args):
+    """Opções de PerCpuRunQueues a partir da linha de comando (None: fila única)."""
+    if not args.per_cpu_queues:
+        return None
+    return {"cores_per_node": args.cores_per_node, "migration_penalty": args.migration_penalty,
+            "work_stealing": not args.no_work_stealing, "rebalance_interval": args.rebalance_interval}
+
+
+def parse_args(argv=None):
+    """Linha de comando; os valores padrão são as constantes deste módulo."""
+    queue_options = RUN_QUEUE_OPTIONS or {}
+    parser = argparse.ArgumentParser(description="Simulador de escalonamento de processos.")
+    parser.add_argument("workload", nargs="?", default=INPUT_CSV, help="CSV ou binário de processos")
+    parser.add_argument("--engine", choices=("threaded", "async", "event"), default=ENGINE)
+    parser.add_argument("--policy", choices=tuple(POLICIES), default=SCHEDULING_POLICY)
+    parser.add_argument("--cores", type=positive_int, default=NUM_CORES)
+    parser.add_argument("--quantum", type=positive_int, default=QUANTUM)
+    parser.add_argument("--dynamic-quantum", action=argparse.BooleanOptionalAction, default=USE_DYNAMIC_QUANTUM)
+    parser.add_argument("--io-duration", type=int, default=IO_BLOCK_DURATION,
+                        help="duração das E/S interativas (barra de espaço)")
+    parser.add_argument("--fast-path", action=argparse.BooleanOptionalAction, default=FAST_PATH,
+                        help="no motor de eventos, resolve round-robin com quantum fixo e sem E/S sem simular "
+                             "(só sem log, gráfico, telemetria nem checkpoint; carrega a carga inteira em memória)")
+    parser.add_argument("--deterministic", action=argparse.BooleanOptionalAction, default=DETERMINISTIC_CLOCK,
+                        help="nos modos com threads e async, avança o clock sem dormir entre ticks")
+    parser.add_argument("--headless", action="store_true",
+                        help="sem monitor, teclado, log (no console ou em arquivo) nem gráfico, a menos que "
+                             "--log-file ou --gantt sejam dados")
+    parser.add_argument("--log-file", default=None,
+                        help=f'log de texto (padrão: {LOG_FILE}; "" para não gravar)')
+    parser.add_argument("--log-dir", default=LOG_SEGMENTS_DIR,
+                        help="diretório do log em segmentos comprimidos, com índice por tempo e job")
+    parser.add_argument("--buffered-log", action=argparse.BooleanOptionalAction, default=BUFFERED_LOG,
+                        help="grava o log em uma thread separada, em lotes")
+    parser.add_argument("--structured-log", default=STRUCTURED_LOG_FILE,
+                        help="arquivo de eventos estruturados (implica --buffered-log)")
+    parser.add_argument("--structured-format", choices=("jsonl", "binary"), default=STRUCTURED_LOG_FORMAT)
+    parser.add_argument("--gantt", default=None, help=f"arquivo do gráfico de Gantt (padrão: {GANTT_FILE})")
+    parser.add_argument("--records", default=JOB_RECORDS_FILE, help="CSV com os dados de cada job finalizado")
+    parser.add_argument("--telemetry-interval", type=positive_int, default=TELEMETRY_INTERVAL)
+    parser.add_argument("--telemetry-capacity", type=positive_int, default=TELEMETRY_CAPACITY,
+                        help="amostras retidas da telemetria (as mais antigas são descartadas)")
+    parser.add_argument("--telemetry-file", default=TELEMETRY_FILE)
+    parser.add_argument("--trace", default=TRACE_FILE, help="trace canônico da execução")
+    parser.add_argument("--checkpoint", default=CHECKPOINT_FILE, help="arquivo de checkpoint (motor de eventos)")
+    parser.add_argument("--checkpoint-interval", type=int, default=CHECKPOINT_INTERVAL)
+    parser.add_argument("--resume", action="store_true", default=RESUME_FROM_CHECKPOINT,
+                        help="continua a partir do checkpoint, se existir")
+    parser.add_argument("--cache", default=RESULT_CACHE_DIR, help="diretório do cache de resultados")
+    parser.add_argument("--cache-max-mb", type=int, default=RESULT_CACHE_MAX_MB)
+    parser.add_argument("--profile-locks", action="store_true", default=PROFILE_LOCKS,
+                        help="mede a contenção dos locks (modo com threads) e grava as estatísticas em JSON")
+    parser.add_argument("--lock-profile-file", default=LOCK_PROFILE_FILE)
+    parser.add_argument("--columnar", action=argparse.BooleanOptionalAction, default=COLUMNAR_JOBS,
+                        help="guarda os jobs em uma JobTable (colunas) em vez de um objeto Job por processo")
+    parser.add_argument("--per-cpu-queues", action=argparse.BooleanOptionalAction,
+                        default=RUN_QUEUE_OPTIONS is not None,
+                        help="uma fila de prontos por CPU em vez da fila única compartilhada")
+    parser.add_argument("--cores-per-node", type=positive_int, default=queue_options.get("cores_per_node"),
+                        help="agrupa as CPUs em nós (com --per-cpu-queues)")
+    parser.add_argument("--migration-penalty", type=int, default=queue_options.get("migration_penalty", 0),
+                        help="ticks extras ao migrar entre nós")
+    parser.add_argument("--no-work-stealing", action="store_true",
+                        default=not queue_options.get("work_stealing", True),
+                        help="CPUs ociosas não roubam jobs de outras")
+    parser.add_argument("--rebalance-interval", type=positive_int, default=queue_options.get("rebalance_interval"),
+                        help="redistribui as filas a cada N ticks")
+    parser.add_argument("--discard-finished", action="store_true", default=not KEEP_FINISHED_JOBS,
+                        help="guarda só as métricas agregadas, não os jobs finalizados")
+    return parser.parse_args(argv)
+
+
+def apply_args(args):
+    """Aplica a linha de comando às constantes de configuração usadas pelas funções de simulação."""
+    global INPUT_CSV, ENGINE, SCHEDULING_POLICY, NUM_CORES, QUANTUM, USE_DYNAMIC_QUANTUM, IO_BLOCK_DURATION
+    global DETERMINISTIC_CLOCK, LOG_FILE, LOG_SEGMENTS_DIR, LOG_TO_CONSOLE, GANTT_FILE, CONSOLE_MONITOR, KEYBOARD_IO
+    global JOB_RECORDS_FILE, TELEMETRY_INTERVAL, TELEMETRY_FILE, TRACE_FILE, CHECKPOINT_FILE, CHECKPOINT_INTERVAL
+    global RESUME_FROM_CHECKPOINT, KEEP_FINISHED_JOBS, RESULT_CACHE_DIR, RESULT_CACHE_MAX_MB, FAST_PATH
+    global PROFILE_LOCKS, LOCK_PROFILE_FILE, TELEMETRY_CAPACITY, BUFFERED_LOG, STRUCTURED_LOG_FILE
+    global STRUCTURED_LOG_FORMAT, COLUMNAR_JOBS, RUN_QUEUE_OPTIONS
+
+    INPUT_CSV = args.workload
+    ENGINE = args.engine
+    SCHEDULING_POLICY = args.policy
+    NUM_CORES = args.cores
+    QUANTUM = args.quantum
+    USE_DYNAMIC_QUANTUM = args.dynamic_quantum
+    IO_BLOCK_DURATION = args.io_duration
+    FAST_PATH = args.fast_path
+    DETERMINISTIC_CLOCK = args.deterministic
+    if args.log_file is not None:
+        LOG_FILE = args.log_file or None
+    LOG_SEGMENTS_DIR = args.log_dir
+    JOB_RECORDS_FILE = args.records
+    TELEMETRY_INTERVAL = args.telemetry_interval
+    TELEMETRY_CAPACITY = args.telemetry_capacity
+    TELEMETRY_FILE = args.telemetry_file
+    TRACE_FILE = args.trace
+    CHECKPOINT_FILE = args.checkpoint
+    CHECKPOINT_INTERVAL = args.checkpoint_interval
+    RESUME_FROM_CHECKPOINT = args.resume
+    KEEP_FINISHED_JOBS = not args.discard_finished
+    RESULT_CACHE_DIR = args.cache
+    RESULT_CACHE_MAX_MB = args.cache_max_mb
+    PROFILE_LOCKS = args.profile_locks
+    LOCK_PROFILE_FILE = args.lock_profile_file
+    # Os eventos estruturados só são gravados pelo BufferedLogger.
+    BUFFERED_LOG = args.buffered_log or args.structured_log is not None
+    STRUCTURED_LOG_FILE = args.structured_log
+    STRUCTURED_LOG_FORMAT = args.structured_format
+    COLUMNAR_JOBS = args.columnar
+    RUN_QUEUE_OPTIONS = run_queue_options(args)
+
+    if args.headless:
+        CONSOLE_MONITOR = False
+        KEYBOARD_IO = False
+        LOG_TO_CONSOLE = False
+        if args.log_file is None:
+            LOG_FILE = None
+        GANTT_FILE = args.gantt
+    elif args.gantt is not None:
+        GANTT_FILE = args.gantt
+
+    if CONSOLE_MONITOR and ENGINE != "event":
+        # O monitor redesenha só as linhas que mudaram em posições fixas da tela: linhas de log no console
+        # rolariam o terminal e deixariam o quadro corrompido.
+        LOG_TO_CONSOLE = False
+
+
+if __name__ == "__main__":
+    apply_args(parse_args())
+
+    if BUFFERED_LOG:
+        logger = BufferedLogger(log_file=LOG_FILE, log_to_console=LOG_TO_CONSOLE, structured_file=STRUCTURED_LOG_FILE,
+                                structured_format=STRUCTURED_LOG_FORMAT, segment_dir=LOG_SEGMENTS_DIR)
+    else:
+        logger = Logger(log_file=LOG_FILE, log_to_console=LOG_TO_CONSOLE, segment_dir=LOG_SEGMENTS_DIR)
+
+    gantt = None
+    if GANTT_FILE is not None:
+        from gantt import GanttRecorder
+
+        gantt = GanttRecorder(NUM_CORES)
+        logger.add_sink(gantt)
+
+    trace_writer = None
+    if TRACE_FILE is not None:
+        from event_trace import TraceWriter
+
+        trace_writer = TraceWriter(TRACE_FILE)
+        logger.add_sink(trace_writer)
+
+    result_cache = None
+    cached_result = None
+    if RESULT_CACHE_DIR is not None and result_cacheable():
+        from result_cache import ResultCache, cache_key
+
+        result_cache = ResultCache(RESULT_CACHE_DIR, RESULT_CACHE_MAX_MB * 1024 * 1024)
+        result_key = cache_key(INPUT_CSV, result_cache_params())
+        cached_result = result_cache.get(result_key)
+
+    job_table = None
+    record_writer = None
+    profiler = None
+    if cached_result is not None:
+        from result_cache import restore_jobs, restore_telemetry
+
+        finished_jobs = restore_jobs(cached_result)
+        total_time = cached_result["total_time"]
+        online_metrics = cached_result["metrics"]
+        telemetry = restore_telemetry(cached_result)
+        if gantt is not None:
+            gantt.set_state(cached_result["gantt"])
+        logger.log(f"Resultado obtido do cache ({result_key[:12]}), sem simular.", total_time)
+    else:
+        if ENGINE == "event":
+            # O motor de eventos não precisa do total antecipado: a carga é lida uma só vez e um CSV fora de
+            # ordem é detectado durante a leitura (iter_jobs_from_csv), sem uma passada extra pelo arquivo.
+            total_jobs, in_order = None, True
+        else:
+            total_jobs, in_order = scan_workload(INPUT_CSV)
+        if in_order:
+            all_processes = open_workload(INPUT_CSV)
+        else:
+            # Fora de ordem, o CSV precisa ser ordenado em memória antes do despacho.
+            all_processes = load_jobs_from_csv(INPUT_CSV)
+
+        if COLUMNAR_JOBS:
+            job_table = JobTable.from_jobs(all_processes)
+            all_processes = job_table.views() if in_order else list(job_table.views())
+
+        checkpoint_state = None
+        if ENGINE == "event" and RESUME_FROM_CHECKPOINT and CHECKPOINT_FILE is not None \
+                and os.path.exists(CHECKPOINT_FILE):
+            checkpoint_state = read_checkpoint(CHECKPOINT_FILE)
+            # Os jobs finalizados antes do checkpoint estão nele, não na JobTable recém-carregada.
+            job_table = None
+
+        if JOB_RECORDS_FILE is not None:
+            resume_offset = checkpoint_state["record_offset"] if checkpoint_state is not None else None
+            record_writer = JobRecordWriter(JOB_RECORDS_FILE, resume_offset)
+        if PROFILE_LOCKS and ENGINE == "threaded":
+            profiler = LockProfiler()
+        if ENGINE == "event":
+            finished_jobs, total_time, online_metrics, telemetry = run_event_simulation(all_processes, logger,
+                                                                                       record_writer, checkpoint_state)
+            # Sem checkpoint (condição para usar o cache), a simulação só retorna depois de concluir todos os jobs.
+            total_jobs = online_metrics.count
+        elif ENGINE == "async":
+            finished_jobs, total_time, online_metrics, telemetry = run_async_simulation(all_processes, total_jobs,
+                                                                                        logger, record_writer)
+        else:
+            finished_jobs, total_time, online_metrics, telemetry = run_threaded_simulation(
+                all_processes, total_jobs, logger, profiler, record_writer)
+
+        if result_cache is not None and online_metrics.count == total_jobs:
+            # Só execuções completas vão para o cache (não as interrompidas com Ctrl+C).
+            from result_cache import make_result
+
+            result_cache.put(result_key, make_result(job_table if job_table is not None else finished_jobs,
+                                                     total_time, online_metrics, telemetry, gantt))
+
+    logger.close()
+    if trace_writer is not None:
+        trace_writer.close()
+    if record_writer is not None:
+        record_writer.close()
+
+    print_report(job_table if job_table is not None else finished_jobs, total_time, NUM_CORES, online_metrics)
+    if profiler is not None:
+        profiler.print_report()
+        profiler.export(LOCK_PROFILE_FILE)
+        print(f"Estatísticas de locks salvas em '{LOCK_PROFILE_FILE}'")
+    if telemetry is not None:
+        telemetry.export(TELEMETRY_FILE)
+        print(f"Telemetria ({telemetry.size} amostras) salva em '{TELEMETRY_FILE}'")
+        if telemetry.dropped:
+            print(f"  {telemetry.dropped} amostras mais antigas foram descartadas (capacidade de {telemetry.capacity}; "
+                  f"aumente --telemetry-capacity ou --telemetry-interval)")
+
+    if gantt is not None:
+        try:
+            from plotter import plot_gantt_intervals
+
+            gantt.finalize()
+            plot_gantt_intervals(gantt, GANTT_FILE, telemetry=telemetry)
+        except Exception as e:
+            print(f"\nNão foi possível gerar o gráfico: {e}")
\ No newline at end of file
@@ -0,0 +1,291 @@
+import csv
+import math
+import re
+
+from job import JobStatus
+from job_table import JobTable, STATUS_CODES
+
+JOB_RECORD_COLUMNS = ("job_id", "arrival_time", "execution_time", "turnaround_time", "wait_time", "context_switches")
+
+
+def summarize(jobs, total_time, num_cores):
+    """
+    Calcula as métricas do relatório final.
+
+    jobs pode ser a lista de jobs finalizados ou uma JobTable; neste caso
+    as somas são feitas de forma vetorizada sobre as colunas.
+    """
+    if isinstance(jobs, JobTable):
+        finished = jobs.column('status') == STATUS_CODES[JobStatus.FINISHED]
+        num_jobs = int(finished.sum())
+        total_wait_time = int(jobs.column('wait_time')[finished].sum())
+        total_turnaround_time = int(jobs.column('turnaround_time')[finished].sum())
+        total_context_switches = int(jobs.column('context_switches')[finished].sum())
+        total_cpu_time_used = int(jobs.column('execution_time')[finished].sum())
+    else:
+        num_jobs = len(jobs)
+        total_wait_time = sum(j.wait_time for j in jobs)
+        total_turnaround_time = sum(j.turnaround_time for j in jobs)
+        total_context_switches = sum(j.context_switches for j in jobs)
+        total_cpu_time_used = sum(j.execution_time for j in jobs)
+
+    total_cpu_time_available = total_time * num_cores
+    return {
+        'num_jobs': num_jobs,
+        'total_time': total_time,
+        'cpu_utilization': (total_cpu_time_used / total_cpu_time_available) * 100 if total_cpu_time_available > 0 else 0,
+        'avg_wait_time': total_wait_time / num_jobs if num_jobs else 0,
+        'avg_turnaround_time': total_turnaround_time / num_jobs if num_jobs else 0,
+        'total_context_switches': total_context_switches,
+    }
+
+
+def finished_job_list(jobs):
+    """Jobs finalizados como objetos com a interface de Job (JobView no caso de uma JobTable)."""
+    if isinstance(jobs, JobTable):
+        finished = (jobs.column('status') == STATUS_CODES[JobStatus.FINISHED]).nonzero()[0]
+        return [jobs.view(int(index)) for index in finished]
+    return jobs
+
+
+def job_id_sort_key(job_id):
+    """Ordenação natural de ids (P2 antes de P10), sem exigir o prefixo P."""
+    match = re.fullmatch(r"(\D*)(\d+)", job_id)
+    if match is None:
+        return job_id, -1
+    return match.group(1), int(match.group(2))
+
+
+class RunningStats:
+    """Contagem, soma, média, variância (Welford), mínimo e máximo, atualizados a cada valor."""
+
+    __slots__ = ('count', 'total', 'mean', 'm2', 'min', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def add_many(self, values):
+        """Equivale a add() para cada valor de um array NumPy, combinando as estatísticas do lote de uma vez."""
+        count = len(values)
+        if not count:
+            return
+        total = int(values.sum())
+        mean = total / count
+        m2 = float(((values - mean) ** 2).sum())
+
+        combined = self.count + count
+        delta = mean - self.mean
+        self.m2 += m2 + delta * delta * self.count * count / combined
+        self.mean += delta * count / combined
+        self.count = combined
+        self.total += total
+        low, high = values.min().item(), values.max().item()
+        if self.min is None or low < self.min:
+            self.min = low
+        if self.max is None or high > self.max:
+            self.max = high
+
+    def variance(self):
+        return self.m2 / self.count if self.count else 0.0
+
+    def stddev(self):
+        return math.sqrt(self.variance())
+
+
+class QuantileSketch:
+    """
+    Percentis aproximados com erro relativo limitado (histograma
+    logarítmico, no estilo do DDSketch). Cada faixa cobre valores com
+    razão gamma entre si; o número de faixas cresce com log(máx/mín), não
+    com o número de valores.
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value):
+        self.count += 1
+        if value <= 0:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self.log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def add_many(self, values):
+        """Equivale a add() para cada valor de um array NumPy; o log é calculado uma vez por valor distinto."""
+        import numpy as np
+
+        distinct, counts = np.unique(values, return_counts=True)
+        for value, count in zip(distinct.tolist(), counts.tolist()):
+            self.count += count
+            if value <= 0:
+                self.zero_count += count
+                continue
+            index = math.ceil(math.log(value) / self.log_gamma)
+            self.buckets[index] = self.buckets.get(index, 0) + count
+
+    def quantile(self, q):
+        """Valor aproximado do quantil q (0 a 1, pelo posto mais próximo); None se não houver valores."""
+        if not self.count:
+            return None
+
+        rank = max(1, math.ceil(q * self.count))
+        seen = self.zero_count
+        if rank <= seen:
+            return 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return 2 * self.gamma ** index / (self.gamma + 1)
+
+
+class OnlineMetrics:
+    """
+    Métricas do relatório acumuladas à medida que os jobs terminam, com
+    memória constante: não é preciso manter os jobs finalizados.
+
+    Também acumula, por CPU, o tempo ocupado, que dá a utilização real
+    (inclusive com jobs inacabados ou execução perdida por E/S), e quantos
+    despachos foram feitos, quantos jobs foram roubados de outra fila e
+    quantos vieram de outra CPU (migrações).
+    """
+
+    PERCENTILES = (50, 90, 99)
+
+    def __init__(self, relative_accuracy=0.01):
+        self.wait_time = RunningStats()
+        self.turnaround_time = RunningStats()
+        self.wait_sketch = QuantileSketch(relative_accuracy)
+        self.turnaround_sketch = QuantileSketch(relative_accuracy)
+        self.total_context_switches = 0
+        self.total_cpu_time_used = 0
+        self.last_finish_time = 0
+        self.busy_time = {}
+        self.dispatches = {}
+        self.steals = {}
+        self.migrations = {}
+
+    @property
+    def count(self):
+        return self.turnaround_time.count
+
+    def record(self, job):
+        """Contabiliza um job finalizado (chamar com o finish_lock do QueueManager)."""
+        self.wait_time.add(job.wait_time)
+        self.turnaround_time.add(job.turnaround_time)
+        self.wait_sketch.add(job.wait_time)
+        self.turnaround_sketch.add(job.turnaround_time)
+        self.total_context_switches += job.context_switches
+        self.total_cpu_time_used += job.execution_time
+        self.last_finish_time = max(self.last_finish_time, job.arrival_time + job.turnaround_time)
+
+    def record_many(self, arrival_time, execution_time, turnaround_time, wait_time, context_switches):
+        """Como record() para um lote de jobs finalizados, dados como arrays NumPy (colunas de Job)."""
+        if not len(turnaround_time):
+            return
+        self.wait_time.add_many(wait_time)
+        self.turnaround_time.add_many(turnaround_time)
+        self.wait_sketch.add_many(wait_time)
+        self.turnaround_sketch.add_many(turnaround_time)
+        self.total_context_switches += int(context_switches.sum())
+        self.total_cpu_time_used += int(execution_time.sum())
+        self.last_finish_time = max(self.last_finish_time, int((arrival_time + turnaround_time).max()))
+
+    def record_busy(self, cpu_name, ticks):
+        """Soma tempo de execução a uma CPU. Cada CPU só atualiza a própria entrada."""
+        self.busy_time[cpu_name] = self.busy_time.get(cpu_name, 0) + ticks
+
+    def record_dispatch(self, cpu_name, stolen, migrated):
+        """Conta um despacho na CPU. Como em record_busy, cada CPU só atualiza as próprias entradas."""
+        self.dispatches[cpu_name] = self.dispatches.get(cpu_name, 0) + 1
+        if stolen:
+            self.steals[cpu_name] = self.steals.get(cpu_name, 0) + 1
+        if migrated:
+            self.migrations[cpu_name] = self.migrations.get(cpu_name, 0) + 1
+
+    def summary(self, total_time, num_cores):
+        """Mesmas chaves de summarize(), mais dispersão, percentis e métricas por CPU."""
+        num_jobs = self.count
+        total_cpu_time_available = total_time * num_cores
+        result = {
+            'num_jobs': num_jobs,
+            'total_time': total_time,
+            'cpu_utilization': (self.total_cpu_time_used / total_cpu_time_available) * 100
+            if total_cpu_time_available > 0 else 0,
+            'avg_wait_time': self.wait_time.total / num_jobs if num_jobs else 0,
+            'avg_turnaround_time': self.turnaround_time.total / num_jobs if num_jobs else 0,
+            'total_context_switches': self.total_context_switches,
+        }
+
+        for name, stats, sketch in (('wait_time', self.wait_time, self.wait_sketch),
+                                    ('turnaround_time', self.turnaround_time, self.turnaround_sketch)):
+            result[f'min_{name}'] = stats.min
+            result[f'max_{name}'] = stats.max
+            result[f'stddev_{name}'] = stats.stddev()
+            for percentile in self.PERCENTILES:
+                result[f'p{percentile}_{name}'] = sketch.quantile(percentile / 100)
+
+        busy_time = dict(self.busy_time)
+        result['busy_utilization'] = (sum(busy_time.values()) / total_cpu_time_available) * 100 \
+            if total_cpu_time_available > 0 else 0
+        cpu_names = [f"CPU-{i}" for i in range(1, num_cores + 1)]
+        result['cpu_busy_time'] = {cpu: busy_time.get(cpu, 0) for cpu in cpu_names}
+        for name, counters in (('dispatches', self.dispatches), ('steals', self.steals),
+                               ('migrations', self.migrations)):
+            counters = dict(counters)
+            result[f'total_{name}'] = sum(counters.values())
+            result[f'cpu_{name}'] = {cpu: counters.get(cpu, 0) for cpu in cpu_names}
+        return result
+
+
+class JobRecordWriter:
+    """
+    Grava em CSV, à medida que terminam, os dados de cada job finalizado (JOB_RECORD_COLUMNS).
+
+    Ao retomar um checkpoint, resume_offset (o valor de tell() salvo nele)
+    reabre o arquivo existente e descarta as linhas gravadas depois do
+    checkpoint, que serão geradas de novo.
+    """
+
+    def __init__(self, file_path, resume_offset=None):
+        if resume_offset is None:
+            self.file = open(file_path, 'w', newline='')
+            self.writer = csv.writer(self.file)
+            self.writer.writerow(JOB_RECORD_COLUMNS)
+        else:
+            self.file = open(file_path, 'r+', newline='')
+            self.file.seek(resume_offset)
+            self.file.truncate()
+            self.writer = csv.writer(self.file)
+
+    def write(self, job):
+        self.writer.writerow((job.job_id, job.arrival_time, job.execution_time, job.turnaround_time, job.wait_time,
+                              job.context_switches))
+
+    def tell(self):
+        """Posição no arquivo após descarregar o buffer (ponto de retomada de um checkpoint)."""
+        self.file.flush()
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
@@ -1,11 +1,31 @@
 import matplotlib.pyplot as plt
+import numpy as np
+import os
 import re
 from collections import defaultdict
+from contextlib import closing
 
+FIGURE_WIDTH = 15
+FIGURE_DPI = 100
+MAX_LABELED_BARS = 200
 
-def plot_gantt_chart(log_file, num_cores):
+
+def iter_log_lines(log_file, start_time=None, end_time=None):
+    """Linhas do log de texto ou, de um diretório de log segmentado, só as da janela de tempo global."""
+    if os.path.isdir(log_file):
+        from segmented_log import SegmentedLogReader
+
+        yield from SegmentedLogReader(log_file).lines(start_time, end_time)
+        return
+    with open(log_file, 'r') as f:
+        yield from f
+
+
+def plot_gantt_chart(log_file, num_cores, start_time=None, end_time=None):
     """
-    Gera um gráfico de Gantt a partir de um arquivo de log da simulação.
+    Gera um gráfico de Gantt a partir de um arquivo de log da simulação ou
+    de um diretório de log segmentado (ver segmented_log.py); neste caso,
+    só os blocos da janela [start_time, end_time] são lidos.
     """
     start_pattern = re.compile(r"\[Global Time: (\d+)\] CPU-(\d+): Processo (\S+) iniciou execução.")
     preempt_pattern = re.compile(r"\[Global Time: (\d+)\] CPU-(\d+): Processo (\S+) sofreu preempção.*")
@@ -15,7 +35,7 @@ def plot_gantt_chart(log_file, num_cores):
     cpu_events = defaultdict(list)
     active_jobs = {}
 
-    with open(log_file, 'r') as f:
+    with closing(iter_log_lines(log_file, start_time, end_time)) as f:
         for line in f:
             start_match = start_pattern.search(line)
             preempt_match = preempt_pattern.search(line)
@@ -48,11 +68,10 @@ def plot_gantt_chart(log_file, num_cores):
                     if cpu in active_jobs:
                         active_jobs.pop(cpu)
 
-    max_log_time = 0
+    last_event_time = max((t for cpu_e in cpu_events.values() for t, _, _ in cpu_e), default=None)
     for cpu, (job, start_time) in active_jobs.items():
-        all_times = [t for cpu_e in cpu_events.values() for t, _, _ in cpu_e]
-        if all_times:
-            max_log_time = max(all_times + [start_time])
+        if last_event_time is not None:
+            max_log_time = max(last_event_time, start_time)
         else:
             max_log_time = start_time
 
@@ -71,7 +90,7 @@ def plot_gantt_chart(log_file, num_cores):
         plt.close(fig)
         return
 
-    colors = plt.cm.get_cmap('viridis', len(process_ids))
+    colors = plt.get_cmap('viridis', len(process_ids))
     color_map = {pid: colors(i) for i, pid in enumerate(process_ids)}
 
     max_time = 0
@@ -93,4 +112,95 @@ def plot_gantt_chart(log_file, num_cores):
     plt.tight_layout()
     plt.savefig("gantt_chart.png")
     print("\nGráfico de Gantt salvo como 'gantt_chart.png'")
-    # plt.show()
\ No newline at end of file
+    # plt.show()
+
+
+def decimate_intervals(starts, durations, jobs, max_time, num_bins):
+    """
+    Agrupa os intervalos de uma faixa em no máximo num_bins barras.
+
+    Intervalos cujo início cai na mesma coluna de pixels viram uma única
+    barra que vai do primeiro início ao maior fim do grupo, com a cor do
+    job que teve o intervalo mais longo naquela coluna.
+    """
+    if len(starts) <= num_bins:
+        return starts, durations, jobs
+
+    bins = starts * num_bins // max(max_time, 1)
+    first = np.flatnonzero(np.r_[True, bins[1:] != bins[:-1]])
+    ends = np.maximum.reduceat(starts + durations, first)
+    merged_starts = starts[first]
+
+    order = np.lexsort((durations, bins))
+    group_ends = np.r_[first[1:], len(starts)] - 1
+    dominant = order[group_ends]
+
+    return merged_starts, ends - merged_starts, jobs[dominant]
+
+
+def plot_telemetry(ax, telemetry):
+    """Desenha as séries de um TelemetrySampler (filas, CPUs ocupadas e quantum) em ax."""
+    data = telemetry.arrays()
+    for name, label in (("ready", "Prontos"), ("blocked", "Bloqueados"), ("busy_cpus", "CPUs ocupadas"),
+                        ("quantum", "Quantum")):
+        ax.step(data["time"], data[name], where='post', label=label)
+    ax.set_xlabel('Unidades de Tempo')
+    ax.legend(loc='upper right')
+    ax.grid(True, linestyle='--', linewidth=0.5)
+
+
+def plot_gantt_intervals(recorder, output_file="gantt_chart.png", telemetry=None):
+    """
+    Gera o gráfico de Gantt a partir de um GanttRecorder.
+
+    Cada CPU é desenhada com uma única chamada a broken_barh; quando há
+    mais barras do que colunas de pixels, os intervalos são agregados.
+    Com um TelemetrySampler, as séries temporais aparecem abaixo do
+    Gantt, no mesmo eixo de tempo.
+    """
+    num_bins = FIGURE_WIDTH * FIGURE_DPI
+    lanes = [lane.arrays() for lane in recorder.lanes]
+    max_time = max((int((s + d).max()) for s, d, _ in lanes if len(s)), default=0)
+
+    if max_time == 0:
+        print("\nNenhum evento de CPU foi registrado para plotar.")
+        return
+
+    if telemetry is not None and telemetry.size:
+        fig, (ax, telemetry_ax) = plt.subplots(2, 1, sharex=True, dpi=FIGURE_DPI,
+                                               figsize=(FIGURE_WIDTH, 2 * recorder.num_cores + 3),
+                                               gridspec_kw={'height_ratios': (2 * recorder.num_cores, 3)})
+        plot_telemetry(telemetry_ax, telemetry)
+    else:
+        fig, ax = plt.subplots(figsize=(FIGURE_WIDTH, 2 * recorder.num_cores), dpi=FIGURE_DPI)
+    colormap = plt.get_cmap('viridis')
+    color_scale = max(len(recorder.job_ids) - 1, 1)
+
+    lanes = [decimate_intervals(s, d, j, max_time, num_bins) for s, d, j in lanes]
+    label_bars = sum(len(s) for s, _, _ in lanes) <= MAX_LABELED_BARS
+
+    y_ticks = [i * 10 for i in range(recorder.num_cores)]
+    for i, (starts, durations, jobs) in enumerate(lanes):
+        if not len(starts):
+            continue
+        ax.broken_barh(np.column_stack((starts, durations)), (y_ticks[i] - 4, 8),
+                       facecolors=colormap(jobs / color_scale),
+                       edgecolor='black' if label_bars else 'none')
+        if label_bars:
+            for start, duration, job in zip(starts, durations, jobs):
+                ax.text(start + duration / 2, y_ticks[i], recorder.job_ids[job],
+                        ha='center', va='center', color='white', weight='bold')
+
+    ax.set_ylim(-5, recorder.num_cores * 10)
+    ax.set_xlim(0, max_time + 5)
+    if ax.get_subplotspec().is_last_row():
+        ax.set_xlabel('Unidades de Tempo')
+    ax.set_yticks(y_ticks)
+    ax.set_yticklabels([f"CPU-{i + 1}" for i in range(recorder.num_cores)])
+    ax.grid(True, which='both', linestyle='--', linewidth=0.5)
+
+    ax.set_title("Gráfico de Gantt da Execução dos Processos")
+    plt.tight_layout()
+    plt.savefig(output_file)
+    plt.close(fig)
+    print(f"\nGráfico de Gantt salvo como '{output_file}'")
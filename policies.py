@@ -0,0 +1,239 @@
+import heapq
+import itertools
+import math
+from collections import deque
+from itertools import chain, islice
+from queue import Queue
+
+
+class SchedulingPolicy(Queue):
+    """
+    Fila de prontos com uma política de escalonamento.
+
+    Segue o mesmo modelo de queue.PriorityQueue: as subclasses redefinem
+    _init/_put/_get e herdam de Queue o bloqueio, task_done() e join().
+    ready_count é atualizado sob o mutex da fila, mas pode ser lido sem
+    lock para decisões aproximadas (como o quantum dinâmico).
+    """
+
+    name = None
+    preemptive = False
+
+    def _init(self, maxsize):
+        self.queue = deque()
+        self.ready_count = 0
+
+    def _qsize(self):
+        return self.ready_count
+
+    def _put(self, job):
+        self.queue.append(job)
+        self.ready_count += 1
+
+    def _get(self):
+        self.ready_count -= 1
+        return self.queue.popleft()
+
+    def put_many(self, jobs):
+        """Enfileira vários jobs com uma única aquisição do mutex."""
+        with self.not_full:
+            for job in jobs:
+                self._put(job)
+            self.unfinished_tasks += len(jobs)
+            self.not_empty.notify(len(jobs))
+
+    def take(self, cpu_index, block=True):
+        """
+        Próximo job para a CPU cpu_index e se ele foi roubado de outra CPU
+        (ver PerCpuRunQueues). Na fila única todas as CPUs compartilham os
+        jobs, então nunca há roubo.
+        """
+        return self.get(block), False
+
+    def rebalance(self, current_time):
+        """Redistribui os jobs entre filas por CPU; a fila única não tem o que redistribuir."""
+        return False
+
+    def migration_cost(self, from_cpu, to_cpu):
+        """Ticks de CPU extras para um job que muda de CPU (sem topologia, nenhum)."""
+        return 0
+
+    def quantum_for(self, job, quantum):
+        """Quantum a ser usado pelo job, dado o quantum base do QueueManager."""
+        return quantum
+
+    def on_quantum_expired(self, job):
+        """Chamado quando o job consumiu todo o quantum e voltará para a fila."""
+
+    def should_preempt(self, job):
+        """Indica se o job em execução deve ceder a CPU ao primeiro da fila."""
+        return False
+
+    def snapshot(self):
+        """Jobs prontos na ordem em que seriam escalonados (chamar com o mutex da fila)."""
+        return list(self.queue)
+
+    def peek(self, limit):
+        """
+        Primeiros e últimos limit jobs na ordem de escalonamento, sem o mutex.
+
+        Cada cópia é feita inteiramente em C (islice/reversed sobre a deque),
+        sem liberar o GIL; serve para exibição, não para decisões.
+        """
+        return list(islice(self.queue, limit)), list(islice(reversed(self.queue), limit))[::-1]
+
+    def get_state(self):
+        """Conteúdo da fila para um checkpoint (sem os locks, que não são serializáveis)."""
+        return {"queue": self.queue, "ready_count": self.ready_count, "unfinished_tasks": self.unfinished_tasks}
+
+    def set_state(self, state):
+        self.queue = state["queue"]
+        self.ready_count = state["ready_count"]
+        self.unfinished_tasks = state["unfinished_tasks"]
+
+
+class RoundRobinPolicy(SchedulingPolicy):
+    """Fila FIFO com quantum fixo ou dinâmico (comportamento original)."""
+
+    name = "rr"
+
+
+class HeapPolicy(SchedulingPolicy):
+    """Base para políticas ordenadas por uma chave, com inserção e remoção O(log n)."""
+
+    def _init(self, maxsize):
+        self.queue = []
+        self.ready_count = 0
+        self.sequence = itertools.count()
+
+    def key(self, job):
+        raise NotImplementedError
+
+    def _put(self, job):
+        # O sentinela None (desligamento dos workers) vai para o fim da fila.
+        key = self.key(job) if job is not None else math.inf
+        heapq.heappush(self.queue, (key, next(self.sequence), job))
+        self.ready_count += 1
+
+    def _get(self):
+        self.ready_count -= 1
+        return heapq.heappop(self.queue)[2]
+
+    def peek_key(self):
+        """Chave do primeiro da fila, lida sem lock (None se vazia)."""
+        try:
+            return self.queue[0][0]
+        except IndexError:
+            return None
+
+    def snapshot(self):
+        return [job for _, _, job in sorted(self.queue)]
+
+    def peek(self, limit):
+        entries = list(self.queue)
+        head = [job for _, _, job in heapq.nsmallest(limit, entries)]
+        tail = [job for _, _, job in sorted(heapq.nlargest(limit, entries))]
+        return head, tail
+
+    def get_state(self):
+        # Consumir um número da sequência não altera a ordem relativa das próximas inserções.
+        return {**super().get_state(), "sequence": next(self.sequence)}
+
+    def set_state(self, state):
+        super().set_state(state)
+        self.sequence = itertools.count(state["sequence"])
+
+
+class ShortestJobFirstPolicy(HeapPolicy):
+    """SJF não preemptivo: o job mais curto roda até terminar (ou pedir E/S)."""
+
+    name = "sjf"
+
+    def key(self, job):
+        return job.remaining_time
+
+    def quantum_for(self, job, quantum):
+        return job.remaining_time
+
+
+class ShortestRemainingTimePolicy(ShortestJobFirstPolicy):
+    """SRTF: como o SJF, mas cede a CPU quando chega um job com menos tempo restante."""
+
+    name = "srtf"
+    preemptive = True
+
+    def should_preempt(self, job):
+        head = self.peek_key()
+        return head is not None and head < job.remaining_time
+
+
+class PriorityPolicy(HeapPolicy):
+    """Prioridade preemptiva (menor valor = maior prioridade), round robin entre iguais."""
+
+    name = "priority"
+    preemptive = True
+
+    def key(self, job):
+        return job.priority
+
+    def should_preempt(self, job):
+        head = self.peek_key()
+        return head is not None and head < job.priority
+
+
+class MultiLevelFeedbackPolicy(SchedulingPolicy):
+    """
+    Fila multinível com realimentação: o job começa no nível 0 e desce um
+    nível a cada quantum consumido por inteiro. O quantum dobra a cada
+    nível. A troca de nível acontece nas fronteiras de quantum.
+    """
+
+    name = "mlfq"
+
+    def __init__(self, maxsize=0, num_levels=3):
+        self.num_levels = num_levels
+        super().__init__(maxsize)
+
+    def _init(self, maxsize):
+        self.queue = [deque() for _ in range(self.num_levels)]
+        self.ready_count = 0
+
+    def _put(self, job):
+        level = job.queue_level if job is not None else self.num_levels - 1
+        self.queue[level].append(job)
+        self.ready_count += 1
+
+    def _get(self):
+        self.ready_count -= 1
+        for level in self.queue:
+            if level:
+                return level.popleft()
+
+    def quantum_for(self, job, quantum):
+        return quantum * 2 ** job.queue_level
+
+    def on_quantum_expired(self, job):
+        job.queue_level = min(job.queue_level + 1, self.num_levels - 1)
+
+    def snapshot(self):
+        return [job for level in self.queue for job in level]
+
+    def peek(self, limit):
+        head = list(islice(chain.from_iterable(self.queue), limit))
+        tail = list(islice(chain.from_iterable(map(reversed, reversed(self.queue))), limit))[::-1]
+        return head, tail
+
+
+POLICIES = {
+    policy.name: policy
+    for policy in (RoundRobinPolicy, ShortestJobFirstPolicy, ShortestRemainingTimePolicy, PriorityPolicy,
+                   MultiLevelFeedbackPolicy)
+}
+
+
+def make_policy(name, **kwargs):
+    """Cria a fila de prontos da política indicada pelo nome ("rr", "sjf", "srtf", "priority" ou "mlfq")."""
+    try:
+        return POLICIES[name](**kwargs)
+    except KeyError:
+        raise ValueError(f"Política de escalonamento desconhecida: {name}") from None
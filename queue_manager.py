@@ -1,6 +1,11 @@
+import bisect
+import heapq
+import itertools
 import threading
-from queue import Queue
+from queue import Empty
 from job import JobStatus
+from metrics import OnlineMetrics
+from run_queues import PerCpuRunQueues
 
 BASE_QUANTUM = 6
 MIN_QUANTUM = 2
@@ -8,17 +13,27 @@ MIN_QUANTUM = 2
 
 class QueueManager:
     def __init__(self, job_queue, process_job_func, logger, clock, io_request_flag, dynamic_quantum=False,
-                 fixed_quantum=4):
+                 fixed_quantum=4, base_quantum=BASE_QUANTUM, min_quantum=MIN_QUANTUM, keep_finished=True,
+                 record_writer=None):
         self.job_queue = job_queue
         self.process_job_func = process_job_func
         self.logger = logger
         self.clock = clock
 
+        # Com keep_finished=False os jobs finalizados não são guardados: as métricas ficam
+        # em self.metrics e, se houver record_writer, cada job é gravado em disco.
         self.finished_jobs = []
+        self.keep_finished = keep_finished
+        self.record_writer = record_writer
+        self.metrics = OnlineMetrics()
         self.dynamic_quantum = dynamic_quantum
         self.fixed_quantum = fixed_quantum
+        self.base_quantum = base_quantum
+        self.min_quantum = min_quantum
 
+        # Heap de (io_block_end_time, sequência, job): o topo é o próximo a sair da E/S.
         self.blocked_queue = []
+        self.blocked_sequence = itertools.count()
         self.blocked_lock = threading.Lock()
         self.finish_lock = threading.Lock()
 
@@ -27,21 +42,218 @@ class QueueManager:
 
         self.running = True
 
+        # Cada CPU escreve só a própria chave; atribuição e cópia do dict não precisam de lock.
         self.cpu_states = {}
-        self.cpu_state_lock = threading.Lock()
 
-    def calculate_quantum(self):
+        # CPUs adormecidas em wait_until(): as ociosas (modo barreira, índices em ordem) são acordadas
+        # quando chega trabalho e as ocupadas, quando a política pode preemptar ou há E/S interativa.
+        self.idle_cpus = []
+        self.running_cpus = set()
+        # Com a fila única, as ociosas são acordadas uma de cada vez (ver notify_ready).
+        self.chained_wakeup = not isinstance(job_queue, PerCpuRunQueues)
+
+    def current_quantum(self):
+        """Quantum base neste momento (antes do ajuste da política para um job específico)."""
         if not self.dynamic_quantum:
             return self.fixed_quantum
-        else:
-            num_ready = self.job_queue.qsize()
-            quantum = BASE_QUANTUM - num_ready
-            return max(MIN_QUANTUM, quantum)
+        # Leitura sem lock: o tamanho da fila é só uma estimativa para o quantum.
+        return max(self.min_quantum, self.base_quantum - self.job_queue.ready_count)
+
+    def calculate_quantum(self, job):
+        return self.job_queue.quantum_for(job, self.current_quantum())
+
+    def should_preempt(self, job):
+        """Verifica se a política manda o job em execução ceder a CPU."""
+        return self.job_queue.preemptive and self.job_queue.should_preempt(job)
+
+    def wake_cpus(self, cpu_names, tick):
+        for cpu_name in list(cpu_names):
+            self.clock.wake_at(cpu_name, tick)
+
+    def add_idle_cpu(self, cpu_index):
+        bisect.insort(self.idle_cpus, cpu_index)
+
+    def remove_idle_cpu(self, cpu_index):
+        position = bisect.bisect_left(self.idle_cpus, cpu_index)
+        if position < len(self.idle_cpus) and self.idle_cpus[position] == cpu_index:
+            del self.idle_cpus[position]
+
+    def wake_next_idle(self, after_index):
+        """
+        Acorda, no tick atual, a primeira CPU ociosa de índice maior que
+        after_index ou, se não houver, a de menor índice (que, tendo rank
+        menor que o participante atual, só recebe a vez no próximo tick).
+        """
+        position = bisect.bisect_right(self.idle_cpus, after_index)
+        if position == len(self.idle_cpus):
+            position = 0
+        cpu_index = self.idle_cpus.pop(position)
+        self.clock.wake_at(f"CPU-{cpu_index + 1}", self.clock.global_time)
+
+    def notify_ready(self):
+        """Acorda, no tick atual, as CPUs que precisam reagir a um job novo na fila de prontos."""
+        current_time = self.clock.global_time
+        if self.clock.barrier and self.idle_cpus:
+            if self.chained_wakeup:
+                # Acordadas todas, as ociosas pegariam os jobs na ordem das vezes até a fila
+                # esvaziar e as demais voltariam a dormir. Basta acordar a primeira depois do
+                # participante atual (CPUs têm rank índice + 2); cada uma que pega um job acorda
+                # a seguinte (try_take), sem percorrer milhares de CPUs a cada job.
+                current_rank = self.clock.participants.get(self.clock.current_turn, 1)
+                self.wake_next_idle(current_rank - 2)
+            else:
+                # Com filas por CPU, cada ociosa pode ter trabalho próprio: acorda todas.
+                woken, self.idle_cpus = self.idle_cpus, []
+                self.wake_cpus([f"CPU-{cpu_index + 1}" for cpu_index in woken], current_time)
+        if self.job_queue.preemptive:
+            self.wake_cpus(self.running_cpus, current_time)
+
+    def request_io_interrupt(self):
+        """Sinaliza uma E/S interativa; a primeira CPU ocupada a acordar no próximo tick a atende."""
+        self.io_request_flag.set()
+        self.wake_cpus(self.running_cpus, self.clock.get_time() + 1)
+
+    def start_slice(self, job, cpu_name):
+        """
+        Coloca o job em execução na CPU cpu_name e retorna a duração da
+        fatia: o quantum da política, limitado ao que falta do job e ao
+        ponto da próxima E/S programada.
+        """
+        job.status = JobStatus.RUNNING
+        job.context_switches += 1
+
+        quantum = self.calculate_quantum(job)
+        time_slice = min(quantum, job.remaining_time)
+
+        # Uma rajada de E/S programada encerra a fatia no ponto em que ocorre.
+        io_burst = job.next_io_burst()
+        if io_burst is not None:
+            time_slice = min(time_slice, io_burst[0] - (job.execution_time - job.remaining_time))
+
+        if self.logger.enabled:
+            current_time = self.clock.get_time()
+            self.logger.log(f"{cpu_name}: Processo {job.job_id} iniciou execução.", current_time,
+                            event="start", cpu=cpu_name, job=job.job_id)
+            self.logger.log(f"{cpu_name}: Executando {job.job_id} (faltam {job.remaining_time}). Quantum={quantum}.",
+                            current_time, event="slice", cpu=cpu_name, job=job.job_id)
+        return time_slice
+
+    def account_execution(self, job, cpu_name, ticks):
+        """Desconta do job ticks de execução na CPU cpu_name."""
+        job.remaining_time -= ticks
+        self.record_busy(cpu_name, ticks)
+
+    def end_slice(self, job, cpu_name, quantum_expired=True):
+        """
+        Decide o destino do job ao fim de uma fatia já contabilizada:
+        finaliza-o, bloqueia-o na E/S programada que chegou ou o devolve à
+        fila de prontos (preempção). Retorna True se ele voltou à fila.
+        """
+        current_time = self.clock.get_time()
+        if job.remaining_time <= 0:
+            self.finish_job(job)
+            if self.logger.enabled:
+                self.logger.log(f"{cpu_name}: Processo {job.job_id} finalizado.", current_time,
+                                event="finish", cpu=cpu_name, job=job.job_id)
+            return False
+
+        io_burst = job.next_io_burst()
+        if io_burst is not None and job.execution_time - job.remaining_time == io_burst[0]:
+            job.io_index += 1
+            self.interrupt_for_io(job, cpu_name, io_burst[1])
+            return False
+
+        self.preempt_job(job, quantum_expired)
+        if self.logger.enabled:
+            self.logger.log(f"{cpu_name}: Processo {job.job_id} sofreu preempção.", current_time,
+                            event="preempt", cpu=cpu_name, job=job.job_id)
+        return True
+
+    def interrupt_for_io(self, job, cpu_name, io_duration):
+        """Tira o job da CPU cpu_name para uma E/S de io_duration ticks."""
+        self.logger.log(f"{cpu_name}: Processo {job.job_id} solicitou E/S.", self.clock.get_time(),
+                        event="io_request", cpu=cpu_name, job=job.job_id)
+        self.block_job(job, io_duration)
+
+    def run_slice(self, job, cpu_name, io_block_duration):
+        """
+        Uma fatia do job nos runtimes em tempo real (threads ou corrotinas),
+        como gerador: produz o tick até o qual a CPU deve dormir e recebe,
+        com send(), o tempo global ao acordar, até a fatia terminar.
+
+        A CPU dorme até o fim da fatia; só é acordada antes por uma E/S
+        interativa ou, em políticas preemptivas, por um job novo na fila.
+        Uma E/S que já estava pendente é verificada no tick seguinte.
+        """
+        clock = self.clock
+        time_slice = self.start_slice(job, cpu_name)
+        start_time = clock.get_time()
+
+        io_flag = self.io_request_flag
+        slice_end = start_time + time_slice
+        accounted_time = start_time
+
+        while True:
+            current_time = yield accounted_time + 1 if io_flag.is_set() else slice_end
+
+            if not clock.running:
+                self.logger.log(f"{cpu_name}: Clock parou. Interrompendo {job.job_id}.", clock.get_time(),
+                                event="interrupted", cpu=cpu_name, job=job.job_id)
+                self.add_job(job)
+                return
+
+            # Leitura sem lock no caso comum; o lock só decide qual CPU consome a E/S interativa.
+            if io_flag.is_set():
+                is_io_request = False
+                with self.io_flag_lock:
+                    if io_flag.is_set():
+                        io_flag.clear()
+                        is_io_request = True
+
+                if is_io_request:
+                    # O tick em que a E/S é percebida não é contabilizado como execução.
+                    self.account_execution(job, cpu_name, current_time - 1 - accounted_time)
+                    self.interrupt_for_io(job, cpu_name, io_block_duration)
+                    return
+
+            self.account_execution(job, cpu_name, current_time - accounted_time)
+            accounted_time = current_time
+
+            if current_time >= slice_end or self.should_preempt(job):
+                break
+
+        self.end_slice(job, cpu_name, accounted_time - start_time == time_slice)
 
     def add_job(self, job):
         job.status = JobStatus.READY
         self.job_queue.put(job)
-        self.logger.log(f"Scheduler: Processo {job.job_id} adicionado à fila de prontos.", self.clock.get_time())
+        self.notify_ready()
+        self.logger.log(f"Scheduler: Processo {job.job_id} adicionado à fila de prontos.", self.clock.get_time(),
+                        event="ready", job=job.job_id)
+
+    def add_jobs(self, jobs):
+        """Enfileira de uma vez os jobs que chegaram no mesmo tick, com uma única linha de log."""
+        if len(jobs) <= 1:
+            for job in jobs:
+                self.add_job(job)
+            return
+
+        for job in jobs:
+            job.status = JobStatus.READY
+        self.job_queue.put_many(jobs)
+        self.notify_ready()
+
+        current_time = self.clock.get_time()
+        job_ids = ", ".join(job.job_id for job in jobs)
+        self.logger.log(f"Scheduler: Processos {job_ids} adicionados à fila de prontos.", current_time)
+        for job in jobs:
+            self.logger.emit("ready", current_time, job=job.job_id)
+
+    def preempt_job(self, job, quantum_expired):
+        """Devolve à fila de prontos um job que perdeu a CPU antes de terminar."""
+        if quantum_expired:
+            self.job_queue.on_quantum_expired(job)
+        self.add_job(job)
 
     def finish_job(self, job):
         current_time = self.clock.get_time()
@@ -50,7 +262,19 @@ class QueueManager:
         job.wait_time = job.turnaround_time - job.execution_time
 
         with self.finish_lock:
-            self.finished_jobs.append(job)
+            self.metrics.record(job)
+            if self.keep_finished:
+                self.finished_jobs.append(job)
+            if self.record_writer is not None:
+                self.record_writer.write(job)
+
+    @property
+    def finished_count(self):
+        """Número de jobs finalizados (leitura sem lock)."""
+        return self.metrics.count
+
+    def record_busy(self, cpu_name, ticks):
+        self.metrics.record_busy(cpu_name, ticks)
 
     def block_job(self, job, io_duration):
         """Move um job para a fila de E/S (bloqueados)."""
@@ -59,34 +283,64 @@ class QueueManager:
         job.io_block_end_time = current_time + io_duration
 
         with self.blocked_lock:
-            self.blocked_queue.append(job)
+            heapq.heappush(self.blocked_queue, (job.io_block_end_time, next(self.blocked_sequence), job))
 
-        self.logger.log(f"Scheduler: Processo {job.job_id} movido para E/S (duração: {io_duration}).", current_time)
+        self.clock.wake_at("IOManager", job.io_block_end_time)
+        self.logger.log(f"Scheduler: Processo {job.job_id} movido para E/S (duração: {io_duration}).", current_time,
+                        event="blocked", job=job.job_id)
+
+    def next_unblock_time(self):
+        """Tempo em que o próximo job sai da E/S (None se não houver bloqueados)."""
+        with self.blocked_lock:
+            return self.blocked_queue[0][0] if self.blocked_queue else None
+
+    def pop_unblocked(self, current_time):
+        """Remove da fila de E/S, em ordem, os jobs cuja E/S terminou até current_time."""
+        unblocked_jobs = []
+        with self.blocked_lock:
+            while self.blocked_queue and self.blocked_queue[0][0] <= current_time:
+                unblocked_jobs.append(heapq.heappop(self.blocked_queue)[2])
+        return unblocked_jobs
+
+    def get_blocked_snapshot(self):
+        """Retorna os jobs bloqueados, do próximo a sair para o último."""
+        with self.blocked_lock:
+            return [job for _, _, job in sorted(self.blocked_queue)]
+
+    def get_state(self):
+        """
+        Filas, jobs finalizados e métricas acumuladas, para um checkpoint.
+        Só é consistente com o escalonador parado (motor orientado a eventos).
+        """
+        return {
+            "ready_queue": self.job_queue.get_state(),
+            "blocked_queue": self.blocked_queue,
+            "blocked_sequence": next(self.blocked_sequence),
+            "finished_jobs": self.finished_jobs,
+            "metrics": self.metrics,
+        }
+
+    def set_state(self, state):
+        self.job_queue.set_state(state["ready_queue"])
+        self.blocked_queue = state["blocked_queue"]
+        self.blocked_sequence = itertools.count(state["blocked_sequence"])
+        self.finished_jobs = state["finished_jobs"]
+        self.metrics = state["metrics"]
 
     def io_manager_worker(self):
-        """Worker que verifica a fila de E/S e desbloqueia jobs."""
+        """Worker que dorme até o próximo fim de E/S e desbloqueia os jobs."""
         while self.running:
-            with self.clock.time_lock:
-                self.clock.tick_condition.wait()
-                if not self.running:
-                    break
+            current_time = self.clock.wait_until(self.next_unblock_time())
+            if not self.running:
+                break
 
-            current_time = self.clock.get_time()
-            unblocked_jobs = []
-
-            with self.blocked_lock:
-                remaining_blocked = []
-                for job in self.blocked_queue:
-                    if current_time >= job.io_block_end_time:
-                        unblocked_jobs.append(job)
-                    else:
-                        remaining_blocked.append(job)
-                self.blocked_queue = remaining_blocked
-
-            for job in unblocked_jobs:
-                self.logger.log(f"IOManager: Processo {job.job_id} concluiu E/S.", current_time)
+            for job in self.pop_unblocked(current_time):
+                self.logger.log(f"IOManager: Processo {job.job_id} concluiu E/S.", current_time,
+                                event="io_done", job=job.job_id)
                 self.add_job(job)
 
+        self.clock.unregister_participant(threading.current_thread().name)
+
     def is_idle(self):
         """Verifica se não há jobs prontos ou bloqueados."""
         with self.blocked_lock:
@@ -94,38 +348,136 @@ class QueueManager:
 
     def set_cpu_state(self, cpu_name, job_id_or_status):
         """Define o estado atual de uma CPU."""
-        with self.cpu_state_lock:
-            self.cpu_states[cpu_name] = job_id_or_status
+        self.cpu_states[cpu_name] = job_id_or_status
 
     def get_cpu_states(self):
         """Retorna uma cópia dos estados das CPUs."""
-        with self.cpu_state_lock:
-            return self.cpu_states.copy()
+        return self.cpu_states.copy()
+
+    def get_status_snapshot(self, limit):
+        """
+        Estado resumido para exibição, lido sem nenhum lock do escalonador:
+        contagens das filas e apenas os limit primeiros e últimos jobs de
+        cada uma. Pode estar defasado em relação ao tick corrente.
+        """
+        for _ in range(3):
+            try:
+                ready_head, ready_tail = self.job_queue.peek(limit)
+                break
+            except RuntimeError:
+                # A fila mudou durante a cópia; tenta de novo.
+                continue
+        else:
+            ready_head, ready_tail = [], []
+
+        blocked = list(self.blocked_queue)
+        return {
+            "cpu_states": self.cpu_states.copy(),
+            "ready_count": self.job_queue.ready_count,
+            "ready_head": [job for job in ready_head if job is not None],
+            "ready_tail": [job for job in ready_tail if job is not None],
+            "blocked_count": len(blocked),
+            "blocked_head": [job for _, _, job in heapq.nsmallest(limit, blocked)],
+            "blocked_tail": [job for _, _, job in sorted(heapq.nlargest(limit, blocked))],
+            "finished_count": self.finished_count,
+        }
 
     def get_ready_queue_snapshot(self):
         """Retorna um snapshot thread-safe da fila de prontos."""
         with self.job_queue.mutex:
-            return list(self.job_queue.queue)
+            return self.job_queue.snapshot()
+
+    def rebalance_queues(self):
+        """
+        Rebalanceia as filas por CPU, se for a hora, e acorda as CPUs que
+        precisam reagir aos jobs que mudaram de fila. Retorna True se algum
+        job foi movido.
+        """
+        if self.job_queue.rebalance(self.clock.global_time):
+            self.notify_ready()
+            return True
+        return False
 
-    def worker(self):
+    def assign_cpu(self, job, cpu_index, stolen):
+        """
+        Registra que o job vai rodar na CPU cpu_index. Se ele mudou de nó,
+        paga a penalidade de migração da fila de prontos como tempo extra de
+        CPU (antes de avançar no próprio trabalho).
+        """
+        previous_cpu = job.last_cpu
+        migrated = previous_cpu >= 0 and previous_cpu != cpu_index
+        if migrated:
+            job.remaining_time += self.job_queue.migration_cost(previous_cpu, cpu_index)
+        job.last_cpu = cpu_index
+        self.metrics.record_dispatch(f"CPU-{cpu_index + 1}", stolen, migrated)
+
+    def try_take(self, cpu_index):
+        """
+        Uma consulta não bloqueante da CPU cpu_index à fila de prontos no
+        modo barreira: rebalanceia as filas, se for a hora, e retorna
+        (job, roubado) ou lança queue.Empty. Se ainda sobrarem jobs na fila
+        única, acorda a próxima CPU ociosa.
+        """
+        self.rebalance_queues()
+        job, stolen = self.job_queue.take(cpu_index, False)
+        if self.chained_wakeup and self.idle_cpus and not self.job_queue.empty():
+            self.wake_next_idle(cpu_index)
+        return job, stolen
+
+    def next_job(self, cpu_index):
+        """
+        Obtém o próximo job da fila de prontos para a CPU cpu_index.
+
+        No modo barreira a CPU só consulta a fila durante a sua vez no tick;
+        enquanto a fila estiver vazia, dorme até que notify_ready() a acorde.
+        """
+        if not self.clock.barrier:
+            self.rebalance_queues()
+            job, stolen = self.job_queue.take(cpu_index)
+        else:
+            while self.clock.running:
+                try:
+                    job, stolen = self.try_take(cpu_index)
+                    break
+                except Empty:
+                    # Com filas por CPU pode haver jobs em outras filas que esta CPU não pode pegar
+                    # (sem roubo): ela volta a consultar no próximo tick, quando pode haver rebalanceamento.
+                    target = None if self.job_queue.empty() else self.clock.global_time + 1
+                    self.add_idle_cpu(cpu_index)
+                    self.clock.wait_until(target)
+                    self.remove_idle_cpu(cpu_index)
+            else:
+                job, stolen = self.job_queue.take(cpu_index)
+
+        if job is not None:
+            self.assign_cpu(job, cpu_index, stolen)
+        return job
+
+    def worker(self, cpu_index):
         """Função do worker (CPU) que consome da fila de jobs."""
         cpu_name = threading.current_thread().name
         self.set_cpu_state(cpu_name, 'Idle')
 
+        if self.clock.barrier:
+            self.clock.wait_tick()
+
         while True:
-            job = self.job_queue.get()
+            job = self.next_job(cpu_index)
 
             if job is None:
                 self.job_queue.task_done()
                 self.set_cpu_state(cpu_name, 'Offline')
+                self.clock.unregister_participant(cpu_name)
                 break
 
             try:
                 self.set_cpu_state(cpu_name, job.job_id)
+                self.running_cpus.add(cpu_name)
                 self.process_job_func(job, self)
             except Exception as e:
                 self.logger.log(f"Erro processando {job.job_id}: {e}", self.clock.get_time())
             finally:
+                self.running_cpus.discard(cpu_name)
                 self.set_cpu_state(cpu_name, 'Idle')
                 self.job_queue.task_done()
 
@@ -133,7 +485,8 @@ class QueueManager:
         """Inicia as threads dos workers (CPUs)."""
         threads = []
         for i in range(num_workers):
-            thread = threading.Thread(target=self.worker, name=f"CPU-{i + 1}")
+            self.clock.register_participant(f"CPU-{i + 1}", i + 2)
+            thread = threading.Thread(target=self.worker, args=(i,), name=f"CPU-{i + 1}")
             thread.daemon = True
             thread.start()
             threads.append(thread)
@@ -141,6 +494,7 @@ class QueueManager:
 
     def start_io_manager(self):
         """Inicia a thread do gerenciador de E/S."""
+        self.clock.register_participant("IOManager", 1)
         thread = threading.Thread(target=self.io_manager_worker, name="IOManager")
         thread.daemon = True
         thread.start()
@@ -148,4 +502,5 @@ class QueueManager:
 
     def stop(self):
         """Sinaliza para o IOManager parar."""
-        self.running = False
\ No newline at end of file
+        self.running = False
+        self.clock.wake_at("IOManager", 0)
\ No newline at end of file
@@ -0,0 +1,203 @@
+import gzip
+import hashlib
+import json
+import os
+import pickle
+
+from job import Job, JobStatus
+from metrics import JOB_RECORD_COLUMNS, finished_job_list
+from queue_manager import BASE_QUANTUM, MIN_QUANTUM
+from workload import io_profile_path, is_binary_workload
+
+CACHE_MAGIC = b"ESCCACHE"
+CACHE_SUFFIX = ".result"
+
+# Módulos cujo código determina o resultado de uma simulação: mudar qualquer um deles invalida o cache.
+ENGINE_MODULES = ("main", "event_engine", "rr_solver", "async_runtime", "queue_manager", "policies", "run_queues",
+                  "dispatcher", "clock", "job", "metrics", "gantt", "telemetry", "workload")
+
+_engine_version = None
+
+
+def engine_version():
+    """Hash do código dos módulos de ENGINE_MODULES (calculado uma vez por processo)."""
+    global _engine_version
+    if _engine_version is None:
+        digest = hashlib.sha256()
+        directory = os.path.dirname(os.path.abspath(__file__))
+        for name in ENGINE_MODULES:
+            with open(os.path.join(directory, name + ".py"), "rb") as f:
+                digest.update(f.read())
+        _engine_version = digest.hexdigest()
+    return _engine_version
+
+
+def simulation_params(engine="event", num_cores=2, quantum=5, dynamic_quantum=False, io_block_duration=10,
+                      policy="rr", base_quantum=BASE_QUANTUM, min_quantum=MIN_QUANTUM, run_queue_options=None,
+                      keep_finished=True, telemetry_interval=None, telemetry_capacity=4096, gantt=False):
+    """
+    Parâmetros que determinam o resultado de uma simulação, com os mesmos
+    nomes e padrões em main.py e sweep.py, para que a mesma configuração
+    gere sempre a mesma chave.
+    """
+    return {
+        "engine": engine, "num_cores": num_cores, "quantum": quantum, "dynamic_quantum": dynamic_quantum,
+        "io_block_duration": io_block_duration, "policy": policy, "base_quantum": base_quantum,
+        "min_quantum": min_quantum, "run_queue_options": run_queue_options, "keep_finished": keep_finished,
+        "telemetry_interval": telemetry_interval, "telemetry_capacity": telemetry_capacity, "gantt": gantt,
+    }
+
+
+def hash_file(digest, file_path):
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+
+
+def cache_key(workload_path, params):
+    """
+    Chave de uma simulação: hash do conteúdo da carga (com o arquivo de
+    perfis de E/S de uma carga binária, se houver), dos parâmetros e da
+    versão do motor.
+    """
+    digest = hashlib.sha256()
+    digest.update(engine_version().encode())
+    digest.update(json.dumps(params, sort_keys=True).encode())
+    hash_file(digest, workload_path)
+    profile_path = io_profile_path(workload_path)
+    # Só as cargas binárias leem o arquivo de perfis; um .io.csv ao lado de um CSV não muda o resultado.
+    if is_binary_workload(workload_path) and os.path.exists(profile_path):
+        # Marca onde começa o perfil, para que carga + perfil não coincida com uma carga sem perfil.
+        digest.update(b"\0io")
+        hash_file(digest, profile_path)
+    return digest.hexdigest()
+
+
+def make_result(finished_jobs, total_time, online_metrics, telemetry=None, gantt=None):
+    """
+    Resultado de uma simulação no formato guardado pelo cache: métricas
+    acumuladas (o que print_report usa), uma tupla de JOB_RECORD_COLUMNS
+    por job finalizado e, se houver, a telemetria e os intervalos do Gantt.
+    finished_jobs pode ser a lista de jobs finalizados ou uma JobTable.
+    """
+    return {
+        "total_time": total_time,
+        "metrics": online_metrics,
+        "jobs": [tuple(getattr(job, column) for column in JOB_RECORD_COLUMNS)
+                 for job in finished_job_list(finished_jobs)],
+        "telemetry": None if telemetry is None else (telemetry.interval, telemetry.capacity, telemetry.get_state()),
+        "gantt": None if gantt is None else gantt.get_state(),
+    }
+
+
+def restore_jobs(result):
+    """Jobs finalizados de um resultado do cache, como objetos Job."""
+    jobs = []
+    for job_id, arrival_time, execution_time, turnaround_time, wait_time, context_switches in result["jobs"]:
+        job = Job(job_id, arrival_time, execution_time)
+        job.remaining_time = 0
+        job.status = JobStatus.FINISHED
+        job.turnaround_time = turnaround_time
+        job.wait_time = wait_time
+        job.context_switches = context_switches
+        jobs.append(job)
+    return jobs
+
+
+def restore_telemetry(result):
+    """TelemetrySampler com as amostras de um resultado do cache (None se não houver)."""
+    if result["telemetry"] is None:
+        return None
+    from telemetry import TelemetrySampler
+
+    interval, capacity, state = result["telemetry"]
+    telemetry = TelemetrySampler(None, interval, capacity)
+    telemetry.set_state(state)
+    return telemetry
+
+
+class ResultCache:
+    """
+    Cache em disco de resultados de simulações determinísticas, endereçado
+    pelo conteúdo (ver cache_key): um arquivo pickle comprimido por chave
+    em directory.
+
+    A ordem de uso fica no mtime dos arquivos (get() o atualiza), então
+    vários processos (sweep.py) podem compartilhar o mesmo diretório. Depois
+    de cada put(), as entradas menos usadas recentemente são removidas até
+    o total caber em max_bytes.
+    """
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def path_for(self, key):
+        return os.path.join(self.directory, key + CACHE_SUFFIX)
+
+    def get(self, key):
+        """Resultado guardado para a chave, ou None."""
+        path = self.path_for(key)
+        try:
+            with gzip.open(path, "rb") as f:
+                if f.read(len(CACHE_MAGIC)) != CACHE_MAGIC:
+                    raise ValueError(f"{path}: não é uma entrada do cache.")
+                result = pickle.load(f)
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+            # Entrada corrompida (por exemplo, de uma versão antiga): descarta e simula de novo.
+            self.discard(path)
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return result
+
+    def put(self, key, result):
+        """Guarda o resultado (escrita atômica, como em checkpoint.py) e aplica o limite de tamanho."""
+        path = self.path_for(key)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with gzip.open(temp_path, "wb", compresslevel=6) as f:
+            f.write(CACHE_MAGIC)
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+        self.evict()
+
+    def entries(self):
+        """(mtime, tamanho, caminho) de cada entrada."""
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(CACHE_SUFFIX):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        return entries
+
+    def evict(self):
+        """Remove as entradas usadas há mais tempo até o total caber em max_bytes."""
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self.discard(path)
+            total -= size
+
+    def discard(self, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def clear(self):
+        for _, _, path in self.entries():
+            self.discard(path)
@@ -0,0 +1,239 @@
+import argparse
+import heapq
+import math
+import sys
+from collections import deque
+
+
+class RoundRobinSolution:
+    """
+    Resultado de solve_round_robin: listas indexadas pela posição do job na
+    entrada e contadores indexados pela CPU.
+    """
+
+    def __init__(self, num_jobs, num_cores):
+        self.finish_time = [0] * num_jobs
+        self.context_switches = [0] * num_jobs
+        self.last_cpu = [-1] * num_jobs
+        # Índices dos jobs na ordem em que terminaram (instante e, dentro dele, índice da CPU).
+        self.finish_order = []
+        self.busy_time = [0] * num_cores
+        self.dispatches = [0] * num_cores
+        self.migrations = [0] * num_cores
+        self.total_time = 0
+
+
+def solve_round_robin(arrival_times, execution_times, num_cores, quantum):
+    """
+    Resolve o round-robin com quantum fixo e fila única, sem E/S, direto
+    dos tempos de chegada (em ordem não decrescente) e de execução, com o
+    mesmo resultado do EventSimulator: mesmos instantes de término, trocas
+    de contexto, despachos e migrações por CPU.
+
+    Enquanto a fila de prontos está vazia, nada muda até a próxima chegada:
+    cada CPU ocupada só devolve o job à fila para pegá-lo de volta. Nesses
+    trechos, as rodadas de quantum de um job até a próxima chegada (ou até
+    ele terminar) são resolvidas de uma vez. Com fila, cada fim de fatia é
+    processado individualmente, como no motor de eventos, mas sobre listas
+    de inteiros em vez de objetos Job e sem log.
+    """
+    if quantum < 1:
+        raise ValueError("O quantum precisa ser de pelo menos 1 unidade de tempo.")
+
+    # O Dispatcher só observa o relógio a partir do primeiro tick.
+    arrival_times = [arrival_time if arrival_time > 1 else 1 for arrival_time in arrival_times]
+    num_jobs = len(arrival_times)
+    remaining = list(execution_times)
+    solution = RoundRobinSolution(num_jobs, num_cores)
+    finish_time = solution.finish_time
+    context_switches = solution.context_switches
+    last_cpu = solution.last_cpu
+    finish_order = solution.finish_order
+    busy_time = solution.busy_time
+    dispatches = solution.dispatches
+    migrations = solution.migrations
+
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+    ready = deque()
+    idle = list(range(num_cores))  # heap de índices de CPUs ociosas
+    # Heap das CPUs ocupadas, com chave fim da fatia * num_cores + CPU: a ordem dentro de um instante
+    # é a de índice, e inteiros são mais baratos de comparar que tuplas.
+    running = []
+    running_job = [0] * num_cores
+    running_duration = [0] * num_cores
+    next_arrival = 0
+    last_end = 0
+
+    while True:
+        if next_arrival < num_jobs:
+            current_time = arrival_times[next_arrival]
+            if running and running[0] // num_cores < current_time:
+                current_time = running[0] // num_cores
+        elif running:
+            current_time = running[0] // num_cores
+        else:
+            break
+
+        while next_arrival < num_jobs and arrival_times[next_arrival] <= current_time:
+            ready.append(next_arrival)
+            next_arrival += 1
+
+        # CPUs do instante em ordem de índice: as que encerram uma fatia e, enquanto houver fila, as
+        # ociosas. Quando a fila esvazia, não volta a encher no mesmo instante (quem devolve um job o
+        # pega de volta em seguida), então as ociosas restantes não precisam ser visitadas. As fatias
+        # despachadas terminam depois deste instante, fora do intervalo [base, limit).
+        base = current_time * num_cores
+        limit = base + num_cores
+        while True:
+            if running and running[0] < limit and not (ready and idle and idle[0] < running[0] - base):
+                cpu_index = heappop(running) - base
+                job = running_job[cpu_index]
+                duration = running_duration[cpu_index]
+                remaining[job] -= duration
+                busy_time[cpu_index] += duration
+                last_end = current_time
+                if remaining[job]:
+                    ready.append(job)
+                else:
+                    finish_time[job] = current_time
+                    finish_order.append(job)
+            elif ready and idle:
+                cpu_index = heappop(idle)
+            else:
+                break
+
+            if not ready:
+                heappush(idle, cpu_index)
+                continue
+
+            job = ready.popleft()
+            previous_cpu = last_cpu[job]
+            if previous_cpu != cpu_index:
+                if previous_cpu >= 0:
+                    migrations[cpu_index] += 1
+                last_cpu[job] = cpu_index
+
+            duration = remaining[job]
+            if ready:
+                slices = 1
+                if duration > quantum:
+                    duration = quantum
+            else:
+                # Fila vazia: o job roda rodadas inteiras de quantum até a primeira fronteira em que a
+                # próxima chegada já está na fila (ou até terminar), trocando de contexto a cada uma.
+                slices = -(-duration // quantum)
+                if next_arrival < num_jobs:
+                    rounds = -(-(arrival_times[next_arrival] - current_time) // quantum)
+                    if rounds < slices:
+                        slices = rounds
+                        duration = rounds * quantum
+            context_switches[job] += slices
+            dispatches[cpu_index] += slices
+            running_job[cpu_index] = job
+            running_duration[cpu_index] = duration
+            heappush(running, base + duration * num_cores + cpu_index)
+
+    solution.total_time = last_end
+    return solution
+
+
+def finished_jobs_in_order(jobs, solution):
+    """Aplica a solução aos jobs (na mesma ordem da entrada) e os retorna na ordem em que terminaram."""
+    from job import JobStatus
+
+    finish_time = solution.finish_time
+    context_switches = solution.context_switches
+    last_cpu = solution.last_cpu
+    finished = []
+    for index in solution.finish_order:
+        job = jobs[index]
+        job.remaining_time = 0
+        job.status = JobStatus.FINISHED
+        job.turnaround_time = finish_time[index] - job.arrival_time
+        job.wait_time = job.turnaround_time - job.execution_time
+        job.context_switches = context_switches[index]
+        job.last_cpu = last_cpu[index]
+        finished.append(job)
+    return finished
+
+
+def record_metrics(online_metrics, arrival_times, execution_times, solution):
+    """Contabiliza em online_metrics (OnlineMetrics) todos os jobs e os contadores por CPU da solução."""
+    import numpy as np
+
+    arrival_times = np.asarray(arrival_times, dtype=np.int64)
+    execution_times = np.asarray(execution_times, dtype=np.int64)
+    turnaround_times = np.asarray(solution.finish_time, dtype=np.int64) - arrival_times
+    online_metrics.record_many(arrival_times, execution_times, turnaround_times, turnaround_times - execution_times,
+                               np.asarray(solution.context_switches, dtype=np.int64))
+
+    for cpu_index, dispatches in enumerate(solution.dispatches):
+        if dispatches:
+            cpu_name = f"CPU-{cpu_index + 1}"
+            online_metrics.record_busy(cpu_name, solution.busy_time[cpu_index])
+            online_metrics.dispatches[cpu_name] = online_metrics.dispatches.get(cpu_name, 0) + dispatches
+            if solution.migrations[cpu_index]:
+                online_metrics.migrations[cpu_name] = (online_metrics.migrations.get(cpu_name, 0)
+                                                       + solution.migrations[cpu_index])
+
+
+def compare_with_events(workload_path, num_cores, quantum):
+    """
+    Executa a carga no EventSimulator evento a evento (fast_path=False) e
+    por solve_round_robin e retorna (solucionador aplicável, diferenças):
+    tempo total, jobs na ordem de término e métricas de cada execução.
+    """
+    from event_engine import EventSimulator
+    from workload import load_jobs_from_csv, open_workload, scan_workload
+
+    _, in_order = scan_workload(workload_path)
+    runs = []
+    for fast_path in (False, True):
+        jobs = open_workload(workload_path) if in_order else load_jobs_from_csv(workload_path)
+        simulator = EventSimulator(jobs, num_cores, dynamic_quantum=False, fixed_quantum=quantum,
+                                   fast_path=fast_path)
+        total_time = simulator.run()
+        finished = [(job.job_id, job.turnaround_time, job.wait_time, job.context_switches)
+                    for job in simulator.finished_jobs]
+        runs.append((simulator.solved, total_time, finished, simulator.metrics.summary(total_time, num_cores)))
+
+    (_, events_time, events_jobs, events_summary), (solved, solver_time, solver_jobs, solver_summary) = runs
+    differences = []
+    if events_time != solver_time:
+        differences.append(f"tempo total: {events_time} (eventos) x {solver_time} (solucionador)")
+    for position, (expected, found) in enumerate(zip(events_jobs, solver_jobs)):
+        if expected != found:
+            differences.append(f"{position + 1}º job finalizado: {expected} (eventos) x {found} (solucionador)")
+            break
+    if len(events_jobs) != len(solver_jobs):
+        differences.append(f"jobs finalizados: {len(events_jobs)} (eventos) x {len(solver_jobs)} (solucionador)")
+    for key, expected in events_summary.items():
+        found = solver_summary[key]
+        # Desvios-padrão acumulados em lote diferem da soma valor a valor só por arredondamento.
+        if isinstance(expected, float) and isinstance(found, float):
+            if not math.isclose(expected, found, rel_tol=1e-9, abs_tol=1e-9):
+                differences.append(f"{key}: {expected} (eventos) x {found} (solucionador)")
+        elif expected != found:
+            differences.append(f"{key}: {expected} (eventos) x {found} (solucionador)")
+    return solved, differences
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Confere o solucionador de round-robin contra o motor orientado a eventos.")
+    parser.add_argument("workload", help="CSV ou binário de processos")
+    parser.add_argument("--cores", type=int, default=2)
+    parser.add_argument("--quantum", type=int, default=5)
+    arguments = parser.parse_args()
+
+    solved, differences = compare_with_events(arguments.workload, arguments.cores, arguments.quantum)
+    if not solved:
+        print("A carga tem perfis de E/S: o solucionador não se aplica e a simulação seguiu pelos eventos.")
+    elif differences:
+        print("O solucionador diverge do motor orientado a eventos:")
+        for difference in differences:
+            print(f"  {difference}")
+    else:
+        print("Resultados idênticos aos do motor orientado a eventos.")
+    sys.exit(1 if differences else 0)
@@ -0,0 +1,244 @@
+import threading
+from contextlib import ExitStack
+from operator import attrgetter
+from queue import Empty
+
+from policies import make_policy
+
+READY_COUNT = attrgetter("ready_count")
+
+
+class PerCpuRunQueues:
+    """
+    Uma fila de prontos por CPU, cada uma com a política escolhida, no
+    lugar da fila única compartilhada.
+
+    Cada CPU retira jobs da própria fila, então o despacho não disputa um
+    mutex global. Jobs novos são distribuídos em rodízio entre as CPUs e
+    jobs que voltam (preempção ou fim de E/S) vão para a fila da última
+    CPU em que rodaram (afinidade). O balanceamento é configurável:
+
+    - work_stealing: uma CPU sem trabalho rouba o primeiro job da fila
+      mais cheia, procurando primeiro no próprio nó;
+    - rebalance_interval: a cada tantos ticks, a primeira CPU a buscar
+      trabalho redistribui os jobs para igualar o tamanho das filas (ver
+      QueueManager.rebalance_queues).
+
+    Com cores_per_node, as CPUs são agrupadas em nós e um job que passa a
+    rodar em um nó diferente do anterior paga migration_penalty ticks de
+    CPU a mais (ver QueueManager.assign_cpu).
+
+    Expõe a mesma interface de SchedulingPolicy usada pelo QueueManager,
+    pelos motores e pelo monitor; ready_count é a soma das filas locais.
+    """
+
+    def __init__(self, policy, num_cores, cores_per_node=None, migration_penalty=0, work_stealing=True,
+                 rebalance_interval=None, poll_interval=0.001):
+        self.queues = [make_policy(policy) for _ in range(num_cores)]
+        self.name = self.queues[0].name
+        self.preemptive = self.queues[0].preemptive
+        self.cores_per_node = cores_per_node or num_cores
+        self.node_of = [cpu_index // self.cores_per_node for cpu_index in range(num_cores)]
+        self.migration_penalty = migration_penalty
+        self.work_stealing = work_stealing
+        self.rebalance_interval = rebalance_interval
+        self.poll_interval = poll_interval
+
+        # Filas vítimas de roubo de cada CPU, em camadas: primeiro o mesmo nó, depois os demais.
+        self.steal_tiers = []
+        for cpu_index in range(num_cores):
+            local = [self.queues[other] for other in range(num_cores)
+                     if other != cpu_index and self.node_of[other] == self.node_of[cpu_index]]
+            remote = [self.queues[other] for other in range(num_cores)
+                      if self.node_of[other] != self.node_of[cpu_index]]
+            self.steal_tiers.append([tier for tier in (local, remote) if tier])
+
+        self.next_placement = 0
+        self.next_sentinel = 0
+        self.next_rebalance = rebalance_interval
+        # Serializa os rebalanceamentos; o caminho comum (fila local) não o toma.
+        self.mutex = threading.Lock()
+
+    @property
+    def ready_count(self):
+        return sum(map(READY_COUNT, self.queues))
+
+    def qsize(self):
+        return self.ready_count
+
+    def empty(self):
+        return not self.ready_count
+
+    def target_for(self, job):
+        """Fila que recebe o job: a da última CPU em que rodou ou, se é novo, a próxima do rodízio."""
+        if job is None:
+            # Sentinelas de desligamento: exatamente um por CPU.
+            target = self.next_sentinel
+            self.next_sentinel = (target + 1) % len(self.queues)
+        elif job.last_cpu >= 0:
+            target = job.last_cpu
+        else:
+            target = self.next_placement
+            self.next_placement = (target + 1) % len(self.queues)
+        return target
+
+    def put(self, job, block=True, timeout=None):
+        self.queues[self.target_for(job)].put(job)
+
+    def put_many(self, jobs):
+        batches = {}
+        for job in jobs:
+            batches.setdefault(self.target_for(job), []).append(job)
+        for target, batch in batches.items():
+            self.queues[target].put_many(batch)
+
+    def take(self, cpu_index, block=True):
+        """
+        Próximo job para a CPU cpu_index: da fila local ou, se ela estiver
+        vazia, roubado de outra. Retorna (job, roubado).
+
+        Sem block, lança queue.Empty se não houver nada; com block, espera
+        na fila local e tenta roubar de novo a cada poll_interval segundos.
+        """
+        local = self.queues[cpu_index]
+        while True:
+            try:
+                job = local.get_nowait()
+                # Quem contabiliza task_done()/join() é a fila local.
+                local.task_done()
+                return job, False
+            except Empty:
+                pass
+
+            if self.work_stealing:
+                job = self.steal(cpu_index)
+                if job is not None:
+                    return job, True
+
+            if not block:
+                raise Empty
+            with local.not_empty:
+                if not local.ready_count:
+                    local.not_empty.wait(self.poll_interval)
+
+    def steal(self, cpu_index):
+        """Retira o primeiro job da fila mais cheia, do nó mais próximo para o mais distante."""
+        for tier in self.steal_tiers[cpu_index]:
+            victim = max(tier, key=READY_COUNT)
+            if not victim.ready_count:
+                continue
+            try:
+                job = victim.get_nowait()
+            except Empty:
+                continue
+            if job is None:
+                # Sentinela de desligamento da outra CPU: não é trabalho a roubar.
+                victim.put(None)
+                victim.task_done()
+                return None
+            victim.task_done()
+            return job
+        return None
+
+    def rebalance(self, current_time):
+        """
+        Se já passou rebalance_interval desde o último rebalanceamento,
+        iguala o tamanho das filas locais, movendo jobs das mais cheias para
+        as mais vazias. Retorna True se algum job mudou de fila.
+        """
+        if self.next_rebalance is None or current_time < self.next_rebalance:
+            return False
+        if not self.mutex.acquire(blocking=False):
+            # Outra CPU já está rebalanceando.
+            return False
+
+        moved = False
+        try:
+            self.next_rebalance = current_time + self.rebalance_interval
+            with ExitStack() as stack:
+                # Locks sempre na mesma ordem (índice da CPU), para não haver deadlock.
+                for local in self.queues:
+                    stack.enter_context(local.mutex)
+
+                total = sum(local.ready_count for local in self.queues)
+                target = -(-total // len(self.queues))
+                receivers = [local for local in self.queues if local.ready_count < target]
+                for donor in self.queues:
+                    while donor.ready_count > target and receivers:
+                        job = donor._get()
+                        if job is None:
+                            donor._put(job)
+                            break
+                        receiver = receivers[0]
+                        receiver._put(job)
+                        donor.unfinished_tasks -= 1
+                        receiver.unfinished_tasks += 1
+                        receiver.not_empty.notify()
+                        moved = True
+                        if receiver.ready_count >= target:
+                            receivers.pop(0)
+        finally:
+            self.mutex.release()
+        return moved
+
+    def migration_cost(self, from_cpu, to_cpu):
+        """Ticks de CPU extras para um job que passa de from_cpu para to_cpu."""
+        if from_cpu < 0 or self.node_of[from_cpu] == self.node_of[to_cpu]:
+            return 0
+        return self.migration_penalty
+
+    def task_done(self):
+        """Sem efeito: take() já marca o item como concluído na fila local de onde saiu."""
+
+    def join(self):
+        """Espera até todos os itens (inclusive os sentinelas) terem sido retirados."""
+        for local in self.queues:
+            local.join()
+
+    def quantum_for(self, job, quantum):
+        return self.queues[0].quantum_for(job, quantum)
+
+    def on_quantum_expired(self, job):
+        self.queues[0].on_quantum_expired(job)
+
+    def should_preempt(self, job):
+        """A preempção só considera a fila da CPU em que o job está rodando."""
+        return self.queues[job.last_cpu].should_preempt(job)
+
+    def snapshot(self):
+        """Jobs prontos, fila por fila (toma o mutex de cada uma)."""
+        jobs = []
+        for local in self.queues:
+            with local.mutex:
+                jobs += local.snapshot()
+        return jobs
+
+    def peek(self, limit):
+        heads, tails = [], []
+        for local in self.queues:
+            head, tail = local.peek(limit)
+            heads += head
+            tails += tail
+        return heads[:limit], tails[-limit:] if limit else []
+
+    def get_state(self):
+        return {"queues": [local.get_state() for local in self.queues], "next_placement": self.next_placement,
+                "next_sentinel": self.next_sentinel, "next_rebalance": self.next_rebalance}
+
+    def set_state(self, state):
+        for local, local_state in zip(self.queues, state["queues"]):
+            local.set_state(local_state)
+        self.next_placement = state["next_placement"]
+        self.next_sentinel = state["next_sentinel"]
+        self.next_rebalance = state["next_rebalance"]
+
+
+def make_ready_queue(policy, num_cores, run_queue_options=None):
+    """
+    Fila de prontos dos motores: a fila única da política ou, com
+    run_queue_options (argumentos de PerCpuRunQueues, por exemplo
+    {"cores_per_node": 4, "migration_penalty": 2}), uma fila por CPU.
+    """
+    if run_queue_options is None:
+        return make_policy(policy)
+    return PerCpuRunQueues(policy, num_cores, **run_queue_options)
@@ -0,0 +1,240 @@
+import argparse
+import gzip
+import json
+import os
+import sys
+
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".log.gz"
+INDEX_FILE = "index.jsonl"
+BLOCK_RECORDS = 4096
+SEGMENT_BYTES = 64 * 1024 * 1024
+
+# Linhas do histórico de um job para registros só estruturados: as chegadas em lote (QueueManager.add_jobs)
+# têm uma única linha de texto, sem job, e um registro "ready" sem mensagem para cada job.
+STRUCTURED_MESSAGES = {"ready": "Scheduler: Processo {job} adicionado à fila de prontos."}
+
+
+def segment_name(number):
+    return f"{SEGMENT_PREFIX}{number:06d}{SEGMENT_SUFFIX}"
+
+
+def format_record(record):
+    """Linha no formato do simulation.log para um registro (wall, tempo, mensagem, evento, CPU, job)."""
+    wall, time, message = record[:3]
+    time_prefix = f"[Global Time: {time}]" if time is not None else ""
+    return f"[{wall}]{time_prefix} {message}\n"
+
+
+class SegmentedLogWriter:
+    """
+    Log da simulação em segmentos comprimidos, com um índice esparso para
+    ler só uma janela de tempo global ou o histórico de um job.
+
+    Os registros (uma lista JSON [wall, tempo, mensagem, evento, CPU, job]
+    por linha) são agrupados em blocos de block_records, e cada bloco é
+    comprimido como um membro gzip independente: um segmento é só a
+    concatenação dos seus blocos (zcat lê o segmento inteiro) e um bloco
+    pode ser lido sozinho a partir do offset. Quando um segmento passa de
+    segment_bytes comprimidos, o próximo bloco abre um novo.
+
+    Cada bloco gravado acrescenta uma linha a index.jsonl com o segmento,
+    offset e tamanho, os tempos mínimo e máximo e os jobs que aparecem nele
+    pela primeira vez ou terminam nele; o índice pode ser lido enquanto a
+    simulação ainda está em andamento. Só os jobs ainda não finalizados
+    ficam em memória.
+    """
+
+    def __init__(self, directory, block_records=BLOCK_RECORDS, segment_bytes=SEGMENT_BYTES, compresslevel=6):
+        self.directory = directory
+        self.block_records = block_records
+        self.segment_bytes = segment_bytes
+        self.compresslevel = compresslevel
+
+        # Como o Logger com o simulation.log, cada execução começa um log novo.
+        os.makedirs(directory, exist_ok=True)
+        for name in os.listdir(directory):
+            if name == INDEX_FILE or (name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)):
+                os.remove(os.path.join(directory, name))
+        self.index_file = open(os.path.join(directory, INDEX_FILE), "w")
+
+        self.segment_number = -1
+        self.segment_file = None
+        self.segment_size = 0
+
+        self.lines = []
+        self.first_time = None
+        self.last_time = None
+        self.started = []
+        self.finished = []
+        self.active_jobs = set()
+        self.count = 0
+
+    def write(self, wall, time, message, event=None, cpu=None, job=None):
+        self.lines.append(json.dumps([wall, time, message, event, cpu, job], ensure_ascii=False,
+                                     separators=(",", ":")) + "\n")
+        if time is not None:
+            if self.first_time is None or time < self.first_time:
+                self.first_time = time
+            if self.last_time is None or time > self.last_time:
+                self.last_time = time
+        if job is not None:
+            if job not in self.active_jobs:
+                self.active_jobs.add(job)
+                self.started.append(job)
+            if event == "finish":
+                self.active_jobs.discard(job)
+                self.finished.append(job)
+
+        if len(self.lines) >= self.block_records:
+            self.write_block()
+
+    def write_block(self):
+        """Comprime os registros pendentes como um bloco e registra-o no índice."""
+        if not self.lines:
+            return
+
+        data = gzip.compress("".join(self.lines).encode("utf-8"), compresslevel=self.compresslevel)
+        if self.segment_file is None or (self.segment_size and self.segment_size + len(data) > self.segment_bytes):
+            self.open_segment()
+
+        offset = self.segment_size
+        self.segment_file.write(data)
+        self.segment_file.flush()
+        self.segment_size += len(data)
+
+        entry = {"segment": segment_name(self.segment_number), "offset": offset, "size": len(data),
+                 "records": len(self.lines), "first_time": self.first_time, "last_time": self.last_time,
+                 "started": self.started, "finished": self.finished}
+        self.index_file.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self.index_file.flush()
+
+        self.count += len(self.lines)
+        self.lines = []
+        self.first_time = None
+        self.last_time = None
+        self.started = []
+        self.finished = []
+
+    def open_segment(self):
+        if self.segment_file is not None:
+            self.segment_file.close()
+        self.segment_number += 1
+        self.segment_file = open(os.path.join(self.directory, segment_name(self.segment_number)), "wb")
+        self.segment_size = 0
+
+    def close(self):
+        self.write_block()
+        if self.segment_file is not None:
+            self.segment_file.close()
+        self.index_file.close()
+
+
+class SegmentedLogReader:
+    """
+    Leitura de um log gravado por SegmentedLogWriter: pelo índice, só os
+    blocos que podem conter a janela de tempo ou o job pedido são lidos e
+    descomprimidos.
+
+    Os registros são tuplas (wall, tempo, mensagem, evento, CPU, job), na
+    ordem em que foram gravados; registros só estruturados (Logger.emit)
+    têm mensagem None. No histórico de um job, lines() mostra esses
+    registros com o texto de STRUCTURED_MESSAGES.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.blocks = []
+        with open(os.path.join(directory, INDEX_FILE)) as f:
+            for line in f:
+                try:
+                    self.blocks.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Última linha ainda sendo gravada por uma simulação em andamento.
+                    break
+
+    def read_block(self, block):
+        with open(os.path.join(self.directory, block["segment"]), "rb") as f:
+            f.seek(block["offset"])
+            data = gzip.decompress(f.read(block["size"]))
+        return [tuple(json.loads(line)) for line in data.decode("utf-8").splitlines()]
+
+    def records(self, start_time=None, end_time=None):
+        """Registros com tempo global entre start_time e end_time (inclusive); sem limites, todos."""
+        if start_time is None and end_time is None:
+            for block in self.blocks:
+                yield from self.read_block(block)
+            return
+
+        for block in self.blocks:
+            if block["first_time"] is None:
+                continue
+            if start_time is not None and block["last_time"] < start_time:
+                continue
+            if end_time is not None and block["first_time"] > end_time:
+                continue
+            for record in self.read_block(block):
+                time = record[1]
+                if time is not None and (start_time is None or time >= start_time) \
+                        and (end_time is None or time <= end_time):
+                    yield record
+
+    def job_history(self, job_id):
+        """Registros do job, lendo só os blocos entre o primeiro em que ele aparece e o do seu término."""
+        first = last = None
+        for position, block in enumerate(self.blocks):
+            if first is None and job_id in block["started"]:
+                first = position
+            if job_id in block["finished"]:
+                last = position
+        if first is None:
+            return
+        if last is None or last < first:
+            last = len(self.blocks) - 1
+
+        for block in self.blocks[first:last + 1]:
+            for record in self.read_block(block):
+                if record[5] == job_id:
+                    yield record
+
+    def lines(self, start_time=None, end_time=None, job_id=None):
+        """Linhas de texto (como no simulation.log) da janela de tempo ou do histórico do job."""
+        if job_id is None:
+            for record in self.records(start_time, end_time):
+                if record[2] is not None:
+                    yield format_record(record)
+            return
+
+        for record in self.job_history(job_id):
+            if record[2] is not None:
+                yield format_record(record)
+            elif record[3] in STRUCTURED_MESSAGES:
+                yield format_record((record[0], record[1], STRUCTURED_MESSAGES[record[3]].format(job=job_id)))
+
+    def time_range(self):
+        """(menor, maior) tempo global registrado, ou None se não houver."""
+        times = [(block["first_time"], block["last_time"]) for block in self.blocks if block["first_time"] is not None]
+        if not times:
+            return None
+        return min(first for first, _ in times), max(last for _, last in times)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Lê um trecho de um log segmentado (SegmentedLogWriter).")
+    parser.add_argument("directory")
+    parser.add_argument("--from", dest="start_time", type=int, help="tempo global inicial (inclusive)")
+    parser.add_argument("--to", dest="end_time", type=int, help="tempo global final (inclusive)")
+    parser.add_argument("--job", help="histórico de um único job")
+    parser.add_argument("--info", action="store_true", help="mostra só o resumo do índice")
+    arguments = parser.parse_args()
+
+    reader = SegmentedLogReader(arguments.directory)
+    if arguments.info:
+        segments = {block["segment"] for block in reader.blocks}
+        records = sum(block["records"] for block in reader.blocks)
+        print(f"{records} registros em {len(reader.blocks)} blocos e {len(segments)} segmentos; "
+              f"tempo global: {reader.time_range()}")
+        sys.exit(0)
+
+    for text in reader.lines(arguments.start_time, arguments.end_time, arguments.job):
+        sys.stdout.write(text)
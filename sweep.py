@@ -0,0 +1,96 @@
+import csv
+import itertools
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from event_engine import EventSimulator
+from logger import Logger
+from workload import load_jobs_from_csv, open_workload, scan_workload
+
+WORKLOAD = "processes.csv"
+RESULTS_CSV = "sweep_results.csv"
+CACHE_DIR = None  # Ex.: ".sim_cache": pontos já simulados com a mesma carga vêm do cache (result_cache.py)
+
+# Cada combinação destes valores é uma simulação.
+SWEEP_GRID = {
+    "num_cores": [1, 2, 4],
+    "quantum": [2, 5, 10],
+    "dynamic_quantum": [False, True],
+    "base_quantum": [6],
+    "min_quantum": [2],
+    "policy": ["rr"],
+}
+
+METRIC_COLUMNS = ("num_jobs", "total_time", "cpu_utilization", "avg_wait_time", "avg_turnaround_time",
+                  "total_context_switches")
+
+
+def expand_grid(grid):
+    """Produto cartesiano da grade: um dicionário de parâmetros por simulação."""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def run_point(workload_path, in_order, params, cache_dir=None):
+    """
+    Executa uma simulação sem interface (motor orientado a eventos) e
+    retorna parâmetros + métricas. Com cache_dir, um ponto já simulado vem
+    do cache de resultados (compartilhado com main.py).
+    """
+    cache = None
+    if cache_dir is not None:
+        from result_cache import ResultCache, cache_key, make_result, simulation_params
+
+        cache = ResultCache(cache_dir)
+        key = cache_key(workload_path, simulation_params(keep_finished=False, **params))
+        result = cache.get(key)
+        if result is not None:
+            summary = result["metrics"].summary(result["total_time"], params["num_cores"])
+            return {**params, **{column: summary[column] for column in METRIC_COLUMNS}}
+
+    jobs = open_workload(workload_path) if in_order else load_jobs_from_csv(workload_path)
+    simulator = EventSimulator(
+        jobs,
+        params["num_cores"],
+        logger=Logger(log_file=None, log_to_console=False),
+        dynamic_quantum=params["dynamic_quantum"],
+        fixed_quantum=params["quantum"],
+        policy=params["policy"],
+        base_quantum=params["base_quantum"],
+        min_quantum=params["min_quantum"],
+        keep_finished=False
+    )
+    total_time = simulator.run()
+    if cache is not None:
+        cache.put(key, make_result(simulator.finished_jobs, total_time, simulator.metrics))
+    summary = simulator.metrics.summary(total_time, params["num_cores"])
+    return {**params, **{column: summary[column] for column in METRIC_COLUMNS}}
+
+
+def run_sweep(workload_path, grid, output_csv, max_workers=None, cache_dir=CACHE_DIR):
+    """
+    Distribui as simulações da grade entre processos (uma por worker) e
+    grava todas as métricas em uma única tabela CSV, na ordem da grade.
+    """
+    points = expand_grid(grid)
+    _, in_order = scan_workload(workload_path)
+
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        results = list(executor.map(run_point, itertools.repeat(workload_path), itertools.repeat(in_order), points,
+                                    itertools.repeat(cache_dir)))
+
+    with open(output_csv, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(grid) + list(METRIC_COLUMNS))
+        writer.writeheader()
+        writer.writerows(results)
+
+    return results
+
+
+if __name__ == "__main__":
+    workload_path = sys.argv[1] if len(sys.argv) > 1 else WORKLOAD
+    output_csv = sys.argv[2] if len(sys.argv) > 2 else RESULTS_CSV
+
+    results = run_sweep(workload_path, SWEEP_GRID, output_csv)
+    print(f"{len(results)} simulações concluídas. Resultados salvos em '{output_csv}'")
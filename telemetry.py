@@ -0,0 +1,114 @@
+import csv
+import json
+import threading
+
+import numpy as np
+
+TELEMETRY_COLUMNS = ("time", "ready", "blocked", "busy_cpus", "completions", "quantum")
+
+
+class TelemetrySampler:
+    """
+    Série temporal do simulador, amostrada a cada interval ticks em buffers
+    circulares pré-alocados (um array NumPy por coluna de
+    TELEMETRY_COLUMNS). Quando os buffers enchem, as amostras mais antigas
+    são sobrescritas; dropped conta quantas foram perdidas assim.
+
+    A amostragem não toma nenhum lock do escalonador: lê ready_count, o
+    tamanho do heap de bloqueados e finished_count diretamente, valores
+    que podem estar no máximo um tick defasados no modo com threads.
+    busy_cpus é uma função que retorna quantas CPUs estão ocupadas (por
+    padrão, as do conjunto running_cpus do QueueManager).
+    """
+
+    def __init__(self, queue_manager, interval=10, capacity=4096, busy_cpus=None):
+        if interval < 1:
+            raise ValueError(f"O intervalo da telemetria precisa ser de pelo menos 1 tick (recebido {interval}).")
+        if capacity < 1:
+            raise ValueError(f"A capacidade da telemetria precisa ser de pelo menos 1 amostra (recebido {capacity}).")
+        self.queue_manager = queue_manager
+        self.interval = interval
+        self.capacity = capacity
+        self.busy_cpus = busy_cpus if busy_cpus is not None else lambda: len(queue_manager.running_cpus)
+        self.columns = {name: np.zeros(capacity, dtype=np.int64) for name in TELEMETRY_COLUMNS}
+        self.size = 0
+        self.position = 0
+        self.dropped = 0
+        self.last_finished = 0
+        self.next_sample_time = interval
+
+    def sample(self, current_time):
+        """Grava uma amostra do estado atual com o rótulo de tempo current_time."""
+        q_manager = self.queue_manager
+        finished = q_manager.finished_count
+        values = (current_time, q_manager.job_queue.ready_count, len(q_manager.blocked_queue), self.busy_cpus(),
+                  finished - self.last_finished, q_manager.current_quantum())
+        self.last_finished = finished
+
+        for name, value in zip(TELEMETRY_COLUMNS, values):
+            self.columns[name][self.position] = value
+        self.position = (self.position + 1) % self.capacity
+        if self.size < self.capacity:
+            self.size += 1
+        else:
+            self.dropped += 1
+        self.next_sample_time = current_time + self.interval
+
+    def get_state(self):
+        """Buffers e posição da amostragem, para um checkpoint."""
+        return {"columns": self.columns, "size": self.size, "position": self.position, "dropped": self.dropped,
+                "last_finished": self.last_finished, "next_sample_time": self.next_sample_time}
+
+    def set_state(self, state):
+        self.columns = state["columns"]
+        self.size = state["size"]
+        self.position = state["position"]
+        self.dropped = state["dropped"]
+        self.last_finished = state["last_finished"]
+        self.next_sample_time = state["next_sample_time"]
+
+    def arrays(self):
+        """Colunas em ordem cronológica, apenas com as amostras retidas."""
+        if self.size < self.capacity:
+            return {name: column[:self.size] for name, column in self.columns.items()}
+        return {name: np.roll(column, -self.position) for name, column in self.columns.items()}
+
+    def export_csv(self, file_path):
+        data = self.arrays()
+        with open(file_path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(TELEMETRY_COLUMNS)
+            writer.writerows(zip(*(data[name].tolist() for name in TELEMETRY_COLUMNS)))
+
+    def export_jsonl(self, file_path):
+        data = self.arrays()
+        with open(file_path, 'w') as f:
+            for row in zip(*(data[name].tolist() for name in TELEMETRY_COLUMNS)):
+                f.write(json.dumps(dict(zip(TELEMETRY_COLUMNS, row)), separators=(",", ":")) + "\n")
+
+    def export(self, file_path):
+        """Exporta em JSONL se o arquivo terminar em .jsonl; caso contrário, em CSV."""
+        if file_path.endswith(".jsonl"):
+            self.export_jsonl(file_path)
+        else:
+            self.export_csv(file_path)
+
+    def start_thread(self, clock, rank):
+        """
+        Modo com threads: amostra em uma thread própria que dorme até o
+        próximo múltiplo de interval. No modo barreira participa do tick
+        com rank, que deve ser maior que o de todas as CPUs (CPU-n tem
+        rank n + 1) para amostrar depois delas.
+        """
+        clock.register_participant("Telemetry", rank)
+        thread = threading.Thread(target=self.run, args=(clock,), name="Telemetry", daemon=True)
+        thread.start()
+        return thread
+
+    def run(self, clock):
+        while clock.running:
+            current_time = clock.wait_until(self.next_sample_time)
+            if not clock.running:
+                break
+            self.sample(current_time)
+        clock.unregister_participant("Telemetry")
@@ -0,0 +1,239 @@
+import csv
+import heapq
+import mmap
+import os
+import struct
+import sys
+import tempfile
+
+from job import Job
+
+BINARY_MAGIC = b"ESCJOBS1"
+# Cabeçalho: identificador do formato e número de registros.
+BINARY_HEADER = struct.Struct("<8sQ")
+# Registro de tamanho fixo: chegada, tempo de execução, prioridade e id do job (até 16 bytes, UTF-8).
+JOB_RECORD = struct.Struct("<qqi16s")
+BINARY_EXTENSIONS = (".bin", ".jobs")
+READ_CHUNK_RECORDS = 65536
+# Perfis de E/S de um arquivo binário ficam em um CSV ao lado dele (job_id,io_bursts).
+IO_PROFILE_SUFFIX = ".io.csv"
+
+
+def is_binary_workload(file_path):
+    return file_path.endswith(BINARY_EXTENSIONS)
+
+
+def io_profile_path(file_path):
+    return file_path + IO_PROFILE_SUFFIX
+
+
+def parse_io_bursts(text, execution_time=None):
+    """
+    Converte "3:5;7:2" em ((3, 5), (7, 2)): após 3 unidades de CPU o job
+    pede uma E/S de 5 unidades e, após 7, outra de 2.
+    """
+    if not text:
+        return ()
+
+    bursts = []
+    for item in text.split(";"):
+        offset, duration = (int(value) for value in item.split(":"))
+        if offset < 1 or duration < 1 or (bursts and offset <= bursts[-1][0]):
+            raise ValueError(f"Perfil de E/S inválido: {text}")
+        if execution_time is not None and offset >= execution_time:
+            raise ValueError(f"Perfil de E/S inválido: {text} (a E/S deve ocorrer antes do fim do job)")
+        bursts.append((offset, duration))
+    return tuple(bursts)
+
+
+def format_io_bursts(bursts):
+    return ";".join(f"{offset}:{duration}" for offset, duration in bursts)
+
+
+def parse_row(row):
+    """Converte uma linha do CSV em (chegada, execução, prioridade, id, perfil de E/S)."""
+    job_id, arrival_time, execution_time = row[:3]
+    priority = int(row[3]) if len(row) > 3 and row[3] else 0
+    io_bursts = parse_io_bursts(row[4], int(execution_time)) if len(row) > 4 else ()
+    return int(arrival_time), int(execution_time), priority, job_id, io_bursts
+
+
+def iter_csv_rows(file_path):
+    with open(file_path, 'r', newline='') as f:
+        reader = csv.reader(f)
+        next(reader)
+        for row in reader:
+            if row:
+                yield parse_row(row)
+
+
+def load_jobs_from_csv(file_path):
+    """Carrega todo o CSV em uma lista de Job (em qualquer ordem)."""
+    return [Job(job_id, arrival_time, execution_time, priority, io_bursts)
+            for arrival_time, execution_time, priority, job_id, io_bursts in iter_csv_rows(file_path)]
+
+
+def iter_jobs_from_csv(file_path):
+    """
+    Lê o CSV sob demanda, um Job por vez, sem montar a lista completa.
+
+    O arquivo precisa estar ordenado por arrival_time; caso contrário é
+    levantado ValueError (use convert_csv_to_binary, que ordena em blocos).
+    """
+    last_arrival = None
+    for line, (arrival_time, execution_time, priority, job_id, io_bursts) in enumerate(iter_csv_rows(file_path), 2):
+        if last_arrival is not None and arrival_time < last_arrival:
+            raise ValueError(f"{file_path}:{line}: chegadas fora de ordem; converta com convert_csv_to_binary.")
+        last_arrival = arrival_time
+        yield Job(job_id, arrival_time, execution_time, priority, io_bursts)
+
+
+def load_io_profiles(file_path):
+    """Lê um CSV job_id,io_bursts e retorna {job_id: ((tempo de CPU, duração), ...)}."""
+    with open(file_path, 'r', newline='') as f:
+        reader = csv.reader(f)
+        next(reader)
+        return {row[0]: parse_io_bursts(row[1]) for row in reader if row}
+
+
+def iter_jobs_from_binary(file_path):
+    """
+    Lê, via mmap, um arquivo gerado por convert_csv_to_binary (já ordenado
+    por chegada), aplicando os perfis de E/S do arquivo auxiliar, se houver.
+    """
+    profile_path = io_profile_path(file_path)
+    io_profiles = load_io_profiles(profile_path) if os.path.exists(profile_path) else {}
+
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        magic, count = BINARY_HEADER.unpack_from(data)
+        if magic != BINARY_MAGIC:
+            raise ValueError(f"{file_path} não é um arquivo de carga binário.")
+
+        chunk_bytes = JOB_RECORD.size * READ_CHUNK_RECORDS
+        end = BINARY_HEADER.size + count * JOB_RECORD.size
+        for offset in range(BINARY_HEADER.size, end, chunk_bytes):
+            chunk = data[offset:min(offset + chunk_bytes, end)]
+            for arrival_time, execution_time, priority, raw_id in JOB_RECORD.iter_unpack(chunk):
+                job_id = raw_id.rstrip(b"\0").decode("utf-8")
+                yield Job(job_id, arrival_time, execution_time, priority, io_profiles.get(job_id, ()))
+
+
+def open_workload(file_path):
+    """Iterador preguiçoso de Job para um CSV ordenado ou um arquivo binário."""
+    if is_binary_workload(file_path):
+        return iter_jobs_from_binary(file_path)
+    return iter_jobs_from_csv(file_path)
+
+
+def scan_workload(file_path):
+    """
+    Percorre o arquivo sem criar Jobs e retorna (número de jobs, ordenado
+    por chegada). Para arquivos binários, lê apenas o cabeçalho.
+    """
+    if is_binary_workload(file_path):
+        with open(file_path, 'rb') as f:
+            magic, count = BINARY_HEADER.unpack(f.read(BINARY_HEADER.size))
+        if magic != BINARY_MAGIC:
+            raise ValueError(f"{file_path} não é um arquivo de carga binário.")
+        return count, True
+
+    count = 0
+    in_order = True
+    last_arrival = None
+    for arrival_time, *_ in iter_csv_rows(file_path):
+        if last_arrival is not None and arrival_time < last_arrival:
+            in_order = False
+        last_arrival = arrival_time
+        count += 1
+    return count, in_order
+
+
+def pack_record(arrival_time, execution_time, priority, job_id):
+    raw_id = job_id.encode("utf-8")
+    if len(raw_id) > 16:
+        raise ValueError(f"Id de job longo demais para o formato binário (máx. 16 bytes): {job_id}")
+    return JOB_RECORD.pack(arrival_time, execution_time, priority, raw_id)
+
+
+def iter_run(file_path):
+    """Lê um bloco ordenado gravado por convert_csv_to_binary."""
+    with open(file_path, 'rb') as f:
+        while True:
+            chunk = f.read(JOB_RECORD.size * READ_CHUNK_RECORDS)
+            if not chunk:
+                return
+            for arrival_time, execution_time, priority, raw_id in JOB_RECORD.iter_unpack(chunk):
+                yield arrival_time, execution_time, priority, raw_id.rstrip(b"\0").decode("utf-8")
+
+
+def iter_csv_chunks(file_path, chunk_size):
+    chunk = []
+    for record in iter_csv_rows(file_path):
+        chunk.append(record)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def convert_csv_to_binary(csv_path, binary_path, chunk_size=1_000_000):
+    """
+    Converte um CSV de processos para o formato binário, ordenado por chegada.
+
+    Os perfis de E/S (coluna io_bursts) não cabem no registro de tamanho
+    fixo e são gravados no arquivo auxiliar io_profile_path(binary_path).
+    O CSV é lido em blocos de chunk_size linhas; cada bloco é ordenado em
+    memória e gravado em um arquivo temporário, e os blocos são
+    intercalados com heapq.merge. Chegadas iguais mantêm a ordem do CSV.
+    Retorna o número de jobs gravados.
+    """
+    profile_path = io_profile_path(binary_path)
+    with tempfile.TemporaryDirectory() as temp_dir, open(profile_path, 'w', newline='') as profile_file:
+        profiles = csv.writer(profile_file)
+        profiles.writerow(("job_id", "io_bursts"))
+        has_profiles = False
+
+        runs = []
+        for index, chunk in enumerate(iter_csv_chunks(csv_path, chunk_size)):
+            chunk.sort(key=lambda record: record[0])
+            run_path = os.path.join(temp_dir, f"run-{index}.bin")
+            with open(run_path, 'wb') as f:
+                f.write(b"".join(pack_record(*record[:4]) for record in chunk))
+            runs.append(run_path)
+
+            for record in chunk:
+                if record[4]:
+                    profiles.writerow((record[3], format_io_bursts(record[4])))
+                    has_profiles = True
+
+        count = 0
+        with open(binary_path, 'wb') as out:
+            out.write(BINARY_HEADER.pack(BINARY_MAGIC, 0))
+            merged = heapq.merge(*(iter_run(run_path) for run_path in runs), key=lambda record: record[0])
+            batch = []
+            for record in merged:
+                batch.append(pack_record(*record))
+                if len(batch) == READ_CHUNK_RECORDS:
+                    out.write(b"".join(batch))
+                    count += len(batch)
+                    batch = []
+            out.write(b"".join(batch))
+            count += len(batch)
+
+            out.seek(0)
+            out.write(BINARY_HEADER.pack(BINARY_MAGIC, count))
+
+    if not has_profiles:
+        os.remove(profile_path)
+
+    return count
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Uso: python workload.py <entrada.csv> <saida.bin>")
+        sys.exit(1)
+
+    total = convert_csv_to_binary(sys.argv[1], sys.argv[2])
+    print(f"{total} processos gravados em '{sys.argv[2]}'")